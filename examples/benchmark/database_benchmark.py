@@ -0,0 +1,189 @@
+"""
+Measure rows/second of bulk saving bar and tick data into database, and
+of loading one million bars with object and columnar read paths.
+
+SQLite and file database are always tested with temporary files, the
+database configured in vt_setting.json is also tested if it is neither.
+"""
+
+import os
+from datetime import datetime, timedelta
+from time import perf_counter
+
+os.environ["VNPY_TESTING"] = "1"
+
+from peewee import chunked  # noqa
+
+from vnpy.trader.constant import Exchange, Interval  # noqa
+from vnpy.trader.database.database import Driver  # noqa
+from vnpy.trader.database.initialize import init  # noqa
+from vnpy.trader.object import BarData, TickData  # noqa
+from vnpy.trader.setting import get_settings  # noqa
+
+BAR_COUNT = 100000
+LOAD_COUNT = 1000000
+TICK_COUNT = 20000
+BATCH_SIZES = [50, 500, 1000, 5000]
+SYMBOL = "benchmark"
+
+
+def generate_bars(count: int):
+    """"""
+    start = datetime(2019, 1, 1)
+    for n in range(count):
+        dt = start + timedelta(minutes=n)
+        yield BarData(
+            gateway_name="DB",
+            symbol=SYMBOL,
+            exchange=Exchange.SHFE,
+            datetime=dt,
+            datetime_start=dt,
+            datetime_end=dt + timedelta(minutes=1),
+            interval=Interval.MINUTE,
+            volume=n,
+            open_interest=n,
+            open_price=3500,
+            high_price=3510,
+            low_price=3490,
+            close_price=3505,
+        )
+
+
+def generate_ticks(count: int):
+    """"""
+    start = datetime(2019, 1, 1)
+    for n in range(count):
+        yield TickData(
+            gateway_name="DB",
+            symbol=SYMBOL,
+            exchange=Exchange.SHFE,
+            datetime=start + timedelta(milliseconds=500 * n),
+            name=SYMBOL,
+            volume=n,
+            last_price=3500,
+            bid_price_1=3499,
+            ask_price_1=3501,
+            bid_volume_1=10,
+            ask_volume_1=10,
+        )
+
+
+def save_bars_by_row(manager, bars):
+    """
+    Old saving path: model object and dict per row, 50 rows per statement.
+    """
+    dicts = [manager.class_bar.from_bar(bar).to_dict() for bar in bars]
+    with manager.class_bar._meta.database.atomic():
+        for c in chunked(dicts, 50):
+            manager.class_bar.insert_many(c).on_conflict_replace().execute()
+
+
+def load_bars_by_model(manager, start: datetime, end: datetime):
+    """
+    Old loading path: model object per row converted by to_bar.
+    """
+    if not hasattr(manager, "class_bar"):
+        from vnpy.trader.database.database_mongo import DbBarData
+
+        s = DbBarData.objects(
+            symbol=SYMBOL,
+            exchange=Exchange.SHFE.value,
+            interval=Interval.MINUTE.value,
+            datetime__gte=start,
+            datetime__lte=end,
+        )
+        return [db_bar.to_bar() for db_bar in s]
+
+    model = manager.class_bar
+    s = (
+        model.select()
+        .where(
+            (model.symbol == SYMBOL)
+            & (model.exchange == Exchange.SHFE.value)
+            & (model.interval == Interval.MINUTE.value)
+            & (model.datetime >= start)
+            & (model.datetime <= end)
+        )
+        .order_by(model.datetime)
+    )
+    return [db_bar.to_bar() for db_bar in s]
+
+
+def run(name: str, func, count: int):
+    """"""
+    start = perf_counter()
+    func()
+    cost = perf_counter() - start
+    print(f"{name:<30}{count / cost:>12,.0f} rows/s")
+
+
+def benchmark(settings: dict):
+    """"""
+    driver = Driver(settings["driver"])
+    manager = init(settings)
+    print(f"\n{driver.value}")
+
+    if driver is Driver.SQLITE:
+        manager.clean(SYMBOL)
+        run("bar by row (old)", lambda: save_bars_by_row(manager, generate_bars(BAR_COUNT)), BAR_COUNT)
+
+    for batch_size in BATCH_SIZES:
+        manager.clean(SYMBOL)
+        run(
+            f"bar batch {batch_size}",
+            lambda: manager.save_bar_data(generate_bars(BAR_COUNT), batch_size),
+            BAR_COUNT
+        )
+
+    # Upsert into existing rows
+    run(
+        f"bar batch {BATCH_SIZES[-1]} (update)",
+        lambda: manager.save_bar_data(generate_bars(BAR_COUNT), BATCH_SIZES[-1]),
+        BAR_COUNT
+    )
+
+    for batch_size in BATCH_SIZES:
+        manager.clean(SYMBOL)
+        run(
+            f"tick batch {batch_size}",
+            lambda: manager.save_tick_data(generate_ticks(TICK_COUNT), batch_size),
+            TICK_COUNT
+        )
+
+    manager.clean(SYMBOL)
+
+
+def benchmark_load(settings: dict):
+    """"""
+    driver = Driver(settings["driver"])
+    manager = init(settings)
+    print(f"\n{driver.value} load")
+
+    manager.clean(SYMBOL)
+    manager.save_bar_data(generate_bars(LOAD_COUNT))
+
+    start = datetime(2019, 1, 1)
+    end = start + timedelta(minutes=LOAD_COUNT)
+    args = (SYMBOL, Exchange.SHFE, Interval.MINUTE, start, end)
+
+    if driver is not Driver.FILE:
+        run("bar by model (old)", lambda: load_bars_by_model(manager, start, end), LOAD_COUNT)
+    run("bar list", lambda: manager.load_bar_data(*args), LOAD_COUNT)
+    run("bar batch", lambda: manager.load_bar_batch(*args), LOAD_COUNT)
+
+    manager.clean(SYMBOL)
+
+
+if __name__ == "__main__":
+    profiles = [
+        {"driver": "sqlite", "database": "benchmark.db"},
+        {"driver": "file", "database": "benchmark_file"},
+    ]
+
+    settings = get_settings("database.")
+    if settings.get("driver", "sqlite") not in {"sqlite", "file"}:
+        profiles.append(settings)
+
+    for profile in profiles:
+        benchmark(profile)
+        benchmark_load(profile)
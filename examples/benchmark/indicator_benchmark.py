@@ -0,0 +1,120 @@
+"""
+Compare per-bar cost of calculating indicators with talib on the whole
+ArrayManager window against incremental indicators in vnpy.trader.indicator.
+"""
+
+from time import perf_counter
+
+import numpy as np
+
+from vnpy.trader.indicator import (
+    AdxIndicator,
+    AtrIndicator,
+    BollIndicator,
+    CciIndicator,
+    DonchianIndicator,
+    EmaIndicator,
+    MacdIndicator,
+    RsiIndicator,
+    SmaIndicator,
+    StdIndicator,
+)
+from vnpy.trader.utility import ArrayManager
+
+COUNT = 2000
+PERIOD = 20
+
+
+class Bar:
+    """
+    Minimal bar object with price fields required by indicators.
+    """
+
+    __slots__ = ("open_price", "high_price", "low_price", "close_price", "volume", "datetime")
+
+    def __init__(self, close: float, high: float, low: float):
+        """"""
+        self.open_price = close
+        self.high_price = high
+        self.low_price = low
+        self.close_price = close
+        self.volume = 0
+        self.datetime = None
+
+
+def generate_bars(count: int):
+    """"""
+    rs = np.random.RandomState(0)
+    close = 3500 + np.cumsum(rs.normal(0, 5, count))
+    high = close + rs.uniform(0, 5, count)
+    low = close - rs.uniform(0, 5, count)
+    return [Bar(*values) for values in zip(close.tolist(), high.tolist(), low.tolist())]
+
+
+TALIB_FUNCS = {
+    "SMA": lambda am: am.sma(PERIOD),
+    "EMA": lambda am: am.ema(PERIOD),
+    "STDDEV": lambda am: am.std(PERIOD),
+    "ATR": lambda am: am.atr(PERIOD),
+    "RSI": lambda am: am.rsi(PERIOD),
+    "MACD": lambda am: am.macd(12, 26, 9),
+    "ADX": lambda am: am.adx(PERIOD),
+    "CCI": lambda am: am.cci(PERIOD),
+    "DONCHIAN": lambda am: am.donchian(PERIOD),
+    "BOLL": lambda am: am.boll(PERIOD, 2),
+}
+
+INDICATORS = {
+    "SMA": lambda: SmaIndicator(PERIOD),
+    "EMA": lambda: EmaIndicator(PERIOD),
+    "STDDEV": lambda: StdIndicator(PERIOD),
+    "ATR": lambda: AtrIndicator(PERIOD),
+    "RSI": lambda: RsiIndicator(PERIOD),
+    "MACD": lambda: MacdIndicator(12, 26, 9),
+    "ADX": lambda: AdxIndicator(PERIOD),
+    "CCI": lambda: CciIndicator(PERIOD),
+    "DONCHIAN": lambda: DonchianIndicator(PERIOD),
+    "BOLL": lambda: BollIndicator(PERIOD, 2),
+}
+
+
+def measure_talib(name: str, size: int, bars: list) -> float:
+    """
+    Return microseconds per bar used by talib on window of size.
+    """
+    am = ArrayManager(size)
+    am.update_bars(generate_bars(size))
+    func = TALIB_FUNCS[name]
+
+    start = perf_counter()
+    for bar in bars:
+        am.update_bar(bar)
+        func(am)
+    return (perf_counter() - start) / len(bars) * 1e6
+
+
+def measure_incremental(name: str, bars: list) -> float:
+    """
+    Return microseconds per bar used by incremental indicator.
+    """
+    indicator = INDICATORS[name]()
+
+    start = perf_counter()
+    for bar in bars:
+        indicator.update_bar(bar)
+    return (perf_counter() - start) / len(bars) * 1e6
+
+
+def run():
+    """"""
+    bars = generate_bars(COUNT)
+
+    print(f"{'indicator':10}{'talib@100':>12}{'talib@1000':>12}{'talib@10000':>12}{'incremental':>12}  (us/bar)")
+    for name in INDICATORS:
+        costs = [measure_talib(name, size, bars) for size in (100, 1000, 10000)]
+        costs.append(measure_incremental(name, bars))
+        print(f"{name:10}" + "".join(f"{cost:12.2f}" for cost in costs))
+
+
+if __name__ == "__main__":
+    run()
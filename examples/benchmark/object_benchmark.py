@@ -0,0 +1,90 @@
+"""
+Compare memory usage and construction speed of TickData/BarData
+with their __slots__ variants CompactTickData/CompactBarData.
+"""
+
+import tracemalloc
+from datetime import datetime, timedelta
+from time import perf_counter
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, CompactBarData, CompactTickData, TickData
+
+COUNT = 200000
+
+
+def create_bars(data_class: type):
+    """"""
+    start = datetime(2019, 1, 1, 9)
+    return [
+        data_class(
+            gateway_name="DB",
+            symbol="rb1905",
+            exchange=Exchange.SHFE,
+            datetime=start + timedelta(minutes=i),
+            datetime_start=start + timedelta(minutes=i),
+            datetime_end=start + timedelta(minutes=i + 1),
+            interval=Interval.MINUTE,
+            volume=100,
+            open_price=3500,
+            high_price=3510,
+            low_price=3490,
+            close_price=3505,
+        )
+        for i in range(COUNT)
+    ]
+
+
+def create_ticks(data_class: type):
+    """"""
+    now = datetime.now()
+    return [
+        data_class(
+            gateway_name="CTP",
+            symbol="rb1905",
+            exchange=Exchange.SHFE,
+            datetime=now,
+            last_price=3500 + i % 10,
+            bid_price_1=3499,
+            ask_price_1=3501,
+            bid_volume_1=10,
+            ask_volume_1=20,
+        )
+        for i in range(COUNT)
+    ]
+
+
+def measure(func, data_class: type):
+    """
+    Return (seconds, bytes) used for creating COUNT objects.
+    """
+    start = perf_counter()
+    data = func(data_class)
+    cost = perf_counter() - start
+    del data
+
+    tracemalloc.start()
+    data = func(data_class)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del data
+    return cost, size
+
+
+def run():
+    """"""
+    for func, classes in [
+        (create_bars, [BarData, CompactBarData]),
+        (create_ticks, [TickData, CompactTickData]),
+    ]:
+        for data_class in classes:
+            cost, size = measure(func, data_class)
+            print(
+                f"{data_class.__name__:16} {COUNT} objects: "
+                f"{COUNT / cost:10.0f} objects/s, {size / COUNT:6.0f} bytes/object"
+            )
+
+
+if __name__ == "__main__":
+    run()
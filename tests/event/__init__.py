@@ -0,0 +1,2 @@
+from .test_engine import *
+from .test_journal import *
@@ -0,0 +1,413 @@
+"""
+Test if event engine works fine
+"""
+import asyncio
+import unittest
+from time import sleep
+from threading import Event as ThreadingEvent, Lock, Thread, current_thread
+
+from vnpy.event import (
+    AsyncEventEngine,
+    Event,
+    EventEngine,
+    OverflowPolicy,
+    ShardedEventEngine,
+    EVENT_PROFILE
+)
+
+
+class DummyTick:
+
+    def __init__(self, vt_symbol: str, value: int):
+        self.vt_symbol = vt_symbol
+        self.value = value
+
+
+def process_pending(engine: EventEngine):
+    """
+    Dispatch queued events in calling thread without starting engine.
+    """
+    engine._process_batch(engine._drain(0), engine._queues)
+
+
+class TestEventEngine(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.engine = EventEngine()
+
+    def tearDown(self) -> None:
+        if self.engine._active:
+            self.engine.stop()
+
+    def test_dispatch_order(self):
+        received = []
+        self.engine.register("a", lambda event: received.append(("a", event.data)))
+        self.engine.register_general(lambda event: received.append(("g", event.data)))
+
+        self.engine.put(Event("a", 1))
+        self.engine.put(Event("b", 2))
+        process_pending(self.engine)
+
+        self.assertEqual(received, [("a", 1), ("g", 1), ("g", 2)])
+
+    def test_unregister(self):
+        received = []
+
+        def handler(event):
+            received.append(event.data)
+
+        self.engine.register("a", handler)
+        self.engine.register("a", handler)
+        self.engine.put(Event("a", 1))
+        process_pending(self.engine)
+
+        self.engine.unregister("a", handler)
+        self.engine.put(Event("a", 2))
+        process_pending(self.engine)
+
+        self.assertEqual(received, [1])
+        self.assertNotIn("a", self.engine._dispatch_map)
+
+    def test_threaded_dispatch(self):
+        done = ThreadingEvent()
+        received = []
+
+        def handler(event):
+            received.append(event.data)
+            if len(received) == 1000:
+                done.set()
+
+        self.engine.register("a", handler)
+        self.engine.start()
+        for i in range(1000):
+            self.engine.put(Event("a", i))
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(received, list(range(1000)))
+
+    def test_conflation(self):
+        self.engine = EventEngine(conflation=["eTick."])
+        received = []
+        self.engine.register_general(lambda event: received.append((event.type, event.data)))
+
+        self.engine.put(Event("eTick.", DummyTick("a.SHFE", 1)))
+        self.engine.put(Event("eOrder.", 1))
+        self.engine.put(Event("eTick.", DummyTick("b.SHFE", 1)))
+        self.engine.put(Event("eTick.", DummyTick("a.SHFE", 2)))
+        self.engine.put(Event("eOrder.", 2))
+        self.engine.put(Event("eTick.", DummyTick("a.SHFE", 3)))
+        process_pending(self.engine)
+
+        self.engine.put(Event("eTick.", DummyTick("a.SHFE", 4)))
+        process_pending(self.engine)
+
+        self.assertEqual(
+            [(type, getattr(data, "value", data)) for type, data in received],
+            [("eTick.", 3), ("eOrder.", 1), ("eTick.", 1), ("eOrder.", 2), ("eTick.", 4)]
+        )
+        self.assertEqual(self.engine.get_conflation_counts(), {"a.SHFE": 2})
+
+    def test_strict_priority_lanes(self):
+        self.engine = EventEngine(lanes=[["eOrder."], ["eTick."], [""], ["eTimer"]])
+        received = []
+        self.engine.register_general(lambda event: received.append(event.type))
+
+        self.engine.put(Event("eTimer"))
+        for _ in range(150):
+            self.engine.put(Event("eTick."))
+        self.engine.put(Event("eLog"))
+        self.engine.put(Event("eOrder."))
+
+        batch = self.engine._drain(0)
+        self.assertEqual([event.type for event in batch], ["eOrder."])
+
+        batch = self.engine._drain(0)
+        self.assertEqual(len(batch), 100)
+
+        self.engine.put(Event("eOrder."))
+        process_pending(self.engine)
+        process_pending(self.engine)
+        process_pending(self.engine)
+        process_pending(self.engine)
+
+        self.assertEqual(received, ["eOrder."] + ["eTick."] * 50 + ["eLog", "eTimer"])
+
+    def test_weighted_lanes(self):
+        self.engine = EventEngine(lanes=[["eOrder."], ["eTick."]], weights=[2, 1])
+        for i in range(3):
+            self.engine.put(Event("eTick.", i))
+            self.engine.put(Event("eOrder.", i))
+
+        batch = self.engine._drain(0)
+        self.assertEqual(
+            [(event.type, event.data) for event in batch],
+            [("eOrder.", 0), ("eOrder.", 1), ("eTick.", 0)]
+        )
+
+    def test_profiling(self):
+        engine = self.engine
+
+        def slow_handler(event):
+            sleep(0.01)
+
+        engine.register("a", slow_handler)
+        engine.register_general(lambda event: None)
+        engine.start_profiling()
+
+        engine.put(Event("a"))
+        engine.put(Event("a"))
+        process_pending(engine)
+
+        profile = engine.get_profile()
+        slowest = profile["handlers"][0]
+        self.assertEqual(slowest["type"], "a")
+        self.assertTrue(slowest["handler"].endswith("slow_handler"))
+        self.assertEqual(slowest["count"], 2)
+        self.assertGreaterEqual(slowest["max"], 0.01)
+        self.assertEqual(len(profile["handlers"]), 2)
+        self.assertEqual(profile["delays"]["a"]["count"], 2)
+        self.assertEqual(profile["depth"]["max"], 2)
+
+        received = []
+        engine.register(EVENT_PROFILE, lambda event: received.append(event.data))
+        engine.publish_profile()
+        process_pending(engine)
+        self.assertEqual(received[0]["handlers"][0]["handler"], slowest["handler"])
+
+        engine.stop_profiling()
+        self.assertEqual(engine.get_profile(), {})
+
+    def test_timers(self):
+        self.engine = EventEngine(interval=0.05)
+        received = []
+        done = ThreadingEvent()
+
+        self.engine.register("eTimer", lambda event: received.append("timer"))
+        self.engine.register("eTimer.fast", lambda event: received.append("fast"))
+        self.engine.add_timer("eTimer.fast", 0.01)
+        with self.assertRaises(ValueError):
+            self.engine.add_timer("eTimer.zero", 0)
+
+        self.engine.call_later(0.02, lambda: received.append("call"))
+        call_id = self.engine.call_later(0.03, lambda: received.append("cancelled"))
+        self.engine.cancel_call(call_id)
+        self.engine.call_later(0.3, done.set)
+
+        self.engine.start()
+        self.assertTrue(done.wait(2))
+        self.engine.remove_timer("eTimer.fast")
+
+        self.assertEqual(received.count("call"), 1)
+        self.assertNotIn("cancelled", received)
+        self.assertGreaterEqual(received.count("timer"), 3)
+        self.assertGreater(received.count("fast"), received.count("timer"))
+
+    def test_timer_put_blocked(self):
+        self.engine = EventEngine(interval=10, capacity=1)
+        done = ThreadingEvent()
+
+        def on_slow(event):
+            sleep(0.1)
+            self.engine.call_later(0, done.set)
+
+        self.engine.register("eSlow", on_slow)
+        self.engine.start()
+
+        self.engine.put(Event("eSlow"))
+        sleep(0.02)
+        self.engine.put(Event("eFill"))
+
+        # Timer thread is blocked by full queue when putting callback event.
+        self.engine.call_later(0, lambda: None)
+        self.assertTrue(done.wait(2))
+
+    def test_timer_not_piled_up(self):
+        self.engine = EventEngine(interval=0.01)
+        self.engine._active = True
+        self.engine._timer.start()
+        sleep(0.1)
+
+        events = self.engine._drain(0)
+        self.engine._active = False
+        self.engine._stop_timer()
+
+        self.assertEqual([event.type for event in events], ["eTimer"])
+
+    def test_overflow_policies(self):
+        self.engine = EventEngine(
+            capacity=3,
+            overflow={
+                "eTick.": OverflowPolicy.CONFLATE,
+                "eLog": OverflowPolicy.DROP_OLDEST,
+                "eBar.": OverflowPolicy.DROP_NEWEST,
+            }
+        )
+        engine = self.engine
+
+        engine.put(Event("eLog", 1))
+        engine.put(Event("eTick.", DummyTick("a.SHFE", 1)))
+        engine.put(Event("eLog", 2))
+
+        engine.put(Event("eBar.", 1))
+        engine.put(Event("eTick.", DummyTick("a.SHFE", 2)))
+        engine.put(Event("eTick.", DummyTick("b.SHFE", 1)))
+        engine.put(Event("eLog", 3))
+
+        # Not running, so blocking policy does not wait.
+        engine.put(Event("eOrder.", 1))
+
+        events = engine._drain(0)
+        self.assertEqual(
+            [
+                (event.type, getattr(event.data, "value", event.data))
+                for event in events if event.type != "eOverflow"
+            ],
+            [("eTick.", 2), ("eLog", 2), ("eLog", 3), ("eOrder.", 1)]
+        )
+        self.assertEqual(
+            [event.data["policy"] for event in events if event.type == "eOverflow"],
+            ["drop_newest", "conflate", "drop_oldest", "block"]
+        )
+        self.assertEqual(
+            engine.get_overflow_counts(),
+            {
+                "eBar.": {"drop_newest": 1},
+                "eTick.": {"conflate": 2},
+                "eLog": {"drop_oldest": 1},
+                "eOrder.": {"block": 1},
+            }
+        )
+        self.assertEqual(engine._size, 0)
+
+    def test_overflow_block(self):
+        self.engine = EventEngine(capacity=10)
+        received = []
+        done = ThreadingEvent()
+
+        def handler(event):
+            sleep(0.001)
+            received.append(event.data)
+            if event.data == 99:
+                done.set()
+
+        self.engine.register("a", handler)
+        self.engine.start()
+        for i in range(100):
+            self.engine.put(Event("a", i))
+            self.assertLessEqual(self.engine._size, 10)
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(received, list(range(100)))
+
+
+class TestShardedEventEngine(unittest.TestCase):
+
+    def test_per_key_ordering(self):
+        engine = ShardedEventEngine(workers=4)
+        lock = Lock()
+        done = ThreadingEvent()
+        received = {}
+        threads = {}
+
+        def handler(event):
+            tick = event.data
+            with lock:
+                received.setdefault(tick.vt_symbol, []).append(tick.value)
+                threads.setdefault(tick.vt_symbol, set()).add(current_thread().name)
+                if sum(len(values) for values in received.values()) == 8000:
+                    done.set()
+
+        engine.register("eTick.", handler)
+        engine.start()
+        for i in range(1000):
+            for n in range(8):
+                engine.put(Event("eTick.", DummyTick(f"s{n}.SHFE", i)))
+
+        self.assertTrue(done.wait(5))
+        engine.stop()
+
+        for vt_symbol, values in received.items():
+            self.assertEqual(values, list(range(1000)))
+            self.assertEqual(len(threads[vt_symbol]), 1)
+
+
+class TestAsyncEventEngine(unittest.TestCase):
+
+    def test_sync_and_coroutine_handlers(self):
+        engine = AsyncEventEngine(interval=0.05)
+        done = ThreadingEvent()
+        received = []
+
+        def sync_handler(event):
+            received.append(("sync", event.data))
+
+        async def async_handler(event):
+            await asyncio.sleep(0)
+            received.append(("async", event.data))
+            if event.data == 99:
+                engine.call_later(0.1, done.set)
+
+        engine.register("a", sync_handler)
+        engine.register("a", async_handler)
+        engine.register("eTimer", lambda event: received.append(("timer", None)))
+        engine.start()
+
+        # Put from other threads like legacy gateways.
+        producer = Thread(target=lambda: [engine.put(Event("a", i)) for i in range(100)])
+        producer.start()
+        producer.join()
+
+        self.assertTrue(done.wait(2))
+        engine.stop()
+
+        data = [item for item in received if item[0] != "timer"]
+        expected = []
+        for i in range(100):
+            expected.extend([("sync", i), ("async", i)])
+        self.assertEqual(data, expected)
+        self.assertIn(("timer", None), received)
+
+    def test_external_loop(self):
+        received = []
+
+        async def main():
+            engine = AsyncEventEngine(loop=asyncio.get_running_loop())
+            engine.register("a", lambda event: received.append(event.data))
+            engine.start()
+            engine.put(Event("a", 1))
+            await asyncio.sleep(0.05)
+            engine.stop()
+            await asyncio.sleep(0)
+
+        asyncio.run(main())
+        self.assertEqual(received, [1])
+
+    def test_timer_stopped_with_external_loop(self):
+        puts = []
+
+        async def main():
+            engine = AsyncEventEngine(interval=0.01, loop=asyncio.get_running_loop())
+            put = engine.put
+            engine.put = lambda event: (puts.append(event.type), put(event))
+            engine.start()
+            await asyncio.sleep(0.05)
+            engine.stop()
+            await asyncio.sleep(0)
+
+            count = len(puts)
+            await asyncio.sleep(0.05)
+            self.assertEqual(len(puts), count)
+            self.assertFalse(engine._timer_handles)
+
+            # Timer is scheduled again after restart.
+            engine.start()
+            await asyncio.sleep(0.05)
+            engine.stop()
+            self.assertGreater(len(puts), count)
+
+        asyncio.run(main())
+        self.assertIn("eTimer", puts)
+
+
+if __name__ == "__main__":
+    unittest.main()
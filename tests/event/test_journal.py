@@ -0,0 +1,92 @@
+"""
+Test if event recording and replay works fine
+"""
+import os
+import tempfile
+import unittest
+from threading import Event as ThreadingEvent, Lock
+from time import monotonic
+
+from vnpy.event import Event, EventEngine, EventRecorder, EventReplayer, read_journal
+
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self) -> None:
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+        os.remove(self.filename)
+
+    def tearDown(self) -> None:
+        os.remove(self.filename)
+
+    def record(self, events):
+        engine = EventEngine()
+        recorder = EventRecorder(engine, self.filename, types=["eTick.", "eOrder."])
+        for event in events:
+            engine._process(event)
+        recorder.close()
+        return recorder
+
+    def test_record_and_read(self):
+        recorder = self.record([
+            Event("eTick.", {"price": 1}),
+            Event("eLog", "not recorded"),
+            Event("eOrder.", ("order", 2)),
+        ])
+        self.assertEqual(recorder.count, 2)
+
+        records = list(read_journal(self.filename))
+        self.assertEqual(
+            [(event.type, event.data) for _, event in records],
+            [("eTick.", {"price": 1}), ("eOrder.", ("order", 2))]
+        )
+        self.assertLessEqual(records[0][0], records[1][0])
+
+        # A partly written record at the end is ignored.
+        with open(self.filename, "ab") as f:
+            f.write(b"\x00\x01")
+        self.assertEqual(len(list(read_journal(self.filename))), 2)
+
+    def test_unpicklable_skipped(self):
+        engine = EventEngine(interval=10)
+        recorder = EventRecorder(engine, self.filename)
+        done = ThreadingEvent()
+
+        engine.start()
+        engine.put(Event("eTick.", {"price": 1}))
+        engine.put(Event("eTick.", Lock()))
+        engine.call_later(0.01, done.set)
+        self.assertTrue(done.wait(2))
+
+        # Dispatcher survives and keeps recording.
+        engine.put(Event("eOrder.", 2))
+        done.clear()
+        engine.call_later(0.01, done.set)
+        self.assertTrue(done.wait(2))
+        engine.stop()
+        recorder.close()
+
+        self.assertEqual(recorder.errors, 1)
+        types = [event.type for _, event in read_journal(self.filename)]
+        self.assertEqual(types, ["eTick.", "eOrder."])
+
+    def test_replay(self):
+        self.record([Event("eTick.", i) for i in range(10)] + [Event("eOrder.", 10)])
+
+        engine = EventEngine()
+        received = []
+        engine.register("eTick.", lambda event: received.append(event.data))
+
+        count = EventReplayer(self.filename, types=["eTick."]).replay(engine, dispatch=True)
+        self.assertEqual(count, 10)
+        self.assertEqual(received, list(range(10)))
+
+        start = monotonic()
+        EventReplayer(self.filename).replay(engine, speed=1)
+        self.assertLess(monotonic() - start, 1)
+        self.assertEqual(len(engine._drain(0)), 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
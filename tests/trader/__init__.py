@@ -1,2 +1,10 @@
 from .test_database import *
 from .test_settings import *
+from .test_shm import *
+from .test_object import *
+from .test_batch import *
+from .test_orderbook import *
+from .test_utility import *
+from .test_indicator import *
+from .test_session import *
+from .test_calendar import *
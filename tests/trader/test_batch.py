@@ -0,0 +1,85 @@
+"""
+Test if columnar batch containers work fine
+"""
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from vnpy.trader.batch import BarBatch, TickBatch
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, TickData
+
+
+class TestBarBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        start = datetime(2020, 1, 2, 9)
+        self.bars = [
+            BarData(
+                gateway_name="DB",
+                symbol="rb2005",
+                exchange=Exchange.SHFE,
+                datetime=start + timedelta(minutes=i),
+                datetime_start=start + timedelta(minutes=i),
+                datetime_end=start + timedelta(minutes=i + 1),
+                interval=Interval.MINUTE,
+                close_price=3500 + i,
+            )
+            for i in range(10)
+        ]
+        self.batch = BarBatch.from_list(self.bars)
+
+    def test_round_trip(self):
+        self.assertEqual(len(self.batch), 10)
+        self.assertEqual(self.batch.interval, Interval.MINUTE)
+        self.assertEqual(self.batch.to_list(), self.bars)
+        self.assertEqual(self.batch[-1], self.bars[-1])
+
+    def test_index_error(self):
+        self.assertEqual(self.batch[-10], self.bars[0])
+        for ix in [10, -11]:
+            with self.assertRaises(IndexError):
+                self.batch[ix]
+
+    def test_iter_chunks(self):
+        bars = self.bars * 300
+        batch = BarBatch.from_list(bars)
+        self.assertEqual(list(batch), bars)
+
+    def test_slice_view(self):
+        view = self.batch[2:5]
+        view.close[0] = 0
+
+        self.assertEqual(len(view), 3)
+        self.assertEqual(self.batch.close[2], 0)
+        self.assertTrue(np.shares_memory(view.data, self.batch.data))
+
+    def test_dataframe(self):
+        df = self.batch.to_dataframe()
+        batch = BarBatch.from_dataframe(
+            df, "rb2005", Exchange.SHFE, interval=Interval.MINUTE
+        )
+        self.assertEqual(batch.to_list(), self.bars)
+
+
+class TestTickBatch(unittest.TestCase):
+
+    def test_round_trip(self):
+        tick = TickData(
+            gateway_name="DB",
+            symbol="rb2005",
+            exchange=Exchange.SHFE,
+            datetime=datetime(2020, 1, 2, 9, 30),
+            name="螺纹钢2005",
+            last_price=3500,
+            bid_price_1=3499,
+        )
+        batch = TickBatch.from_list([tick])
+
+        self.assertEqual(batch.last_price[0], 3500)
+        self.assertEqual(batch[0], tick)
+
+
+if __name__ == "__main__":
+    unittest.main()
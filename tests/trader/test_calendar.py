@@ -0,0 +1,67 @@
+"""
+Test if trading calendar works fine
+"""
+import unittest
+import warnings
+from datetime import date, datetime
+
+import numpy as np
+
+from vnpy.trader.calendar import TradingCalendar
+
+
+class TestTradingCalendar(unittest.TestCase):
+
+    def setUp(self):
+        self.calendar = TradingCalendar(["2020-10-01", "2020-10-02", "2020-10-05"])
+
+    def test_trading_day(self):
+        calendar = self.calendar
+
+        self.assertFalse(calendar.is_trading_day(date(2020, 10, 1)))
+        self.assertFalse(calendar.is_trading_day(date(2020, 10, 3)))
+        self.assertTrue(calendar.is_trading_day(date(2020, 10, 6)))
+
+        self.assertEqual(calendar.get_next_trading_day(date(2020, 10, 1)), date(2020, 10, 6))
+        self.assertEqual(calendar.get_next_trading_day(date(2020, 9, 30), False), date(2020, 10, 6))
+        self.assertEqual(calendar.get_previous_trading_day(datetime(2020, 10, 6)), datetime(2020, 9, 30))
+
+        calendar.add_holidays([date(2020, 10, 6)])
+        self.assertEqual(calendar.get_next_trading_day(date(2020, 10, 1)), date(2020, 10, 7))
+
+    def test_night_session(self):
+        calendar = self.calendar
+
+        self.assertTrue(calendar.has_night_session(date(2020, 9, 28)))
+        self.assertFalse(calendar.has_night_session(date(2020, 10, 6)))
+        self.assertTrue(calendar.has_night_session(date(2020, 10, 7)))
+
+    def test_roll(self):
+        calendar = self.calendar
+        days = np.array(["2020-09-30", "2020-10-01", "2020-10-03", "2020-10-06"], dtype="datetime64[D]")
+
+        forward = [calendar.get_next_trading_day(d) for d in days.tolist()]
+        backward = [calendar.get_previous_trading_day(d) for d in days.tolist()]
+
+        self.assertEqual(calendar.roll_forward(days).tolist(), forward)
+        self.assertEqual(calendar.roll_backward(days).tolist(), backward)
+
+    def test_coverage(self):
+        calendar = self.calendar
+        self.assertTrue(calendar.is_covered(date(2020, 1, 1)))
+        self.assertFalse(calendar.is_covered(date(2021, 1, 4)))
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            calendar.is_trading_day(date(2021, 1, 4))
+            calendar.is_trading_day(date(2021, 1, 5))
+            calendar.roll_forward(np.array(["2021-01-04"], dtype="datetime64[D]"))
+        self.assertEqual(len(caught), 1)
+
+        # Coverage extends to years of holidays added
+        calendar.add_holidays(["2021-01-01"])
+        self.assertTrue(calendar.is_covered(date(2021, 12, 31)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,7 +12,10 @@ from vnpy.trader.object import BarData, TickData
 
 os.environ["VNPY_TESTING"] = "1"
 
-profiles = {Driver.SQLITE: {"driver": "sqlite", "database": "test_db.db"}}
+profiles = {
+    Driver.SQLITE: {"driver": "sqlite", "database": "test_db.db"},
+    Driver.FILE: {"driver": "file", "database": "test_db_file"},
+}
 if "VNPY_TEST_ONLY_SQLITE" not in os.environ:
     profiles.update(
         {
@@ -54,6 +57,8 @@ bar = BarData(
     symbol="test_symbol",
     exchange=Exchange.BITMEX,
     datetime=now(),
+    datetime_start=now(),
+    datetime_end=now(),
     interval=Interval.MINUTE,
 )
 
@@ -125,6 +130,76 @@ class TestDatabase(unittest.TestCase):
 
                 self.assertBarCount(1, "there should be only one item after save")
 
+    def test_bulk_save_bar(self):
+        for driver, settings in profiles.items():
+            with self.subTest(driver=driver, settings=settings):
+                self.connect(settings)
+
+                def generate_bars(volume: float):
+                    for n in range(250):
+                        new_bar = copy(bar)
+                        new_bar.datetime = bar.datetime - timedelta(minutes=n)
+                        new_bar.volume = volume
+                        yield new_bar
+
+                count = self.manager.save_bar_data(generate_bars(1), batch_size=100)
+                self.assertEqual(count, 250)
+
+                # duplicated bar in one batch, the last one is kept
+                bars = list(generate_bars(2))
+                bars.append(copy(bars[0]))
+                bars[-1].volume = 3
+                self.manager.save_bar_data(bars, batch_size=1000)
+                self.assertBarCount(250, "there should be no duplicated item after bulk upsert")
+
+                newest = self.manager.get_newest_bar_data(bar.symbol, bar.exchange, bar.interval)
+                self.assertEqual(newest.volume, 3)
+
+    def test_load_bar_batch(self):
+        for driver, settings in profiles.items():
+            with self.subTest(driver=driver, settings=settings):
+                self.connect(settings)
+                if not hasattr(self.manager, "load_bar_batch"):
+                    continue
+
+                older_one = copy(bar)
+                older_one.datetime = bar.datetime - timedelta(minutes=1)
+                older_one.close_price = 1.5
+                self.manager.save_bar_data([older_one, bar])
+
+                args = (bar.symbol, bar.exchange, bar.interval, older_one.datetime, bar.datetime)
+                bars = self.manager.load_bar_data(*args)
+                batch = self.manager.load_bar_batch(*args)
+
+                self.assertEqual(len(batch), 2)
+                self.assertEqual(batch.close.tolist(), [1.5, 0])
+                self.assertEqual([b.datetime for b in batch], [b.datetime for b in bars])
+                self.assertEqual(bars[0].datetime_end, older_one.datetime + timedelta(minutes=1))
+                self.assertEqual(bars[0].interval, Interval.MINUTE)
+
+    def test_iter_bar(self):
+        for driver, settings in profiles.items():
+            with self.subTest(driver=driver, settings=settings):
+                self.connect(settings)
+
+                bars = []
+                for n in range(25):
+                    new_bar = copy(bar)
+                    new_bar.datetime = bar.datetime - timedelta(minutes=n)
+                    new_bar.volume = n
+                    bars.append(new_bar)
+                self.manager.save_bar_data(bars)
+
+                args = (bar.symbol, bar.exchange, bar.interval, bars[-1].datetime, bar.datetime)
+                loaded = self.manager.load_bar_data(*args)
+                iterated = list(self.manager.iter_bar_data(*args, chunk_size=10))
+
+                self.assertEqual(len(iterated), 25)
+                self.assertEqual(
+                    [b.volume for b in iterated],
+                    [b.volume for b in loaded]
+                )
+
     def test_upsert_tick(self):
         for driver, settings in profiles.items():
             with self.subTest(driver=driver, settings=settings):
@@ -142,6 +217,13 @@ class TestDatabase(unittest.TestCase):
 
                 self.assertTickCount(1, "there should be only one item after save")
 
+                args = (tick.symbol, tick.exchange, tick.datetime - timedelta(days=1), now())
+                loaded = self.manager.load_tick_data(*args)
+                self.assertEqual(loaded[0].name, tick.name)
+
+                batch = self.manager.load_tick_batch(*args)
+                self.assertEqual(batch[0].name, tick.name)
+
     def test_newest_bar(self):
         for driver, settings in profiles.items():
             with self.subTest(driver=driver, settings=settings):
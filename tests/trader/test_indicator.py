@@ -0,0 +1,95 @@
+"""
+Test if incremental indicators are consistent with talib
+"""
+import unittest
+
+import numpy as np
+import talib
+
+from vnpy.trader.indicator import (
+    AdxIndicator,
+    AtrIndicator,
+    BollIndicator,
+    CciIndicator,
+    DonchianIndicator,
+    EmaIndicator,
+    HlcIndicator,
+    MacdIndicator,
+    RsiIndicator,
+    SmaIndicator,
+    StdIndicator,
+)
+
+
+class TestIndicator(unittest.TestCase):
+
+    def setUp(self) -> None:
+        rs = np.random.RandomState(0)
+        self.close = 3500 + np.cumsum(rs.normal(0, 5, 300))
+        self.high = self.close + rs.uniform(0, 5, 300)
+        self.low = self.close - rs.uniform(0, 5, 300)
+
+    def check(self, indicator, expected, hlc=False):
+        """
+        Update indicator with all data and compare every value with talib.
+        """
+        results = []
+        for high, low, close in zip(self.high, self.low, self.close):
+            if hlc:
+                results.append(indicator.update(high, low, close))
+            else:
+                results.append(indicator.update(close))
+
+        results = np.array(results, dtype=float)
+        self.assertTrue(
+            np.allclose(results, expected, rtol=1e-9, atol=1e-6, equal_nan=True),
+            indicator.__class__.__name__
+        )
+
+    def test_close_indicators(self):
+        for n in [5, 14, 30]:
+            self.check(SmaIndicator(n), talib.SMA(self.close, n))
+            self.check(EmaIndicator(n), talib.EMA(self.close, n))
+            self.check(StdIndicator(n), talib.STDDEV(self.close, n))
+            self.check(RsiIndicator(n), talib.RSI(self.close, n))
+
+    def test_hlc_indicators(self):
+        for n in [5, 14, 30]:
+            self.check(AtrIndicator(n), talib.ATR(self.high, self.low, self.close, n), True)
+            self.check(AdxIndicator(n), talib.ADX(self.high, self.low, self.close, n), True)
+            self.check(CciIndicator(n), talib.CCI(self.high, self.low, self.close, n), True)
+
+    def test_channel_indicators(self):
+        n = 20
+
+        indicator = DonchianIndicator(n)
+        results = [indicator.update(h, l) for h, l in zip(self.high, self.low)]
+        self.assertTrue(np.allclose(
+            [r[0] for r in results], talib.MAX(self.high, n), equal_nan=True))
+        self.assertTrue(np.allclose(
+            [r[1] for r in results], talib.MIN(self.low, n), equal_nan=True))
+
+        indicator = BollIndicator(n, 2)
+        results = [indicator.update(c) for c in self.close]
+        up = talib.SMA(self.close, n) + talib.STDDEV(self.close, n) * 2
+        self.assertTrue(np.allclose([r[0] for r in results], up, equal_nan=True))
+
+    def test_abstract_update(self):
+        class MissingUpdate(HlcIndicator):
+            pass
+
+        with self.assertRaises(TypeError):
+            MissingUpdate(5)
+
+    def test_macd(self):
+        indicator = MacdIndicator(12, 26, 9)
+        results = [indicator.update(c) for c in self.close]
+        expected = talib.MACD(self.close, 12, 26, 9)
+
+        for n in range(3):
+            self.assertTrue(np.allclose(
+                [r[n] for r in results], expected[n], equal_nan=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Test if compact and snapshot data objects work fine
+"""
+import pickle
+import unittest
+from copy import copy
+from datetime import datetime
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.object import CompactTickData, TickData
+
+
+class TestCompactData(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tick = TickData(
+            gateway_name="CTP",
+            symbol="rb2005",
+            exchange=Exchange.SHFE,
+            datetime=datetime(2020, 1, 2, 9, 30),
+            last_price=3500,
+        )
+
+    def test_compatible(self):
+        compact = CompactTickData.from_data(self.tick)
+
+        self.assertEqual(compact.last_price, 3500)
+        self.assertEqual(compact.bid_price_5, 0)
+        self.assertIs(compact.vt_symbol, self.tick.vt_symbol)
+        self.assertEqual(compact.to_data(), self.tick)
+        self.assertFalse(hasattr(compact, "__dict__"))
+
+    def test_copy(self):
+        compact = CompactTickData.from_data(self.tick)
+
+        self.assertEqual(copy(compact), compact)
+        self.assertEqual(pickle.loads(pickle.dumps(compact)), compact)
+
+        changed = copy(compact)
+        changed.last_price = 3501
+        self.assertNotEqual(changed, compact)
+
+
+class TestTickSnapshot(unittest.TestCase):
+
+    def test_snapshot(self):
+        tick = TickData(
+            gateway_name="CTP",
+            symbol="rb2005",
+            exchange=Exchange.SHFE,
+            datetime=datetime(2020, 1, 2, 9, 30),
+            last_price=3500,
+        )
+        snapshot = tick.snapshot()
+
+        self.assertIsInstance(snapshot, TickData)
+        self.assertEqual(snapshot, tick)
+        self.assertIs(copy(snapshot), snapshot)
+        self.assertIs(snapshot.snapshot(), snapshot)
+        self.assertEqual(pickle.loads(pickle.dumps(snapshot)), snapshot)
+
+        with self.assertRaises(AttributeError):
+            snapshot.last_price = 3501
+
+        tick.last_price = 3501
+        self.assertEqual(snapshot.last_price, 3500)
+        self.assertEqual(snapshot.thaw().vt_symbol, "rb2005.SHFE")
+
+
+if __name__ == "__main__":
+    unittest.main()
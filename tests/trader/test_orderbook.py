@@ -0,0 +1,96 @@
+"""
+Test if order book works fine
+"""
+import unittest
+from datetime import datetime
+from zlib import crc32
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.object import TickData
+from vnpy.trader.orderbook import OrderBook, format_number
+
+
+class TestOrderBook(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.book = OrderBook("BTC-USDT", Exchange.OKEX, "OKEX")
+        self.book.apply_snapshot(
+            [(100, 1), (99, 2), (101, 3)],
+            [(103, 1), (102, 2), (104, 3)]
+        )
+
+    def test_sorted(self):
+        self.assertEqual(self.book.get_best_bid(), 101)
+        self.assertEqual(self.book.get_best_ask(), 102)
+        self.assertFalse(self.book.is_crossed())
+
+        depth = self.book.to_depth(2)
+        self.assertEqual(depth.bids, [(101, 3), (100, 1)])
+        self.assertEqual(depth.asks, [(102, 2), (103, 1)])
+        self.assertEqual(depth.vt_symbol, "BTC-USDT.OKEX")
+
+    def test_update(self):
+        self.book.apply_update([(101, 0), (100, 5)], [(101.5, 1)])
+
+        depth = self.book.to_depth()
+        self.assertEqual(depth.bids, [(100, 5), (99, 2)])
+        self.assertEqual(depth.asks[0], (101.5, 1))
+
+        # Deleting missing level is ignored
+        self.book.update_bid(50, 0)
+        self.assertEqual(len(self.book.bids), 2)
+
+    def test_update_tick(self):
+        tick = TickData(
+            gateway_name="OKEX",
+            symbol="BTC-USDT",
+            exchange=Exchange.OKEX,
+            datetime=datetime.now(),
+            bid_price_5=1,
+        )
+        self.book.update_tick(tick)
+
+        self.assertEqual(tick.bid_price_1, 101)
+        self.assertEqual(tick.bid_volume_3, 2)
+        self.assertEqual(tick.ask_price_3, 104)
+        self.assertEqual(tick.bid_price_5, 0)
+
+    def test_checksum(self):
+        book = OrderBook("BTC-USDT", Exchange.OKEX, "OKEX")
+        book.update_bid(3366.1, 7, "3366.1:7")
+        book.update_bid(3366, 6, "3366:6")
+        book.update_ask(3366.8, 9, "3366.8:9")
+
+        text = "3366.1:7:3366.8:9:3366:6"
+        checksum = crc32(text.encode())
+        if checksum >= 2 ** 31:
+            checksum -= 2 ** 32
+
+        self.assertEqual(book.get_checksum(), checksum)
+        self.assertTrue(book.validate(checksum))
+
+        book.update_bid(3366, 0)
+        self.assertFalse(book.validate(checksum))
+
+    def test_format_number(self):
+        # Same as Number.prototype.toString of JavaScript
+        self.assertEqual(format_number(0.00005), "0.00005")
+        self.assertEqual(format_number(-0.00001234), "-0.00001234")
+        self.assertEqual(format_number(1e-7), "1e-7")
+        self.assertEqual(format_number(7000.0), "7000")
+        self.assertEqual(format_number(3366.1), "3366.1")
+        self.assertEqual(format_number(1e21), "1e+21")
+
+        book = OrderBook("tBTCUSD", Exchange.BITFINEX, "BITFINEX")
+        amount = 0.00005
+        text = f"{format_number(7254.7)}:{format_number(amount)}"
+        book.update_bid(7254.7, amount, text)
+
+        checksum = crc32(b"7254.7:0.00005")
+        if checksum >= 2 ** 31:
+            checksum -= 2 ** 32
+        self.assertTrue(book.validate(checksum))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,210 @@
+"""
+Test if session table, SessionBarGenerator and BarResampler work fine
+"""
+import unittest
+from datetime import datetime, timedelta
+
+from vnpy.trader.batch import BarBatch
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy.trader.resample import resample_bars
+from vnpy.trader.session import get_session_table
+from vnpy.trader.utility import SessionBarGenerator
+
+
+def generate_session_bars(symbol: str, trading_days: list):
+    """
+    Generate 1 minute bars of every trading minute in trading days.
+    """
+    table = get_session_table(symbol)
+
+    bars = []
+    for trading_day in trading_days:
+        for offset in table.get_session_minutes():
+            dt = table.get_datetime(trading_day, offset)
+            bar = BarData(
+                gateway_name="DB",
+                symbol=symbol,
+                exchange=Exchange.SHFE,
+                datetime=dt,
+                datetime_start=dt,
+                datetime_end=dt + timedelta(minutes=1),
+                interval=Interval.MINUTE,
+                volume=1,
+                open_price=offset,
+                high_price=offset + 1,
+                low_price=offset - 1,
+                close_price=offset,
+            )
+            bars.append(bar)
+    return bars
+
+
+class TestSessionTable(unittest.TestCase):
+
+    def test_trading_day(self):
+        table = get_session_table("rb2005")
+
+        # Friday night belongs to Monday
+        self.assertEqual(
+            table.get_trading_day(datetime(2020, 1, 3, 21, 30)),
+            datetime(2020, 1, 6)
+        )
+        self.assertEqual(
+            table.get_datetime(datetime(2020, 1, 6), 0),
+            datetime(2020, 1, 3, 21)
+        )
+
+    def test_window(self):
+        table = get_session_table("rb2005")
+        offset = table.get_minute_offset(datetime(2020, 1, 6, 10, 5))
+
+        start, end = table.get_window(offset, 30)
+        self.assertEqual(table.get_datetime(datetime(2020, 1, 6), end), datetime(2020, 1, 6, 10, 15))
+
+        start, end = table.get_window(offset, 60)
+        self.assertEqual(table.get_datetime(datetime(2020, 1, 6), end), datetime(2020, 1, 6, 11))
+
+        self.assertTrue(table.is_in_session(offset))
+        self.assertFalse(table.is_in_session(table.get_minute_offset(datetime(2020, 1, 6, 10, 20))))
+
+    def test_holiday(self):
+        table = get_session_table("rb2005")
+
+        # No night session before National Day holidays
+        self.assertEqual(
+            table.get_trading_day(datetime(2020, 9, 30, 21, 30)),
+            datetime(2020, 10, 9)
+        )
+        self.assertFalse(table.is_trading_time(datetime(2020, 9, 30, 21, 30)))
+        self.assertTrue(table.is_trading_time(datetime(2020, 9, 30, 14, 59, 30)))
+        self.assertTrue(table.is_trading_time(datetime(2020, 10, 9, 9, 0)))
+        self.assertFalse(table.is_trading_time(datetime(2020, 10, 8, 9, 0)))
+
+    def test_trading_time(self):
+        table = get_session_table("cu2005")
+
+        self.assertTrue(table.is_trading_time(datetime(2020, 1, 3, 21, 0)))
+        self.assertTrue(table.is_trading_time(datetime(2020, 1, 4, 0, 59, 59)))
+        self.assertFalse(table.is_trading_time(datetime(2020, 1, 4, 1, 0)))
+        self.assertFalse(table.is_trading_time(datetime(2020, 1, 6, 15, 0)))
+        self.assertFalse(table.is_trading_time(datetime(2020, 1, 6, 10, 15)))
+
+    def test_exchange_tables(self):
+        # Unknown futures products are traded in commodity day sessions.
+        table = get_session_table("eb2005", Exchange.DCE)
+        self.assertTrue(table.is_trading_time(datetime(2020, 1, 6, 14, 0)))
+        self.assertFalse(table.is_trading_time(datetime(2020, 1, 6, 16, 0)))
+        self.assertFalse(table.is_trading_time(datetime(2020, 1, 7, 3, 30)))
+
+        # Options use session of underlying product.
+        table = get_session_table("m2005-C-2800", Exchange.DCE)
+        self.assertTrue(table.is_trading_time(datetime(2020, 1, 6, 22, 0)))
+
+        # Stock is not mapped to futures product with the same letters.
+        table = get_session_table("C", Exchange.SSE)
+        self.assertFalse(table.is_trading_time(datetime(2020, 1, 6, 9, 15)))
+        self.assertFalse(table.is_trading_time(datetime(2020, 1, 6, 21, 30)))
+        self.assertEqual(
+            table.get_trading_day(datetime(2020, 1, 6, 14, 0)),
+            datetime(2020, 1, 6)
+        )
+
+        table = get_session_table("XBTUSD", Exchange.BITMEX)
+        self.assertTrue(table.is_trading_time(datetime(2020, 1, 4, 3, 30)))
+
+    def test_bar_window(self):
+        table = get_session_table("rb2005")
+
+        self.assertEqual(
+            table.get_bar_window(datetime(2020, 1, 6, 10, 5), 30),
+            (datetime(2020, 1, 6, 10), datetime(2020, 1, 6, 10, 15))
+        )
+        self.assertEqual(
+            table.get_bar_window(datetime(2020, 1, 3, 22, 10), 0),
+            (datetime(2020, 1, 3, 21), datetime(2020, 1, 6, 15))
+        )
+
+
+class TestSessionBarGenerator(unittest.TestCase):
+
+    def generate(self, window: int, interval: Interval):
+        """"""
+        bars = generate_session_bars("rb2005", [datetime(2020, 1, 6), datetime(2020, 1, 7)])
+
+        window_bars = []
+        generator = SessionBarGenerator(None, window, window_bars.append, interval)
+        for bar in bars:
+            generator.update_bar(bar)
+        return window_bars
+
+    def test_minute_window(self):
+        window_bars = self.generate(60, Interval.MINUTE)
+
+        self.assertEqual(len(window_bars), 14)
+        self.assertEqual(window_bars[3].datetime_start, datetime(2020, 1, 6, 10))
+        self.assertEqual(window_bars[3].datetime_end, datetime(2020, 1, 6, 11))
+        self.assertEqual(window_bars[3].volume, 45)
+        self.assertEqual(window_bars[3].interval, Interval.HOUR)
+
+    def test_arbitrary_window(self):
+        window_bars = self.generate(7, Interval.MINUTE)
+
+        self.assertEqual(len(window_bars), 100)
+        self.assertTrue(all(bar.volume <= 7 for bar in window_bars))
+
+    def test_daily_window(self):
+        window_bars = self.generate(1, Interval.DAILY)
+
+        self.assertEqual(len(window_bars), 2)
+        self.assertEqual(window_bars[0].datetime_start, datetime(2020, 1, 3, 21))
+        self.assertEqual(window_bars[0].datetime_end, datetime(2020, 1, 6, 15))
+        self.assertEqual(window_bars[0].volume, 345)
+
+
+class TestBarResampler(unittest.TestCase):
+
+    def test_same_as_generator(self):
+        trading_days = [datetime(2020, 1, 6) + timedelta(days=n) for n in range(5)]
+        bars = generate_session_bars("rb2005", trading_days)
+
+        # Remove some bars and add bars out of trading sessions
+        bars = [bar for n, bar in enumerate(bars) if n % 7]
+        for trading_day in trading_days:
+            dt = trading_day.replace(hour=10, minute=20)
+            bars.append(BarData(
+                gateway_name="DB",
+                symbol="rb2005",
+                exchange=Exchange.SHFE,
+                datetime=dt,
+                datetime_start=dt,
+                datetime_end=dt + timedelta(minutes=1),
+                interval=Interval.MINUTE,
+                volume=1,
+            ))
+        bars.sort(key=lambda bar: bar.datetime)
+
+        windows = [
+            (5, Interval.MINUTE),
+            (30, Interval.MINUTE),
+            (7, Interval.MINUTE),
+            (2, Interval.HOUR),
+            (1, Interval.DAILY),
+        ]
+        results = resample_bars(BarBatch.from_list(bars), windows)
+
+        for window, interval in windows:
+            window_bars = []
+            generator = SessionBarGenerator(None, window, window_bars.append, interval)
+            for bar in bars:
+                generator.update_bar(bar)
+
+            # Unfinished window bar is also included in resampled bars
+            if generator.window_bar:
+                window_bars.append(generator.window_bar)
+
+            self.assertEqual(results[(window, interval)].to_list(), window_bars)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Test if shared memory tick bus works fine
+"""
+import os
+import unittest
+from datetime import datetime
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.constant import Exchange
+from vnpy.trader.event import EVENT_TICK
+from vnpy.trader.object import TickData
+from vnpy.trader.shm import (
+    SharedTickPublisher,
+    SharedTickSubscriber,
+    TickRingBuffer,
+    shared_memory
+)
+
+
+def create_tick(price: float) -> TickData:
+    return TickData(
+        gateway_name="CTP",
+        symbol="rb2005",
+        exchange=Exchange.SHFE,
+        datetime=datetime(2020, 1, 2, 9, 30, 1, 500),
+        name="螺纹钢2005",
+        last_price=price,
+        bid_price_1=price - 1,
+        ask_volume_5=10,
+    )
+
+
+@unittest.skipIf(shared_memory is None, "shared_memory requires Python 3.8")
+class TestSharedMemory(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.name = f"vnpy_test_{os.getpid()}"
+
+    def test_read_write(self):
+        writer = TickRingBuffer(self.name, capacity=4, create=True)
+        reader = TickRingBuffer(self.name)
+
+        for i in range(3):
+            writer.write(create_tick(3500 + i))
+
+        ticks, next_seq, lost = reader.read(1)
+        self.assertEqual([tick.last_price for tick in ticks], [3500, 3501, 3502])
+        self.assertEqual(ticks[0], create_tick(3500))
+        self.assertEqual((next_seq, lost), (4, 0))
+
+        for i in range(6):
+            writer.write(create_tick(3600 + i))
+
+        ticks, next_seq, lost = reader.read(next_seq)
+        self.assertEqual([tick.last_price for tick in ticks], [3602, 3603, 3604, 3605])
+        self.assertEqual((next_seq, lost), (10, 2))
+
+        reader.close()
+        writer.close()
+
+    def test_publisher_subscriber(self):
+        market_engine = EventEngine()
+        strategy_engine = EventEngine()
+
+        publisher = SharedTickPublisher(market_engine, self.name, capacity=16)
+        subscriber = SharedTickSubscriber(strategy_engine, self.name)
+
+        received = []
+        strategy_engine.register_general(lambda event: received.append(event))
+
+        publisher.process_tick_event(Event(EVENT_TICK, create_tick(3500)))
+        self.assertEqual(subscriber.poll(), 1)
+
+        for event in strategy_engine._drain(0):
+            strategy_engine._process(event)
+
+        self.assertEqual([event.type for event in received], ["eTick.", "eTick.rb2005.SHFE"])
+        self.assertEqual(received[0].data.last_price, 3500)
+
+        subscriber.ring.close()
+        publisher.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
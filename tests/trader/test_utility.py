@@ -0,0 +1,110 @@
+"""
+Test if ArrayManager works fine
+"""
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from vnpy.trader.batch import BarBatch
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy.trader.utility import ArrayManager
+
+
+def generate_bars(count: int, start: datetime = datetime(2020, 1, 2, 9)):
+    """
+    Generate random walk bars for testing.
+    """
+    close = 3500 + np.cumsum(np.random.RandomState(0).normal(0, 5, count))
+
+    bars = []
+    for n, price in enumerate(close):
+        dt = start + timedelta(minutes=n)
+        bar = BarData(
+            gateway_name="DB",
+            symbol="rb2005",
+            exchange=Exchange.SHFE,
+            datetime=dt,
+            datetime_start=dt,
+            datetime_end=dt + timedelta(minutes=1),
+            interval=Interval.MINUTE,
+            open_price=price - 1,
+            high_price=price + 3,
+            low_price=price - 3,
+            close_price=price,
+            volume=n,
+        )
+        bars.append(bar)
+    return bars
+
+
+class TestArrayManager(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.bars = generate_bars(250)
+
+    def test_update_bar(self):
+        am = ArrayManager(100)
+        for n, bar in enumerate(self.bars):
+            am.update_bar(bar)
+
+            if n < 99:
+                self.assertFalse(am.inited)
+                self.assertEqual(len(am.time_array), n + 1)
+
+        expected = [bar.close_price for bar in self.bars[-100:]]
+        self.assertTrue(am.inited)
+        self.assertEqual(am.close.tolist(), expected)
+        self.assertEqual(am.time_array[-1], self.bars[-1].datetime)
+        self.assertTrue(am.close.flags["C_CONTIGUOUS"])
+
+    def test_update_bars(self):
+        expected = ArrayManager(100)
+        for bar in self.bars:
+            expected.update_bar(bar)
+
+        for data in [self.bars[30:], BarBatch.from_list(self.bars[30:])]:
+            am = ArrayManager(100)
+            for bar in self.bars[:30]:
+                am.update_bar(bar)
+            am.update_bars(data)
+
+            self.assertEqual(am.count, expected.count)
+            self.assertEqual(am.high.tolist(), expected.high.tolist())
+            self.assertEqual(am.time_array[-1], expected.time_array[-1])
+
+            am.update_bar(self.bars[0])
+            self.assertEqual(am.close[-1], self.bars[0].close_price)
+            self.assertEqual(am.close[-2], self.bars[-1].close_price)
+
+    def test_indicator_cache(self):
+        am = ArrayManager(100)
+        am.update_bars(self.bars)
+
+        sma = am.sma(20, array=True)
+        cached = am.cache[("sma", (20,))]
+        self.assertEqual(am.sma(20), sma[-1])
+        self.assertEqual(am.sma(n=20), sma[-1])
+        self.assertIs(am.cache[("sma", (20,))], cached)
+
+        # Returned array is a writable copy of cached result
+        last = sma[-1]
+        sma[-1] = 0
+        self.assertEqual(am.sma(20), last)
+        self.assertEqual(am.sma(20, True)[-1], last)
+
+        up, down = am.boll(20, 2)
+        self.assertAlmostEqual(up, last + am.std(20) * 2)
+
+        up_array, down_array = am.boll(20, 2, array=True)
+        up_array[-1] = 0
+        self.assertEqual(am.boll(20, 2)[0], up)
+
+        am.update_bar(self.bars[0])
+        self.assertIsNot(am.cache.get(("sma", (20,))), cached)
+        self.assertAlmostEqual(am.sma(20), am.close[-20:].mean())
+
+
+if __name__ == "__main__":
+    unittest.main()
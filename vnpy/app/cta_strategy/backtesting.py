@@ -18,6 +18,7 @@ from vnpy.trader.constant import (Direction, Offset, Exchange,
 from vnpy.trader.database import database_manager
 from vnpy.trader.object import OrderData, TradeData, BarData, TickData
 from vnpy.trader.utility import round_to
+from vnpy.trader.session import get_trading_day, is_futures_exchange
 
 from .base import (
     BacktestingMode,
@@ -125,6 +126,7 @@ class BacktestingEngine:
         self.days = 0
         self.callback = None
         self.history_data = []
+        self.stream = False
 
         self.stop_order_count = 0
         self.stop_orders = {}
@@ -177,9 +179,14 @@ class BacktestingEngine:
         capital: int = 0,
         end: datetime = None,
         mode: BacktestingMode = BacktestingMode.BAR,
+        stream: bool = False,
     ):
-        """"""
+        """
+        If stream is set, history data is read from database chunk by chunk
+        during backtesting instead of being loaded into memory.
+        """
         self.mode = mode
+        self.stream = stream
         self.vt_symbol = vt_symbol
         self.interval = Interval(interval)
         self.rate = rate
@@ -220,6 +227,10 @@ class BacktestingEngine:
 
         self.history_data.clear()       # Clear previously loaded history data
 
+        if self.stream:
+            self.output("流式回测，历史数据将在回放时分批读取")
+            return
+
         # Load 30 days of data each time and allow for progress update
         progress_delta = timedelta(days=30)
         total_delta = self.end - self.start
@@ -270,9 +281,10 @@ class BacktestingEngine:
 
         # Use the first [days] of history data for initializing strategy
         day_count = 0
-        ix = 0
-        
-        for ix, data in enumerate(self.history_data):
+        data = None
+        history_data = self.iter_history_data()
+
+        for data in history_data:
             if self.datetime and data.datetime.day != self.datetime.day:
                 day_count += 1
                 if day_count >= self.days:
@@ -289,11 +301,29 @@ class BacktestingEngine:
         self.output("开始回放历史数据")
 
         # Use the rest of history data for running backtesting
-        for data in self.history_data[ix:]:
+        if data:
+            func(data)
+
+        for data in history_data:
             func(data)
 
         self.output("历史数据回放结束")
 
+    def iter_history_data(self):
+        """
+        Iterate loaded history data, or read from database in stream mode.
+        """
+        if not self.stream:
+            yield from self.history_data
+        elif self.mode == BacktestingMode.BAR:
+            yield from database_manager.iter_bar_data(
+                self.symbol, self.exchange, self.interval, self.start, self.end
+            )
+        else:
+            yield from database_manager.iter_tick_data(
+                self.symbol, self.exchange, self.start, self.end
+            )
+
     def calculate_result(self):
         """"""
         self.output("开始计算逐日盯市盈亏")
@@ -304,7 +334,7 @@ class BacktestingEngine:
 
         # Add trade data into daily reuslt.
         for trade in self.trades.values():
-            d = trade.datetime.date()
+            d = self.get_trading_date(trade.datetime)
             daily_result = self.daily_results[d]
             daily_result.add_trade(trade)
 
@@ -688,9 +718,18 @@ class BacktestingEngine:
         
         return results
 
+    def get_trading_date(self, dt: datetime) -> date:
+        """
+        Get trading day of dt. For Chinese futures, night session belongs
+        to the next trading day, otherwise it is the date of dt.
+        """
+        if not is_futures_exchange(self.exchange):
+            return dt.date()
+        return get_trading_day(self.symbol, dt, self.exchange).date()
+
     def update_daily_close(self, price: float):
         """"""
-        d = self.datetime.date()
+        d = self.get_trading_date(self.datetime)
 
         daily_result = self.daily_results.get(d, None)
         if daily_result:
@@ -224,7 +224,7 @@ class CtaEngine(BaseEngine):
         """处理tick事件，主要是向订阅了tick的策略推送"""
         tick = event.data
 
-        d = deepcopy(tick.__dict__)
+        d = dict(tick.__dict__)
         d["exchange"] = d["exchange"].value
         flt = {
             "vt_symbol": d["vt_symbol"],
@@ -208,7 +208,7 @@ class RecorderEngine(BaseEngine):
 
     def record_tick(self, tick: TickData):
         """"""
-        task = ("tick", copy(tick))
+        task = ("tick", tick.snapshot())
         self.queue.put(task)
 
     def record_bar(self, bar: BarData):
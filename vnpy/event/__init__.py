@@ -1 +1,11 @@
-from .engine import Event, EventEngine, EVENT_TIMER
+from .engine import (
+    Event,
+    EventEngine,
+    ShardedEventEngine,
+    OverflowPolicy,
+    EVENT_TIMER,
+    EVENT_PROFILE,
+    EVENT_OVERFLOW
+)
+from .async_engine import AsyncEventEngine
+from .journal import EventRecorder, EventReplayer, read_journal
@@ -0,0 +1,263 @@
+"""
+Event engine running on asyncio event loop.
+"""
+
+import asyncio
+from collections import deque
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Dict
+
+from .engine import EVENT_CALLBACK, Event, EventEngine, _TimerItem
+
+
+class AsyncEventEngine(EventEngine):
+    """
+    Event engine dispatching events in an asyncio event loop, which
+    can be shared with coroutine based gateways and apps.
+
+    * put is thread-safe, so legacy gateways running their own threads
+      can still push events into it.
+    * handlers can be plain functions or coroutine functions, registered
+      in the same way. Coroutine handlers are awaited one after another,
+      so events are still dispatched in order; a handler doing long
+      I/O should create its own task instead of blocking dispatching.
+    * timers and call_at/call_later are scheduled by the loop itself.
+
+    If no loop is given, a new one is created and run in a thread of
+    its own when engine starts. Otherwise the loop should be run by
+    caller, and the dispatcher task is added into it on start.
+    """
+
+    def __init__(self, interval: float = 1, loop: asyncio.AbstractEventLoop = None):
+        """"""
+        if loop:
+            self._loop = loop
+            self._own_loop = False
+        else:
+            self._loop = asyncio.new_event_loop()
+            self._own_loop = True
+
+        # Events are appended by any thread, and dispatcher is woken up
+        # at most once until it takes them.
+        self._lock = Lock()
+        self._events = deque()
+        self._notified = False
+        self._wakeup: asyncio.Event = None
+
+        # Handles of scheduled timers, only accessed in loop thread.
+        self._timer_handles: Dict[str, asyncio.TimerHandle] = {}
+
+        super().__init__(interval)
+
+        if self._own_loop:
+            self._thread = Thread(target=self._loop.run_forever)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Event loop used by engine.
+        """
+        return self._loop
+
+    async def _run_async(self):
+        """
+        Wait for events and then dispatch them in order.
+        """
+        self._wakeup = asyncio.Event()
+
+        while self._active:
+            with self._lock:
+                events = self._events
+                self._events = deque()
+                self._notified = False
+                self._wakeup.clear()
+
+            if not events:
+                await self._wakeup.wait()
+                continue
+
+            await self._process_async(events)
+
+        if self._own_loop:
+            self._loop.stop()
+
+    async def _process_async(self, events: deque):
+        """
+        Call handlers of every event, await coroutines returned.
+        """
+        pending = self._pending
+        profiler = self._profiler
+        if profiler:
+            profiler.record_depth(len(events) + len(self._events))
+
+        for event in events:
+            type = event.type
+
+            if pending:
+                key = (type, None)
+                if pending.get(key, None) is event:
+                    pending.pop(key)
+
+            if profiler:
+                put_time = getattr(event, "put_time", None)
+                if put_time:
+                    profiler.record_delay(type, perf_counter() - put_time)
+                start = perf_counter()
+
+            for handler in self._dispatch_map.get(type, self._general_dispatch):
+                result = handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+
+                if profiler:
+                    end = perf_counter()
+                    profiler.record_handler(type, handler, end - start)
+                    start = end
+
+    def _wake(self):
+        """
+        Set wakeup flag in loop thread.
+        """
+        if self._wakeup:
+            self._wakeup.set()
+
+    def start(self):
+        """
+        Start dispatcher task (and event loop thread if owned).
+        """
+        self._active = True
+        if self._own_loop:
+            self._thread.start()
+        self._loop.call_soon_threadsafe(self._loop.create_task, self._run_async())
+        self._loop.call_soon_threadsafe(self._start_timers)
+
+    def stop(self):
+        """
+        Stop dispatcher task (and event loop thread if owned).
+        """
+        self._active = False
+        self._loop.call_soon_threadsafe(self._cancel_timers)
+        self._loop.call_soon_threadsafe(self._wake)
+
+        if self._own_loop:
+            self._thread.join()
+
+    def put(self, event: Event):
+        """
+        Put an event object into event queue, from any thread.
+        """
+        if self._profiler:
+            event.put_time = perf_counter()
+
+        with self._lock:
+            self._events.append(event)
+            if self._notified:
+                return
+            self._notified = True
+
+        self._loop.call_soon_threadsafe(self._wake)
+
+    def _put_unique(self, event: Event):
+        """
+        Put timer event unless the previous one is still pending.
+        """
+        key = (event.type, None)
+        if key in self._pending:
+            return
+
+        self._pending[key] = event
+        self.put(event)
+
+    def _schedule_timer(self, item: _TimerItem, deadline: float = None):
+        """
+        Schedule next timer event in loop. Timer stops when engine is
+        inactive, and is scheduled again by start.
+        """
+        if deadline is None:
+            handle = self._timer_handles.pop(item.type, None)
+            if handle:
+                handle.cancel()
+
+        if item.cancelled:
+            return
+
+        now = self._loop.time()
+        if deadline is None:
+            deadline = now + item.interval
+        elif self._active:
+            self._put_unique(Event(item.type))
+
+            # Skip deadlines missed instead of catching up.
+            missed = (now - deadline) // item.interval + 1
+            deadline += missed * item.interval
+        else:
+            self._timer_handles.pop(item.type, None)
+            return
+
+        self._timer_handles[item.type] = self._loop.call_at(
+            deadline, self._schedule_timer, item, deadline
+        )
+
+    def _start_timers(self):
+        """
+        Schedule all timers from now on in loop.
+        """
+        for item in list(self._timers.values()):
+            self._schedule_timer(item)
+
+    def _cancel_timers(self):
+        """
+        Cancel all scheduled timers in loop.
+        """
+        for handle in self._timer_handles.values():
+            handle.cancel()
+        self._timer_handles.clear()
+
+    def _schedule_call(self, deadline: float, item: _TimerItem, call_id: int):
+        """
+        Schedule one-shot callback in loop.
+        """
+        self._loop.call_at(deadline, self._fire_call, item, call_id)
+
+    def _fire_call(self, item: _TimerItem, call_id: int):
+        """
+        Put callback event unless cancelled.
+        """
+        self._calls.pop(call_id, None)
+        if not item.cancelled:
+            self.put(Event(EVENT_CALLBACK, item.callback))
+
+    def add_timer(self, type: str, interval: float):
+        """
+        Generate event of type every interval seconds, replacing
+        existing timer of the same type.
+        """
+        if interval <= 0:
+            raise ValueError(f"timer interval should be positive: {interval}")
+
+        self.remove_timer(type)
+
+        item = _TimerItem(type, interval)
+        self._timers[type] = item
+        self._loop.call_soon_threadsafe(self._schedule_timer, item)
+
+    def remove_timer(self, type: str):
+        """
+        Stop generating timer event of type.
+        """
+        item = self._timers.pop(type, None)
+        if item:
+            item.cancelled = True
+
+    def call_at(self, deadline: float, callback) -> int:
+        """
+        Run callback in loop once, at deadline in time.monotonic seconds.
+        Return an id which can be used with cancel_call.
+        """
+        item = _TimerItem(EVENT_CALLBACK, 0, callback)
+        call_id = next(self._timer_sequence)
+        self._calls[call_id] = item
+
+        self._loop.call_soon_threadsafe(self._schedule_call, deadline, item, call_id)
+        return call_id
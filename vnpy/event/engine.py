@@ -2,13 +2,37 @@
 Event-driven framework of vn.py framework.
 """
 
-from collections import defaultdict
-from queue import Empty, Queue
-from threading import Thread
-from time import sleep
-from typing import Any, Callable
+from collections import defaultdict, deque
+from enum import Enum
+from heapq import heapify, heappop, heappush
+from itertools import count
+from threading import Condition, Lock, Thread, current_thread
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from .profiler import EventProfiler
 
 EVENT_TIMER = "eTimer"
+EVENT_PROFILE = "eProfile"
+EVENT_CALLBACK = "eCallback"
+EVENT_OVERFLOW = "eOverflow"
+
+# Max number of events taken from the highest non-empty lane at once
+# when lanes are scheduled by strict priority.
+LANE_BATCH_SIZE = 100
+
+# Min seconds between two EVENT_OVERFLOW of the same type and policy.
+OVERFLOW_EVENT_INTERVAL = 1
+
+
+class OverflowPolicy(Enum):
+    """
+    What to do when an event is put into a full event queue.
+    """
+    BLOCK = "block"                 # wait until dispatcher takes events
+    DROP_OLDEST = "drop_oldest"     # drop oldest queued event of this policy
+    DROP_NEWEST = "drop_newest"     # drop the event put
+    CONFLATE = "conflate"           # replace queued event of same type and vt_symbol
 
 
 class Event:
@@ -28,38 +52,373 @@ class Event:
 HandlerType = Callable[[Event], None]
 
 
+class _TimerItem:
+    """
+    Periodic timer (interval > 0) or one-shot callback scheduled in event engine.
+    """
+
+    __slots__ = ("type", "interval", "callback", "cancelled")
+
+    def __init__(self, type: str, interval: float, callback: Callable = None):
+        """"""
+        self.type = type
+        self.interval = interval
+        self.callback = callback
+        self.cancelled = False
+
+
 class EventEngine:
     """
     Event engine distributes event object based on its type 
     to those handlers registered.
 
     It also generates timer event by every interval seconds,
-    which can be used for timing purpose.
+    which can be used for timing purpose. Timers are scheduled on
+    monotonic clock without drift, intervals can be below one second
+    and more timers with their own event types and intervals can be
+    added. A timer event is skipped if the previous one of the same
+    type is still waiting in queue, so missed ticks never pile up.
+    One-shot callbacks can be scheduled with call_later/call_at and
+    are run in dispatcher thread.
+
+    Events are drained from the queue in batches: the dispatcher
+    thread takes every pending event under a single lock acquisition
+    and then calls handlers from a frozen tuple prepared for each
+    event type, which is only rebuilt on register/unregister.
+
+    Event types starting with one of the conflation prefixes (e.g.
+    EVENT_TICK) are conflated by vt_symbol of event data: if a newer
+    event of the same type and vt_symbol is put before the pending
+    one is dispatched, the pending one is replaced in place. All other
+    events keep strict FIFO ordering.
+
+    Events can also be split into priority lanes, each defined by a list
+    of event type prefixes, highest priority first. An event goes to the
+    lane with the longest matching prefix ("" matches everything) or to
+    the last lane if nothing matches. Events keep FIFO ordering within a
+    lane. Lanes are scheduled by strict priority (at most LANE_BATCH_SIZE
+    events are taken from the highest non-empty lane before looking at
+    lanes again), or by weights (up to weights[i] events are taken from
+    lane i in every round).
+
+    Queue capacity is unbounded by default. If capacity is given, an
+    event put into a full queue is handled by the overflow policy of
+    its type (longest prefix match, BLOCK if nothing matches):
+        * BLOCK waits until there is room, except when put by dispatcher
+          thread itself (or when engine is not running), which would
+          otherwise dead lock.
+        * DROP_OLDEST drops the oldest queued event with DROP_OLDEST
+          policy (or the event put if there is none).
+        * DROP_NEWEST drops the event put.
+        * CONFLATE replaces data of the last queued event with the same
+          type and vt_symbol (or drops the event put if there is none).
+    Every time a policy fires it is counted, see get_overflow_counts,
+    and EVENT_OVERFLOW is put at most once per OVERFLOW_EVENT_INTERVAL
+    for each type and policy.
+
+    Dispatching can be profiled at runtime with start_profiling, which
+    records time spent by every handler, enqueue-to-dispatch delay and
+    queue depth. Results are read by get_profile or published as
+    EVENT_PROFILE by publish_profile.
     """
 
-    def __init__(self, interval: int = 1):
+    def __init__(
+        self,
+        interval: float = 1,
+        conflation: Sequence[str] = (),
+        lanes: Sequence[Sequence[str]] = (),
+        weights: Sequence[int] = None,
+        capacity: int = 0,
+        overflow: Dict[str, OverflowPolicy] = None
+    ):
         """
         Timer event is generated every 1 second by default, if
         interval not specified.
+
+        Conflation is disabled by default, pass event type prefixes
+        to enable it, e.g. conflation=[EVENT_TICK].
+
+        All events share one lane by default, see EVENT_LANES in
+        vnpy.trader.event for a lane setting of VN Trader.
+
+        Capacity is total number of queued events of all lanes, 0 for
+        unbounded. Overflow maps event type prefixes to their policies,
+        see EVENT_OVERFLOW_POLICIES in vnpy.trader.event.
         """
+        if weights and len(weights) != len(lanes):
+            raise ValueError("weights should be given for every lane")
+
         self._interval = interval
-        self._queue = Queue()
+        self._queues: List[deque] = [deque() for _ in range(max(len(lanes), 1))]
+        self._lock = Lock()
+        self._condition = Condition(self._lock)
         self._active = False
         self._thread = Thread(target=self._run)
+        self._dispatcher = self._thread
         self._timer = Thread(target=self._run_timer)
         self._handlers = defaultdict(list)
         self._general_handlers = []
 
+        # Type specific handlers followed by general handlers.
+        self._dispatch_map: Dict[str, Tuple[HandlerType, ...]] = {}
+        self._general_dispatch: Tuple[HandlerType, ...] = ()
+
+        # Pending events which can still be conflated, keyed by
+        # (type, vt_symbol), and number of events replaced per vt_symbol.
+        self._conflation = tuple(conflation)
+        self._pending: Dict[Tuple[str, str], Event] = {}
+        self._conflated: Dict[str, int] = defaultdict(int)
+
+        # Lane index of every event type seen, cached on first put.
+        self._lanes = [tuple(prefixes) for prefixes in lanes]
+        self._weights = tuple(weights) if weights else None
+        self._lane_map: Dict[str, int] = {}
+
+        self._profiler: EventProfiler = None
+
+        # Number of live events queued, and number of events ever put into
+        # and taken from each lane, used to tell if an event is still queued.
+        self._capacity = capacity
+        self._not_full = Condition(self._lock)
+        self._size = 0
+        self._put_counts = [0] * len(self._queues)
+        self._taken_counts = [0] * len(self._queues)
+
+        # Policy of every event type seen, cached on first put.
+        self._overflow = {
+            prefix: OverflowPolicy(policy)
+            for prefix, policy in (overflow or {}).items()
+        }
+        self._policy_map: Dict[str, OverflowPolicy] = {}
+
+        # Queued events with DROP_OLDEST policy of each lane as (lane put
+        # count, total put count, event), and events dropped but still in
+        # lane queues.
+        self._put_total = 0
+        self._droppable: List[deque] = [deque() for _ in self._queues]
+        self._dropped = set()
+
+        self._overflow_counts: Dict[Tuple[str, OverflowPolicy], int] = defaultdict(int)
+        self._overflow_times: Dict[Tuple[str, OverflowPolicy], float] = {}
+
+        # Heap of (deadline, sequence, item) served by timer thread.
+        self._timer_condition = Condition()
+        self._timer_heap: List[Tuple[float, int, _TimerItem]] = []
+        self._timer_sequence = count()
+        self._timers: Dict[str, _TimerItem] = {}
+        self._calls: Dict[int, _TimerItem] = {}
+
+        self.add_timer(EVENT_TIMER, interval)
+        self.register(EVENT_CALLBACK, self._process_callback)
+
     def _run(self):
         """
-        Get event from queue and then process it.
+        Get all pending events from queue and then process them.
         """
         while self._active:
-            try:
-                event = self._queue.get(block=True, timeout=1)
+            self._process_batch(self._drain(), self._queues)
+
+    def _process_batch(self, events: Sequence[Event], queues: List[deque]):
+        """
+        Process a batch of events, with profiling if enabled.
+        """
+        profiler = self._profiler
+        if not profiler:
+            for event in events:
                 self._process(event)
-            except Empty:
-                pass
+            return
+
+        profiler.record_depth(len(events) + sum(len(queue) for queue in queues))
+        for event in events:
+            self._process_profiled(event, profiler)
+
+    def _drain(self, timeout: float = 1) -> Sequence[Event]:
+        """
+        Wait for events and take next batch of them out of queue.
+        """
+        with self._condition:
+            if not any(self._queues):
+                self._condition.wait(timeout)
+
+            # Take everything at once if there is only one lane.
+            if not self._lanes:
+                events = self._queues[0]
+                self._queues[0] = deque()
+                self._pending = {}
+
+                if self._capacity:
+                    self._taken_counts[0] += len(events)
+                    self._droppable[0].clear()
+                    self._size = 0
+                    if self._dropped:
+                        events = self._remove_dropped(events)
+                    self._not_full.notify_all()
+
+                return events
+
+            events = []
+            if self._weights:
+                for lane, weight in enumerate(self._weights):
+                    self._take(lane, weight, events)
+            else:
+                for lane, queue in enumerate(self._queues):
+                    if queue:
+                        self._take(lane, LANE_BATCH_SIZE, events)
+                        break
+
+            if self._capacity:
+                if self._dropped:
+                    events = self._remove_dropped(events)
+                self._size -= len(events)
+                self._not_full.notify_all()
+
+            pending = self._pending
+            if pending:
+                for event in events:
+                    key = (event.type, getattr(event.data, "vt_symbol", None))
+                    if pending.get(key, None) is event:
+                        pending.pop(key)
+
+        return events
+
+    def _remove_dropped(self, events: Sequence[Event]) -> List[Event]:
+        """
+        Filter out events dropped by DROP_OLDEST policy.
+        """
+        dropped = self._dropped
+        result = []
+
+        for event in events:
+            if event in dropped:
+                dropped.remove(event)
+            else:
+                result.append(event)
+
+        return result
+
+    def _take(self, lane: int, count: int, events: List[Event]):
+        """
+        Move at most count events from lane queue into events.
+        """
+        queue = self._queues[lane]
+        if self._capacity:
+            taken_count = self._taken_counts[lane] + min(count, len(queue))
+            self._taken_counts[lane] = taken_count
+
+            droppable = self._droppable[lane]
+            while droppable and droppable[0][0] <= taken_count:
+                droppable.popleft()
+
+        if len(queue) <= count:
+            events.extend(queue)
+            queue.clear()
+        else:
+            popleft = queue.popleft
+            for _ in range(count):
+                events.append(popleft())
+
+    def _get_lane(self, type: str) -> int:
+        """
+        Get lane index of event type by longest prefix match.
+        """
+        lane = self._lane_map.get(type, None)
+        if lane is not None:
+            return lane
+
+        lane = len(self._lanes) - 1
+        matched = -1
+        for i, prefixes in enumerate(self._lanes):
+            for prefix in prefixes:
+                if len(prefix) > matched and type.startswith(prefix):
+                    lane = i
+                    matched = len(prefix)
+
+        self._lane_map[type] = lane
+        return lane
+
+    def _get_policy(self, type: str) -> OverflowPolicy:
+        """
+        Get overflow policy of event type by longest prefix match.
+        """
+        policy = self._policy_map.get(type, None)
+        if policy:
+            return policy
+
+        policy = OverflowPolicy.BLOCK
+        matched = -1
+        for prefix, prefix_policy in self._overflow.items():
+            if len(prefix) > matched and type.startswith(prefix):
+                policy = prefix_policy
+                matched = len(prefix)
+
+        self._policy_map[type] = policy
+        return policy
+
+    def _handle_overflow(self, event: Event, policy: OverflowPolicy) -> bool:
+        """
+        Apply overflow policy to event put into full queue, must be called
+        with lock held. Return True if event should still be appended.
+        """
+        self._record_overflow(event.type, policy)
+
+        if policy is OverflowPolicy.BLOCK:
+            if current_thread() is not self._dispatcher:
+                while self._active and self._size >= self._capacity:
+                    self._not_full.wait(1)
+            return True
+
+        elif policy is OverflowPolicy.DROP_OLDEST:
+            # Heads of lane deques are the oldest queued in every lane.
+            oldest = None
+            for droppable in self._droppable:
+                if droppable and (not oldest or droppable[0][1] < oldest[0][1]):
+                    oldest = droppable
+
+            if not oldest:
+                return False
+
+            self._drop(oldest.popleft()[2])
+            return True
+
+        elif policy is OverflowPolicy.CONFLATE:
+            key = (event.type, getattr(event.data, "vt_symbol", None))
+            pending = self._pending.get(key, None)
+            if pending:
+                pending.data = event.data
+            return False
+
+        return False
+
+    def _drop(self, event: Event):
+        """
+        Mark a queued event as dropped, it is removed when taken out of queue.
+        """
+        self._dropped.add(event)
+        self._size -= 1
+
+        key = (event.type, getattr(event.data, "vt_symbol", None))
+        if self._pending.get(key, None) is event:
+            self._pending.pop(key)
+
+    def _record_overflow(self, type: str, policy: OverflowPolicy):
+        """
+        Count overflow and put EVENT_OVERFLOW if not put recently.
+        """
+        key = (type, policy)
+        self._overflow_counts[key] += 1
+
+        now = monotonic()
+        if now - self._overflow_times.get(key, 0) < OVERFLOW_EVENT_INTERVAL:
+            return
+        self._overflow_times[key] = now
+
+        data = {
+            "type": type,
+            "policy": policy.value,
+            "count": self._overflow_counts[key],
+            "capacity": self._capacity,
+        }
+        self._append(Event(EVENT_OVERFLOW, data))
 
     def _process(self, event: Event):
         """
@@ -69,20 +428,167 @@ class EventEngine:
         Then distrubute event to those general handlers which listens
         to all types.
         """
-        if event.type in self._handlers:
-            [handler(event) for handler in self._handlers[event.type]]
+        for handler in self._dispatch_map.get(event.type, self._general_dispatch):
+            handler(event)
+
+    def _process_profiled(self, event: Event, profiler: EventProfiler):
+        """
+        Same as _process, but record latency of dispatching and handlers.
+        """
+        type = event.type
+
+        put_time = getattr(event, "put_time", None)
+        if put_time:
+            profiler.record_delay(type, perf_counter() - put_time)
+
+        start = perf_counter()
+        for handler in self._dispatch_map.get(type, self._general_dispatch):
+            handler(event)
+            end = perf_counter()
+            profiler.record_handler(type, handler, end - start)
+            start = end
+
+    def _rebuild_dispatch(self):
+        """
+        Freeze handler lists into tuples used by dispatcher thread.
+        """
+        general = tuple(self._general_handlers)
 
-        if self._general_handlers:
-            [handler(event) for handler in self._general_handlers]
+        # Replace whole dict so that dispatcher never sees a partial update.
+        self._dispatch_map = {
+            type: tuple(handler_list) + general
+            for type, handler_list in self._handlers.items()
+        }
+        self._general_dispatch = general
 
     def _run_timer(self):
         """
-        Sleep by interval second(s) and then generate a timer event.
+        Wait until next deadline and then generate timer events or
+        callback events which are due.
         """
+        with self._timer_condition:
+            # Periodic timers start counting when engine starts.
+            now = monotonic()
+            heap = [
+                (now + item.interval, sequence, item)
+                if item.interval else (deadline, sequence, item)
+                for deadline, sequence, item in self._timer_heap
+            ]
+            heapify(heap)
+            self._timer_heap = heap
+
         while self._active:
-            sleep(self._interval)
-            event = Event(EVENT_TIMER)
-            self.put(event)
+            due = []
+
+            with self._timer_condition:
+                if not self._active:
+                    break
+                now = monotonic()
+
+                while heap and heap[0][0] <= now:
+                    deadline, sequence, item = heappop(heap)
+                    if item.cancelled:
+                        continue
+
+                    if item.interval:
+                        due.append(item)
+
+                        # Skip deadlines missed instead of catching up.
+                        missed = (now - deadline) // item.interval + 1
+                        deadline += missed * item.interval
+                        heappush(heap, (deadline, sequence, item))
+                    else:
+                        self._calls.pop(sequence, None)
+                        due.append(item)
+
+                if not due:
+                    if heap:
+                        self._timer_condition.wait(heap[0][0] - now)
+                    else:
+                        self._timer_condition.wait()
+                    continue
+
+            # Put without timer lock held, since put may block on a full
+            # queue until handlers, which may add timers, drain it.
+            for item in due:
+                if item.interval:
+                    self._put_unique(Event(item.type))
+                else:
+                    self.put(Event(EVENT_CALLBACK, item.callback))
+
+    def _schedule(self, deadline: float, item: _TimerItem) -> int:
+        """
+        Push timer item into heap and wake up timer thread.
+        """
+        with self._timer_condition:
+            sequence = next(self._timer_sequence)
+            heappush(self._timer_heap, (deadline, sequence, item))
+            self._timer_condition.notify()
+        return sequence
+
+    def _stop_timer(self):
+        """
+        Wake up timer thread and wait for it to exit.
+        """
+        with self._timer_condition:
+            self._timer_condition.notify()
+        self._timer.join()
+
+    def _process_callback(self, event: Event):
+        """
+        Run one-shot callback scheduled by call_at/call_later.
+        """
+        event.data()
+
+    def add_timer(self, type: str, interval: float):
+        """
+        Generate event of type every interval seconds, replacing
+        existing timer of the same type.
+        """
+        if interval <= 0:
+            raise ValueError(f"timer interval should be positive: {interval}")
+
+        self.remove_timer(type)
+
+        item = _TimerItem(type, interval)
+        with self._timer_condition:
+            self._timers[type] = item
+            self._schedule(monotonic() + interval, item)
+
+    def remove_timer(self, type: str):
+        """
+        Stop generating timer event of type.
+        """
+        with self._timer_condition:
+            item = self._timers.pop(type, None)
+            if item:
+                item.cancelled = True
+
+    def call_at(self, deadline: float, callback: Callable[[], None]) -> int:
+        """
+        Run callback in dispatcher thread once, at deadline in time.monotonic
+        seconds. Return an id which can be used with cancel_call.
+        """
+        item = _TimerItem(EVENT_CALLBACK, 0, callback)
+        with self._timer_condition:
+            sequence = self._schedule(deadline, item)
+            self._calls[sequence] = item
+        return sequence
+
+    def call_later(self, delay: float, callback: Callable[[], None]) -> int:
+        """
+        Run callback in dispatcher thread once, after delay seconds.
+        """
+        return self.call_at(monotonic() + delay, callback)
+
+    def cancel_call(self, call_id: int):
+        """
+        Cancel a callback which is not run yet.
+        """
+        with self._timer_condition:
+            item = self._calls.pop(call_id, None)
+            if item:
+                item.cancelled = True
 
     def start(self):
         """
@@ -97,14 +603,127 @@ class EventEngine:
         Stop event engine.
         """
         self._active = False
-        self._timer.join()
+        self._stop_timer()
         self._thread.join()
 
     def put(self, event: Event):
         """
         Put an event object into event queue.
         """
-        self._queue.put(event)
+        if self._profiler:
+            event.put_time = perf_counter()
+
+        with self._condition:
+            key = None
+
+            if self._conflation and event.type.startswith(self._conflation):
+                vt_symbol = event.data.vt_symbol
+                key = (event.type, vt_symbol)
+
+                pending = self._pending.get(key, None)
+                if pending:
+                    pending.data = event.data
+                    self._conflated[vt_symbol] += 1
+                    return
+
+            if self._capacity:
+                policy = self._get_policy(event.type)
+
+                if self._size >= self._capacity:
+                    if not self._handle_overflow(event, policy):
+                        return
+
+                if policy is OverflowPolicy.CONFLATE:
+                    key = (event.type, getattr(event.data, "vt_symbol", None))
+
+            if key:
+                self._pending[key] = event
+            self._append(event)
+
+    def _put_unique(self, event: Event):
+        """
+        Put an event object into event queue, unless there is already
+        a pending event of the same type put by this method.
+        """
+        if self._profiler:
+            event.put_time = perf_counter()
+
+        key = (event.type, None)
+        with self._condition:
+            if key in self._pending:
+                return
+
+            self._pending[key] = event
+            self._append(event)
+
+    def _append(self, event: Event):
+        """
+        Append event into its lane queue, must be called with lock held.
+        """
+        if self._lanes:
+            lane = self._get_lane(event.type)
+        else:
+            lane = 0
+        self._queues[lane].append(event)
+
+        if self._capacity:
+            self._size += 1
+            self._put_counts[lane] += 1
+            self._put_total += 1
+
+            if self._get_policy(event.type) is OverflowPolicy.DROP_OLDEST:
+                self._droppable[lane].append(
+                    (self._put_counts[lane], self._put_total, event)
+                )
+
+        self._condition.notify()
+
+    def get_conflation_counts(self) -> Dict[str, int]:
+        """
+        Get number of events replaced by conflation for each vt_symbol.
+
+        Gateways put every tick as both EVENT_TICK and EVENT_TICK + vt_symbol,
+        so one replaced tick is counted once for each of its event types.
+        """
+        with self._condition:
+            return dict(self._conflated)
+
+    def get_overflow_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get number of times each overflow policy fired for each event type.
+        """
+        counts = defaultdict(dict)
+        with self._condition:
+            for (type, policy), n in self._overflow_counts.items():
+                counts[type][policy.value] = n
+        return dict(counts)
+
+    def start_profiling(self):
+        """
+        Start recording dispatching statistics, previous ones are cleared.
+        """
+        self._profiler = EventProfiler()
+
+    def stop_profiling(self):
+        """
+        Stop recording dispatching statistics.
+        """
+        self._profiler = None
+
+    def get_profile(self) -> dict:
+        """
+        Get dispatching statistics recorded since start_profiling.
+        """
+        if not self._profiler:
+            return {}
+        return self._profiler.get_stats()
+
+    def publish_profile(self):
+        """
+        Put dispatching statistics into event queue as EVENT_PROFILE.
+        """
+        event = Event(EVENT_PROFILE, self.get_profile())
+        self.put(event)
 
     def register(self, type: str, handler: HandlerType):
         """
@@ -114,6 +733,7 @@ class EventEngine:
         handler_list = self._handlers[type]
         if handler not in handler_list:
             handler_list.append(handler)
+        self._rebuild_dispatch()
 
     def unregister(self, type: str, handler: HandlerType):
         """
@@ -127,6 +747,8 @@ class EventEngine:
         if not handler_list:
             self._handlers.pop(type)
 
+        self._rebuild_dispatch()
+
     def register_general(self, handler: HandlerType):
         """
         Register a new handler function for all event types. Every 
@@ -134,6 +756,7 @@ class EventEngine:
         """
         if handler not in self._general_handlers:
             self._general_handlers.append(handler)
+        self._rebuild_dispatch()
 
     def unregister_general(self, handler: HandlerType):
         """
@@ -141,3 +764,129 @@ class EventEngine:
         """
         if handler in self._general_handlers:
             self._general_handlers.remove(handler)
+        self._rebuild_dispatch()
+
+
+# Defines function returning shard key of an event, or None if not keyed.
+KeyFuncType = Callable[[Event], Any]
+
+
+def get_vt_symbol_key(event: Event):
+    """
+    Shard key by vt_symbol of event data (tick, bar, order, trade, position).
+    """
+    return getattr(event.data, "vt_symbol", None)
+
+
+class ShardedEventEngine(EventEngine):
+    """
+    Event engine running several dispatcher workers, each one with
+    its own queue. Events are sharded by a key so that:
+        * events with the same key are always dispatched by the same
+          worker, in the same order as they were put.
+        * events with different keys may be dispatched concurrently.
+        * events without key (timer, log, account...) are dispatched
+          by the first worker, in put order relative to each other.
+
+    By default the key is vt_symbol of event data, so market data,
+    orders and trades of a contract stay in order, which also keeps
+    every CTA strategy (trading one vt_symbol) on a single worker.
+
+    Handlers registered on this engine can be called from several
+    threads at the same time for different keys, and so must be
+    thread-safe across keys. Concurrency only pays off for handlers
+    which release the GIL (network, database, numpy/talib...).
+    """
+
+    def __init__(
+        self,
+        interval: int = 1,
+        workers: int = 4,
+        key_func: KeyFuncType = get_vt_symbol_key,
+        **kwargs
+    ):
+        """
+        Other keyword arguments (conflation, lanes, weights, capacity,
+        overflow) are applied to the queue of every worker.
+        """
+        super().__init__(interval, **kwargs)
+
+        self._key_func = key_func
+        self._shards = [EventEngine(interval, **kwargs) for _ in range(workers)]
+        self._workers = []
+        for shard in self._shards:
+            worker = Thread(target=self._run_worker, args=(shard,))
+            shard._dispatcher = worker
+            self._workers.append(worker)
+
+    def _run_worker(self, shard: EventEngine):
+        """
+        Get pending events from queue of shard and then process them.
+        """
+        while self._active:
+            self._process_batch(shard._drain(), shard._queues)
+
+    def start(self):
+        """
+        Start all workers and timer.
+        """
+        self._active = True
+        for shard in self._shards:
+            shard._active = True
+        for worker in self._workers:
+            worker.start()
+        self._timer.start()
+
+    def stop(self):
+        """
+        Stop all workers and timer.
+        """
+        self._active = False
+        for shard in self._shards:
+            shard._active = False
+        self._stop_timer()
+        for worker in self._workers:
+            worker.join()
+
+    def put(self, event: Event):
+        """
+        Put an event object into queue of the worker owning its key.
+        """
+        if self._profiler:
+            event.put_time = perf_counter()
+
+        key = self._key_func(event)
+        if key is None:
+            shard = self._shards[0]
+        else:
+            shard = self._shards[hash(key) % len(self._shards)]
+        shard.put(event)
+
+    def _put_unique(self, event: Event):
+        """
+        Timer events are not keyed and go to the first worker.
+        """
+        if self._profiler:
+            event.put_time = perf_counter()
+        self._shards[0]._put_unique(event)
+
+    def get_conflation_counts(self) -> Dict[str, int]:
+        """
+        Get number of events replaced by conflation for each vt_symbol.
+        """
+        counts = defaultdict(int)
+        for shard in self._shards:
+            for vt_symbol, n in shard.get_conflation_counts().items():
+                counts[vt_symbol] += n
+        return dict(counts)
+
+    def get_overflow_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get number of times each overflow policy fired for each event type.
+        """
+        counts = defaultdict(lambda: defaultdict(int))
+        for shard in self._shards:
+            for type, policy_counts in shard.get_overflow_counts().items():
+                for policy, n in policy_counts.items():
+                    counts[type][policy] += n
+        return {type: dict(policy_counts) for type, policy_counts in counts.items()}
@@ -0,0 +1,169 @@
+"""
+Recording events dispatched by event engine into a journal file,
+and replaying journal into event engine.
+"""
+
+import pickle
+import struct
+import sys
+from threading import Lock
+from time import monotonic, sleep
+from typing import Iterator, Sequence, Tuple
+
+from .engine import EVENT_CALLBACK, EVENT_TIMER, Event, EventEngine
+
+MAGIC = b"VNPYEVT1"
+
+# Monotonic timestamp and length of pickled (type, data) which follows.
+RECORD_HEADER = struct.Struct("<dI")
+
+
+class EventRecorder:
+    """
+    Appends every event dispatched by an event engine (or only those with
+    type starting with one of given prefixes) into a binary journal.
+
+    Writing is buffered and flushed on every timer event and on close.
+
+    EVENT_CALLBACK is never recorded since its data is a callable, and
+    events with data which can not be pickled are skipped and counted
+    in errors.
+    """
+
+    def __init__(
+        self,
+        event_engine: EventEngine,
+        filename: str,
+        types: Sequence[str] = (),
+        buffer_size: int = 1024 * 1024
+    ):
+        """"""
+        self.event_engine = event_engine
+        self.types = tuple(types)
+        self.count = 0
+        self.errors = 0
+
+        self.lock = Lock()
+        self.file = open(filename, "ab", buffering=buffer_size)
+        if not self.file.tell():
+            self.file.write(MAGIC)
+
+        self.event_engine.register_general(self.process_event)
+
+    def process_event(self, event: Event):
+        """"""
+        type = event.type
+
+        if type != EVENT_CALLBACK and (not self.types or type.startswith(self.types)):
+            self.write_event(event)
+
+        if type == EVENT_TIMER:
+            with self.lock:
+                self.file.flush()
+
+    def write_event(self, event: Event):
+        """
+        Append one event into journal, skipped if its data can not be pickled.
+        """
+        try:
+            data = pickle.dumps((event.type, event.data), pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            self.errors += 1
+            sys.stderr.write(f"事件{event.type}记录失败：{e}\n")
+            return
+
+        header = RECORD_HEADER.pack(monotonic(), len(data))
+        with self.lock:
+            self.file.write(header)
+            self.file.write(data)
+            self.count += 1
+
+    def close(self):
+        """
+        Stop recording and close journal file.
+        """
+        self.event_engine.unregister_general(self.process_event)
+        with self.lock:
+            self.file.close()
+
+
+def read_journal(filename: str) -> Iterator[Tuple[float, Event]]:
+    """
+    Read (monotonic timestamp, event) from journal in recorded order.
+    A partly written record at the end of file is ignored.
+    """
+    with open(filename, "rb", buffering=1024 * 1024) as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filename}不是事件记录文件")
+
+        header_size = RECORD_HEADER.size
+        while True:
+            header = f.read(header_size)
+            if len(header) < header_size:
+                return
+
+            timestamp, length = RECORD_HEADER.unpack(header)
+            data = f.read(length)
+            if len(data) < length:
+                return
+
+            type, event_data = pickle.loads(data)
+            yield timestamp, Event(type, event_data)
+
+
+class EventReplayer:
+    """
+    Feeds events recorded in a journal into an event engine, e.g. the one
+    of a freshly created MainEngine with CtaEngine added, to reproduce a
+    live session or to benchmark the whole pipeline.
+
+    Only gateway events (tick, order, trade...) should be replayed into
+    an engine with apps running, otherwise events generated by apps are
+    doubled. Use types to select them if journal recorded everything.
+    """
+
+    def __init__(self, filename: str, types: Sequence[str] = ()):
+        """"""
+        self.filename = filename
+        self.types = tuple(types)
+
+    def replay(
+        self,
+        event_engine: EventEngine,
+        speed: float = 0,
+        dispatch: bool = False
+    ) -> int:
+        """
+        Replay journal and return number of events replayed.
+
+        speed: 0 for max speed, 1 for recorded wall-clock pace, 2 for
+        twice as fast and so on.
+
+        dispatch: if True, handlers are called in calling thread instead
+        of putting events into queue, which makes replay deterministic
+        and does not need event engine to be started.
+        """
+        count = 0
+        start_time = None
+        start_timestamp = None
+
+        for timestamp, event in read_journal(self.filename):
+            if self.types and not event.type.startswith(self.types):
+                continue
+
+            if speed:
+                if start_time is None:
+                    start_time = monotonic()
+                    start_timestamp = timestamp
+
+                delay = (timestamp - start_timestamp) / speed - (monotonic() - start_time)
+                if delay > 0:
+                    sleep(delay)
+
+            if dispatch:
+                event_engine._process(event)
+            else:
+                event_engine.put(event)
+            count += 1
+
+        return count
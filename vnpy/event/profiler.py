@@ -0,0 +1,174 @@
+"""
+Latency profiler of event engine.
+"""
+
+from bisect import bisect_left
+from threading import Lock
+from typing import Any, Dict, Tuple
+
+# Upper bounds (in microseconds) of latency histogram buckets,
+# the last bucket counts everything above the last bound.
+HISTOGRAM_BOUNDS = [10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000, 1000000]
+
+
+class LatencyStats:
+    """
+    Count, total, max and histogram of latency samples in seconds.
+    """
+
+    __slots__ = ("count", "total", "max", "histogram")
+
+    def __init__(self):
+        """"""
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+
+    def update(self, value: float):
+        """
+        Add a new latency sample.
+        """
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self.histogram[bisect_left(HISTOGRAM_BOUNDS, value * 1000000)] += 1
+
+    def to_dict(self) -> dict:
+        """
+        Convert stats into dict, with average and histogram labels.
+        """
+        if self.count:
+            average = self.total / self.count
+        else:
+            average = 0
+
+        labels = [f"<={bound}us" for bound in HISTOGRAM_BOUNDS]
+        labels.append(f">{HISTOGRAM_BOUNDS[-1]}us")
+
+        return {
+            "count": self.count,
+            "total": self.total,
+            "average": average,
+            "max": self.max,
+            "histogram": dict(zip(labels, self.histogram)),
+        }
+
+
+def get_handler_name(handler: Any) -> str:
+    """
+    Get qualified name of handler, e.g. CtaEngine.process_tick_event.
+    """
+    owner = getattr(handler, "__self__", None)
+    name = getattr(handler, "__name__", None)
+
+    if owner is not None and name and not isinstance(owner, type):
+        qualname = f"{type(owner).__qualname__}.{name}"
+    else:
+        qualname = getattr(handler, "__qualname__", None) or repr(handler)
+
+    module = getattr(handler, "__module__", None)
+    if module:
+        return f"{module}.{qualname}"
+    return qualname
+
+
+class EventProfiler:
+    """
+    Collects statistics of event dispatching:
+        * call count, total/max time and histogram per event type and handler.
+        * enqueue-to-dispatch delay per event type.
+        * queue depth sampled every time dispatcher takes a batch of events.
+    """
+
+    def __init__(self):
+        """"""
+        self.lock = Lock()
+
+        self.handler_stats: Dict[Tuple[str, str], LatencyStats] = {}
+        self.delay_stats: Dict[str, LatencyStats] = {}
+
+        self.depth_count = 0
+        self.depth_total = 0
+        self.depth_max = 0
+
+        self.handler_names: Dict[Any, str] = {}
+
+    def record_handler(self, type: str, handler: Any, duration: float):
+        """
+        Record time spent by a handler on an event.
+        """
+        name = self.handler_names.get(handler, None)
+        if not name:
+            name = get_handler_name(handler)
+            self.handler_names[handler] = name
+
+        key = (type, name)
+        with self.lock:
+            stats = self.handler_stats.get(key, None)
+            if not stats:
+                stats = LatencyStats()
+                self.handler_stats[key] = stats
+            stats.update(duration)
+
+    def record_delay(self, type: str, delay: float):
+        """
+        Record time between putting event and dispatching it.
+        """
+        with self.lock:
+            stats = self.delay_stats.get(type, None)
+            if not stats:
+                stats = LatencyStats()
+                self.delay_stats[type] = stats
+            stats.update(delay)
+
+    def record_depth(self, depth: int):
+        """
+        Record number of events waiting in queue.
+        """
+        with self.lock:
+            self.depth_count += 1
+            self.depth_total += depth
+            if depth > self.depth_max:
+                self.depth_max = depth
+
+    def get_stats(self) -> dict:
+        """
+        Get snapshot of all statistics. Handlers are sorted by total time,
+        slowest first.
+        """
+        with self.lock:
+            handlers = [
+                dict(type=type, handler=name, **stats.to_dict())
+                for (type, name), stats in self.handler_stats.items()
+            ]
+            handlers.sort(key=lambda d: d["total"], reverse=True)
+
+            delays = {
+                type: stats.to_dict() for type, stats in self.delay_stats.items()
+            }
+
+            if self.depth_count:
+                depth_average = self.depth_total / self.depth_count
+            else:
+                depth_average = 0
+
+            depth = {
+                "count": self.depth_count,
+                "average": depth_average,
+                "max": self.depth_max,
+            }
+
+        return {"handlers": handlers, "delays": delays, "depth": depth}
+
+    def reset(self):
+        """
+        Clear all statistics.
+        """
+        with self.lock:
+            self.handler_stats.clear()
+            self.delay_stats.clear()
+            self.depth_count = 0
+            self.depth_total = 0
+            self.depth_max = 0
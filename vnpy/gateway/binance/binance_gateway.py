@@ -6,7 +6,6 @@ import urllib
 import hashlib
 import hmac
 import time
-from copy import copy
 from datetime import datetime
 from enum import Enum
 from threading import Lock
@@ -676,4 +675,4 @@ class BinanceDataWebsocketApi(WebsocketClient):
                 tick.__setattr__("ask_volume_" + str(n + 1), float(volume))
 
         if tick.last_price:
-            self.gateway.on_tick(copy(tick))
+            self.gateway.on_tick(tick.snapshot())
@@ -20,6 +20,7 @@ from vnpy.trader.constant import (
     Status,
 )
 from vnpy.trader.gateway import BaseGateway
+from vnpy.trader.orderbook import OrderBook, format_number
 from vnpy.trader.object import (
     TickData,
     OrderData,
@@ -37,6 +38,9 @@ BASE_URL = "https://api.bitfinex.com/"
 REST_HOST = "https://api.bitfinex.com/"
 WEBSOCKET_HOST = "wss://api-pub.bitfinex.com/ws/2"
 
+# Flag of conf event to enable checksum of order book
+CONF_FLAG_CHECKSUM = 131072
+
 STATUS_BITFINEX2VT = {
     "ACTIVE": Status.NOTTRADED,
     "PARTIALLY FILLED": Status.PARTTRADED,
@@ -257,7 +261,6 @@ class BitfinexWebsocketApi(WebsocketClient):
 
         self.callbacks = {
             "trade": self.on_tick,
-            "orderBook10": self.on_depth,
             "execution": self.on_trade,
             "order": self.on_order,
             "position": self.on_position,
@@ -268,8 +271,8 @@ class BitfinexWebsocketApi(WebsocketClient):
         self.orders = {}
         self.trades = set()
         self.tickDict = {}
-        self.bidDict = {}
-        self.askDict = {}
+        self.books = {}
+        self.synced = set()         # symbols with order book snapshot received
         self.orderLocalDict = {}
         self.channelDict = {}       # channel_id : (Channel, Symbol)
 
@@ -351,6 +354,15 @@ class BitfinexWebsocketApi(WebsocketClient):
     def on_connected(self):
         """"""
         self.gateway.write_log("Websocket API连接成功")
+
+        # Enable checksum push of order book
+        self.send_packet({"event": "conf", "flags": CONF_FLAG_CHECKSUM})
+
+        for book in self.books.values():
+            book.clear()
+        self.synced.clear()
+        self.channelDict.clear()
+
         self.authenticate()
 
     def on_disconnected(self):
@@ -388,9 +400,22 @@ class BitfinexWebsocketApi(WebsocketClient):
     def on_data_update(self, data):
         """"""
         channel_id = data[0]
+        if channel_id not in self.channelDict:
+            return
+
         channel, symbol = self.channelDict[channel_id]
         symbol = str(symbol.replace("t", ""))
 
+        # Ignore book data until snapshot of new subscription arrives
+        if channel == "book" and symbol not in self.synced:
+            l_data1 = data[1]
+            if l_data1 == "cs" or (l_data1 and not isinstance(l_data1[0], list)):
+                return
+
+        if data[1] == "cs":
+            self.on_checksum(channel_id, symbol, data[2])
+            return
+
         # Get the Tick object
         if symbol in self.tickDict:
             tick = self.tickDict[symbol]
@@ -417,77 +442,69 @@ class BitfinexWebsocketApi(WebsocketClient):
 
         # Update deep quote
         elif channel == "book":
-            bid = self.bidDict.setdefault(symbol, {})
-            ask = self.askDict.setdefault(symbol, {})
-
-            if len(l_data1) > 3:
+            book = self.books.get(symbol, None)
+            if not book:
+                book = OrderBook(symbol, Exchange.BITFINEX, self.gateway_name)
+                self.books[symbol] = book
+
+            # Snapshot is a list of levels, update is a single level
+            if not l_data1 or isinstance(l_data1[0], list):
+                book.clear()
                 for price, count, amount in l_data1:
-                    price = float(price)
-                    count = int(count)
-                    amount = float(amount)
-
-                    if amount > 0:
-                        bid[price] = amount
-                    else:
-                        ask[price] = -amount
+                    self.update_book(book, price, count, amount)
+                self.synced.add(symbol)
             else:
                 price, count, amount = l_data1
-                price = float(price)
-                count = int(count)
-                amount = float(amount)
-
-                if not count:
-                    if price in bid:
-                        del bid[price]
-                    elif price in ask:
-                        del ask[price]
-                else:
-                    if amount > 0:
-                        bid[price] = amount
-                    else:
-                        ask[price] = -amount
-
-            try:
-                # BID
-                bid_keys = bid.keys()
-                bidPriceList = sorted(bid_keys, reverse=True)
-
-                tick.bid_price_1 = bidPriceList[0]
-                tick.bid_price_2 = bidPriceList[1]
-                tick.bid_price_3 = bidPriceList[2]
-                tick.bid_price_4 = bidPriceList[3]
-                tick.bid_price_5 = bidPriceList[4]
-
-                tick.bid_volume_1 = bid[tick.bid_price_1]
-                tick.bid_volume_2 = bid[tick.bid_price_2]
-                tick.bid_volume_3 = bid[tick.bid_price_3]
-                tick.bid_volume_4 = bid[tick.bid_price_4]
-                tick.bid_volume_5 = bid[tick.bid_price_5]
-
-                # ASK
-                ask_keys = ask.keys()
-                askPriceList = sorted(ask_keys, reverse=True)
-
-                tick.ask_price_1 = askPriceList[0]
-                tick.ask_price_2 = askPriceList[1]
-                tick.ask_price_3 = askPriceList[2]
-                tick.ask_price_4 = askPriceList[3]
-                tick.ask_price_5 = askPriceList[4]
-
-                tick.ask_volume_1 = ask[tick.ask_price_1]
-                tick.ask_volume_2 = ask[tick.ask_price_2]
-                tick.ask_volume_3 = ask[tick.ask_price_3]
-                tick.ask_volume_4 = ask[tick.ask_price_4]
-                tick.ask_volume_5 = ask[tick.ask_price_5]
-            except IndexError:
-                return
+                self.update_book(book, price, count, amount)
+
+            book.update_tick(tick)
 
         dt = datetime.now()
         tick.date = dt.strftime("%Y%m%d")
         tick.time = dt.strftime("%H:%M:%S.%f")
         tick.datetime = dt
 
-        self.gateway.on_tick(copy(tick))
+        self.gateway.on_tick(tick.snapshot())
+
+        if channel == "book" and self.gateway.depth_enabled:
+            book.datetime = dt
+            self.gateway.on_depth(book.to_depth())
+
+    def update_book(self, book: OrderBook, price, count, amount):
+        """
+        Update a price level of order book, positive amount for bid and
+        negative amount for ask, zero count means deleting the level.
+        """
+        if amount > 0:
+            side = book.bids
+        else:
+            side = book.asks
+
+        if not count:
+            side.delete(float(price))
+        else:
+            text = f"{format_number(price)}:{format_number(amount)}"
+            side.update(float(price), abs(float(amount)), text)
+
+    def on_checksum(self, channel_id: int, symbol: str, checksum: int):
+        """
+        Validate order book with checksum, subscribe again if failed.
+        """
+        book = self.books.get(symbol, None)
+        if not book or book.validate(checksum):
+            return
+
+        self.gateway.write_log(f"{symbol}深度行情校验失败，重新订阅")
+        book.clear()
+        self.synced.discard(symbol)
+        self.channelDict.pop(channel_id, None)
+
+        self.send_packet({"event": "unsubscribe", "chanId": channel_id})
+        self.send_packet({
+            "event": "subscribe",
+            "channel": "book",
+            "symbol": symbol,
+        })
 
     def on_wallet(self, data):
         """"""
@@ -586,28 +603,7 @@ class BitfinexWebsocketApi(WebsocketClient):
         tick.datetime = datetime.strptime(
             d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ"
         )
-        self.gateway.on_tick(copy(tick))
-
-    def on_depth(self, d):
-        """"""
-        symbol = d["symbol"]
-        tick = self.ticks.get(symbol, None)
-        if not tick:
-            return
-
-        for n, buf in enumerate(d["bids"][:5]):
-            price, volume = buf
-            tick.__setattr__("bid_price_%s" % (n + 1), price)
-            tick.__setattr__("bid_volume_%s" % (n + 1), volume)
-
-        for n, buf in enumerate(d["asks"][:5]):
-            price, volume = buf
-            tick.__setattr__("ask_price_%s" % (n + 1), price)
-            tick.__setattr__("ask_volume_%s" % (n + 1), volume)
-
-        tick.datetime = datetime.strptime(
-            d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
-        self.gateway.on_tick(copy(tick))
+        self.gateway.on_tick(tick.snapshot())
 
     def on_trade(self, data):
         """"""
@@ -23,6 +23,7 @@ from vnpy.trader.constant import (
     Interval
 )
 from vnpy.trader.gateway import BaseGateway
+from vnpy.trader.orderbook import OrderBook
 from vnpy.trader.object import (
     TickData,
     OrderData,
@@ -453,6 +454,7 @@ class BitmexWebsocketApi(WebsocketClient):
         }
 
         self.ticks = {}
+        self.books = {}
         self.accounts = {}
         self.orders = {}
         self.trades = set()
@@ -483,6 +485,8 @@ class BitmexWebsocketApi(WebsocketClient):
             gateway_name=self.gateway_name,
         )
         self.ticks[req.symbol] = tick
+        self.books[req.symbol] = OrderBook(
+            req.symbol, req.exchange, self.gateway_name)
 
     def on_connected(self):
         """"""
@@ -571,7 +575,7 @@ class BitmexWebsocketApi(WebsocketClient):
         tick.last_price = d["price"]
         tick.datetime = datetime.strptime(
             d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
-        self.gateway.on_tick(copy(tick))
+        self.gateway.on_tick(tick.snapshot())
 
     def on_depth(self, d):
         """"""
@@ -580,19 +584,17 @@ class BitmexWebsocketApi(WebsocketClient):
         if not tick:
             return
 
-        for n, buf in enumerate(d["bids"][:5]):
-            price, volume = buf
-            tick.__setattr__("bid_price_%s" % (n + 1), price)
-            tick.__setattr__("bid_volume_%s" % (n + 1), volume)
-
-        for n, buf in enumerate(d["asks"][:5]):
-            price, volume = buf
-            tick.__setattr__("ask_price_%s" % (n + 1), price)
-            tick.__setattr__("ask_volume_%s" % (n + 1), volume)
-
         tick.datetime = datetime.strptime(
             d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
-        self.gateway.on_tick(copy(tick))
+
+        book = self.books[symbol]
+        book.datetime = tick.datetime
+        book.apply_snapshot(d["bids"], d["asks"])
+        book.update_tick(tick)
+        self.gateway.on_tick(tick.snapshot())
+
+        if self.gateway.depth_enabled:
+            self.gateway.on_depth(book.to_depth())
 
     def on_trade(self, d):
         """"""
@@ -2,7 +2,6 @@
 """
 
 from datetime import datetime, timedelta
-import re
 
 from vnpy.api.ctp import (
     MdApi,
@@ -63,6 +62,7 @@ from vnpy.trader.object import (
 from vnpy.trader.utility import get_folder_path
 from vnpy.trader.event import EVENT_TIMER, EVENT_BAR
 from vnpy.trader.utility import BarGenerator
+from vnpy.trader.session import get_session_table
 
 
 STATUS_CTP2VT = {
@@ -122,34 +122,6 @@ symbol_name_map = {}
 symbol_size_map = {}
 # 增
 symbol_price_map = {}
-####
-# 增
-# 晚稻 鸡蛋 硅铁 锰硅 苹果 红枣
-DAYGROUP_1500 = ['wr', 'jd', 'sf', 'sm', 'ap', 'cj']
-# 塑料 PVC EG PP
-# 螺纹 热卷 燃油 沥青 橡胶 纸浆
-# 豆粕 豆油 豆一 豆二 棕榈油 玉米 玉米淀粉
-# 焦炭 焦煤 铁矿
-NIGHTGROUP_2300 = ['l', 'v', 'eg', 'pp',
-                   'rb', 'hc', 'fu', 'bu', 'ru', 'sp',
-                   'm', 'y', 'a', 'b', 'p', 'c', 'cs',
-                   'j', 'jm', 'i']
-# 白糖 棉花 棉纱 动力煤 玻璃 PTA 甲醇 菜油 菜粕
-NIGHTGROUP_2330 = ['sr', 'cf', 'cy', 'zc', 'fg', 'ta', 'ma', 'oi', 'rm']
-# 铜 铝 锌 铅 镍 锡
-NIGHTGROUP_0100 = ['cu', 'al', 'zn', 'pb', 'ni', 'sn']
-# 原油 黄金 白银
-NIGHTGROUP_0230 = ['sc', 'au', 'ag']
-COMMODITY = ['wr', 'jd', 'sf', 'sm', 'ap', 'cj',
-             'l', 'v', 'eg', 'pp',
-             'rb', 'hc', 'fu', 'bu', 'ru', 'sp',
-             'm', 'y', 'a', 'b', 'p', 'c', 'cs',
-             'j', 'jm', 'i',
-             'sr', 'cf', 'cy', 'zc', 'fg', 'ta', 'ma', 'oi', 'rm',
-             'cu', 'al', 'zn', 'pb', 'ni', 'sn',
-             'sc', 'au', 'ag'
-             ]
-FINANCE = ["if", "ih", "ic", "t", "ts", "tf"]
 
 
 class CtpGateway(BaseGateway):
@@ -311,6 +283,8 @@ class CtpMdApi(MdApi):
         self.bg_dict = {}
         # tick最后时间,用于生成一分钟K线
         self.tick_last_time_dict = {}
+        # 品种交易时段表,用于过滤非交易时间的tick
+        self.session_tables = {}
 
         self.trading = False
     
@@ -394,35 +368,19 @@ class CtpMdApi(MdApi):
         if not self.trading:
             return
 
-        # 获取例如rb代码
-        symb = re.sub(r'\d', '', symbol).lower()
         # 时间过滤，由于各个交易所品种不同，收盘时间不同
         # 有些会在截止的时候发出TICK23:30:00（大商所）
         # 有些不会在截止的时候发出TICK（郑商所）
         # 这里将格式统一，统一不收取品种收盘时的TICK，然后自己合成
-        # 理论上，不会改变K线，最后一个TICK只是一些交易所用来确认时间点的
-        # 先处理通用时间窗口
-        tick_time = tick.datetime.strftime("%H:%M:%S")
-        if (tick_time >= '02:30:00') & (tick_time < '09:00:00'):
-            return
-        if (tick_time >= '10:15:00') & (tick_time < '10:30:00') & (symb in COMMODITY):
-            return
-        if (tick_time >= '11:30:00') & (tick_time < '13:30:00'):
-            return
-        if (tick_time >= '15:00:00') & (tick_time < '21:00:00'):
-            return
-        if (symb in NIGHTGROUP_2300) and tick_time >= '23:00:00':
-            return
-        # 时间和品种一起过滤
-        if (symb in NIGHTGROUP_2330) and tick_time >= '23:30:00':
+        # 交易时段和节假日由品种的交易时段表判断
+        table = self.session_tables.get(symbol, None)
+        if not table:
+            table = get_session_table(symbol, tick.exchange)
+            self.session_tables[symbol] = table
+
+        if not table.is_trading_time(tick.datetime):
             return
-        if symb in NIGHTGROUP_0100:
-            current_time = datetime.now().strftime('%H:%M:%S')
-            # 当前是夜盘第二个交易日
-            if current_time <= '02:30:00':
-                # 当前时间超过最后一个TICK
-                if tick_time >= '01:00:00':
-                    return
+
         # 推送出去tick
         self.gateway.on_tick(tick)
         bg = self.bg_dict.get(tick.symbol, None)
@@ -2,7 +2,6 @@
 Please install futu-api before use.
 """
 
-from copy import copy
 from datetime import datetime
 from threading import Thread
 from time import sleep
@@ -428,7 +427,7 @@ class FutuGateway(BaseGateway):
                 tick.limit_up = tick.last_price + spread * 10
                 tick.limit_down = tick.last_price - spread * 10
 
-            self.on_tick(copy(tick))
+            self.on_tick(tick.snapshot())
 
     def process_orderbook(self, data):
         """"""
@@ -447,7 +446,7 @@ class FutuGateway(BaseGateway):
             d["ask_volume_%s" % n] = ask_data[1]
 
         if tick.datetime:
-            self.on_tick(copy(tick))
+            self.on_tick(tick.snapshot())
 
     def process_order(self, data):
         """
@@ -9,7 +9,6 @@ import json
 import zlib
 import hashlib
 import hmac
-from copy import copy
 from datetime import datetime
 from threading import Lock
 from typing import Sequence
@@ -1040,7 +1039,7 @@ class HbdmDataWebsocketApi(HbdmWebsocketApiBase):
             tick.__setattr__("ask_volume_" + str(n + 1), float(volume))
 
         if tick.last_price:
-            self.gateway.on_tick(copy(tick))
+            self.gateway.on_tick(tick.snapshot())
 
     def on_market_detail(self, data):
         """市场细节推送"""
@@ -1056,7 +1055,7 @@ class HbdmDataWebsocketApi(HbdmWebsocketApiBase):
         tick.volume = tick_data["vol"]
 
         if tick.bid_price_1:
-            self.gateway.on_tick(copy(tick))
+            self.gateway.on_tick(tick.snapshot())
 
 
 def _split_url(url):
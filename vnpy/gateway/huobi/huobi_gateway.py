@@ -9,7 +9,6 @@ import json
 import zlib
 import hashlib
 import hmac
-from copy import copy
 from datetime import datetime
 
 from vnpy.event import Event
@@ -23,6 +22,7 @@ from vnpy.trader.constant import (
     OrderType
 )
 from vnpy.trader.gateway import BaseGateway, LocalOrderManager
+from vnpy.trader.orderbook import OrderBook
 from vnpy.trader.object import (
     TickData,
     OrderData,
@@ -620,6 +620,7 @@ class HuobiDataWebsocketApi(HuobiWebsocketApiBase):
 
         self.req_id = 0
         self.ticks = {}
+        self.books = {}
 
     def connect(self, key: str, secret: str, proxy_host: str, proxy_port: int):
         """"""
@@ -641,7 +642,8 @@ class HuobiDataWebsocketApi(HuobiWebsocketApiBase):
             datetime=datetime.now(),
             gateway_name=self.gateway_name,
         )
-        self.ticks[symbol] = tick            
+        self.ticks[symbol] = tick
+        self.books[symbol] = OrderBook(symbol, Exchange.HUOBI, self.gateway_name)
             
         # Subscribe to market depth update
         self.req_id += 1
@@ -678,20 +680,16 @@ class HuobiDataWebsocketApi(HuobiWebsocketApiBase):
         tick = self.ticks[symbol]
         tick.datetime = datetime.fromtimestamp(data["ts"] / 1000)
         
-        bids = data["tick"]["bids"]
-        for n in range(5):
-            price, volume = bids[n]
-            tick.__setattr__("bid_price_" + str(n + 1), float(price))
-            tick.__setattr__("bid_volume_" + str(n + 1), float(volume))
-
-        asks = data["tick"]["asks"]
-        for n in range(5):
-            price, volume = asks[n]
-            tick.__setattr__("ask_price_" + str(n + 1), float(price))
-            tick.__setattr__("ask_volume_" + str(n + 1), float(volume))
+        book = self.books[symbol]
+        book.datetime = tick.datetime
+        book.apply_snapshot(data["tick"]["bids"], data["tick"]["asks"])
+        book.update_tick(tick)
 
         if tick.last_price:
-            self.gateway.on_tick(copy(tick))
+            self.gateway.on_tick(tick.snapshot())
+
+        if self.gateway.depth_enabled:
+            self.gateway.on_depth(book.to_depth())
 
     def on_market_detail(self, data):
         """市场细节推送"""
@@ -707,7 +705,7 @@ class HuobiDataWebsocketApi(HuobiWebsocketApiBase):
         tick.volume = float(tick_data["vol"])
 
         if tick.bid_price_1:
-            self.gateway.on_tick(copy(tick))
+            self.gateway.on_tick(tick.snapshot())
 
 
 def _split_url(url):
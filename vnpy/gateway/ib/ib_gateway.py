@@ -285,7 +285,7 @@ class IbApi(EWrapper):
         if exchange is Exchange.IDEALPRO:
             tick.last_price = (tick.bid_price_1 + tick.ask_price_1) / 2
             tick.datetime = datetime.now()
-        self.gateway.on_tick(copy(tick))
+        self.gateway.on_tick(tick.snapshot())
 
     def tickSize(
         self, reqId: TickerId, tickType: TickType, size: int
@@ -302,7 +302,7 @@ class IbApi(EWrapper):
         name = TICKFIELD_IB2VT[tickType]
         setattr(tick, name, size)
 
-        self.gateway.on_tick(copy(tick))
+        self.gateway.on_tick(tick.snapshot())
 
     def tickString(
         self, reqId: TickerId, tickType: TickType, value: str
@@ -318,7 +318,7 @@ class IbApi(EWrapper):
         tick = self.ticks[reqId]
         tick.datetime = datetime.fromtimestamp(value)
 
-        self.gateway.on_tick(copy(tick))
+        self.gateway.on_tick(tick.snapshot())
 
     def orderStatus(  # pylint: disable=invalid-name
         self,
@@ -25,6 +25,7 @@ from vnpy.trader.constant import (
     Status
 )
 from vnpy.trader.gateway import BaseGateway
+from vnpy.trader.orderbook import OrderBook
 from vnpy.trader.object import (
     TickData,
     OrderData,
@@ -470,6 +471,8 @@ class OkexWebsocketApi(WebsocketClient):
 
         self.callbacks = {}
         self.ticks = {}
+        self.books = {}
+        self.synced = set()     # symbols with depth snapshot received
 
     def connect(
         self,
@@ -505,9 +508,11 @@ class OkexWebsocketApi(WebsocketClient):
             gateway_name=self.gateway_name,
         )
         self.ticks[req.symbol] = tick
+        self.books[req.symbol] = OrderBook(
+            req.symbol, req.exchange, self.gateway_name)
 
         channel_ticker = f"spot/ticker:{req.symbol}"
-        channel_depth = f"spot/depth5:{req.symbol}"
+        channel_depth = f"spot/depth:{req.symbol}"
 
         self.callbacks[channel_ticker] = self.on_ticker
         self.callbacks[channel_depth] = self.on_depth
@@ -521,6 +526,9 @@ class OkexWebsocketApi(WebsocketClient):
     def on_connected(self):
         """"""
         self.gateway.write_log("Websocket API连接成功")
+
+        self.synced.clear()
+
         self.login()
 
     def on_disconnected(self):
@@ -543,9 +551,15 @@ class OkexWebsocketApi(WebsocketClient):
             data = packet["data"]
             callback = self.callbacks.get(channel, None)
 
+            # Depth packet has action of partial (snapshot) or update
+            action = packet.get("action", None)
+
             if callback:
                 for d in data:
-                    callback(d)
+                    if action:
+                        callback(d, action)
+                    else:
+                        callback(d)
 
     def on_error(self, exception_type: type, exception_value: Exception, tb):
         """"""
@@ -581,7 +595,7 @@ class OkexWebsocketApi(WebsocketClient):
         Subscribe to all private topics.
         """
         self.callbacks["spot/ticker"] = self.on_ticker
-        self.callbacks["spot/depth5"] = self.on_depth
+        self.callbacks["spot/depth"] = self.on_depth
         self.callbacks["spot/account"] = self.on_account
         self.callbacks["spot/order"] = self.on_order
 
@@ -640,31 +654,59 @@ class OkexWebsocketApi(WebsocketClient):
         tick.volume = float(d["base_volume_24h"])
         tick.datetime = datetime.strptime(
             d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
-        self.gateway.on_tick(copy(tick))
+        self.gateway.on_tick(tick.snapshot())
 
-    def on_depth(self, d):
+    def on_depth(self, d, action: str):
         """"""
-        for tick_data in d:
-            symbol = d["instrument_id"]
-            tick = self.ticks.get(symbol, None)
-            if not tick:
-                return
+        symbol = d["instrument_id"]
+        tick = self.ticks.get(symbol, None)
+        if not tick:
+            return
+
+        # Updates in flight before snapshot arrives are ignored.
+        book = self.books[symbol]
+        if action == "partial":
+            book.clear()
+            self.synced.add(symbol)
+        elif symbol not in self.synced:
+            return
 
-            bids = d["bids"]
-            asks = d["asks"]
-            for n, buf in enumerate(bids):
-                price, volume, _ = buf
-                tick.__setattr__("bid_price_%s" % (n + 1), float(price))
-                tick.__setattr__("bid_volume_%s" % (n + 1), float(volume))
-
-            for n, buf in enumerate(asks):
-                price, volume, _ = buf
-                tick.__setattr__("ask_price_%s" % (n + 1), float(price))
-                tick.__setattr__("ask_volume_%s" % (n + 1), float(volume))
-
-            tick.datetime = datetime.strptime(
-                d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
-            self.gateway.on_tick(copy(tick))
+        for buf in d["bids"]:
+            price, volume = buf[:2]
+            book.update_bid(float(price), float(volume), f"{price}:{volume}")
+
+        for buf in d["asks"]:
+            price, volume = buf[:2]
+            book.update_ask(float(price), float(volume), f"{price}:{volume}")
+
+        if not book.validate(d["checksum"]):
+            self.gateway.write_log(f"{symbol}深度行情校验失败，重新订阅")
+            self.resubscribe_depth(symbol)
+            return
+
+        tick.datetime = datetime.strptime(
+            d["timestamp"], "%Y-%m-%dT%H:%M:%S.%fZ")
+        book.datetime = tick.datetime
+        book.update_tick(tick)
+        self.gateway.on_tick(tick.snapshot())
+
+        if self.gateway.depth_enabled:
+            self.gateway.on_depth(book.to_depth())
+
+    def resubscribe_depth(self, symbol: str):
+        """
+        Subscribe depth channel again to receive a new snapshot, order
+        book is cleared when the snapshot arrives.
+        """
+        self.synced.discard(symbol)
+
+        channel_depth = f"spot/depth:{symbol}"
+        for op in ["unsubscribe", "subscribe"]:
+            req = {
+                "op": op,
+                "args": [channel_depth]
+            }
+            self.send_packet(req)
 
     def on_order(self, d):
         """"""
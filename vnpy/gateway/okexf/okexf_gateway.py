@@ -27,6 +27,7 @@ from vnpy.trader.constant import (
     Offset,
 )
 from vnpy.trader.gateway import BaseGateway
+from vnpy.trader.orderbook import OrderBook
 from vnpy.trader.object import (
     TickData,
     OrderData,
@@ -531,6 +532,8 @@ class OkexfWebsocketApi(WebsocketClient):
 
         self.callbacks = {}
         self.ticks = {}
+        self.books = {}
+        self.synced = set()     # symbols with depth snapshot received
 
     def connect(
         self,
@@ -565,9 +568,11 @@ class OkexfWebsocketApi(WebsocketClient):
             gateway_name=self.gateway_name,
         )
         self.ticks[req.symbol] = tick
+        self.books[req.symbol] = OrderBook(
+            req.symbol, req.exchange, self.gateway_name)
 
         channel_ticker = f"futures/ticker:{req.symbol}"
-        channel_depth = f"futures/depth5:{req.symbol}"
+        channel_depth = f"futures/depth:{req.symbol}"
 
         self.callbacks[channel_ticker] = self.on_ticker
         self.callbacks[channel_depth] = self.on_depth
@@ -581,6 +586,9 @@ class OkexfWebsocketApi(WebsocketClient):
     def on_connected(self):
         """"""
         self.gateway.write_log("Websocket API连接成功")
+
+        self.synced.clear()
+
         self.login()
 
     def on_disconnected(self):
@@ -603,9 +611,15 @@ class OkexfWebsocketApi(WebsocketClient):
             data = packet["data"]
             callback = self.callbacks.get(channel, None)
 
+            # Depth packet has action of partial (snapshot) or update
+            action = packet.get("action", None)
+
             if callback:
                 for d in data:
-                    callback(d)
+                    if action:
+                        callback(d, action)
+                    else:
+                        callback(d)
 
     def on_error(self, exception_type: type, exception_value: Exception, tb):
         """"""
@@ -640,7 +654,7 @@ class OkexfWebsocketApi(WebsocketClient):
         Subscribe to all private topics.
         """
         self.callbacks["futures/ticker"] = self.on_ticker
-        self.callbacks["futures/depth5"] = self.on_depth
+        self.callbacks["futures/depth"] = self.on_depth
         self.callbacks["futures/account"] = self.on_account
         self.callbacks["futures/order"] = self.on_order
         self.callbacks["futures/position"] = self.on_position
@@ -705,30 +719,58 @@ class OkexfWebsocketApi(WebsocketClient):
         tick.volume = float(d["volume_24h"])
         tick.datetime = utc_to_local(d["timestamp"])
 
-        self.gateway.on_tick(copy(tick))
+        self.gateway.on_tick(tick.snapshot())
 
-    def on_depth(self, d):
+    def on_depth(self, d, action: str):
         """"""
-        for tick_data in d:
-            symbol = d["instrument_id"]
-            tick = self.ticks.get(symbol, None)
-            if not tick:
-                return
+        symbol = d["instrument_id"]
+        tick = self.ticks.get(symbol, None)
+        if not tick:
+            return
 
-            bids = d["bids"]
-            asks = d["asks"]
-            for n, buf in enumerate(bids):
-                price, volume, _, __ = buf
-                tick.__setattr__("bid_price_%s" % (n + 1), price)
-                tick.__setattr__("bid_volume_%s" % (n + 1), volume)
+        # Updates in flight before snapshot arrives are ignored.
+        book = self.books[symbol]
+        if action == "partial":
+            book.clear()
+            self.synced.add(symbol)
+        elif symbol not in self.synced:
+            return
 
-            for n, buf in enumerate(asks):
-                price, volume, _, __ = buf
-                tick.__setattr__("ask_price_%s" % (n + 1), price)
-                tick.__setattr__("ask_volume_%s" % (n + 1), volume)
+        for buf in d["bids"]:
+            price, volume = buf[:2]
+            book.update_bid(float(price), float(volume), f"{price}:{volume}")
 
-            tick.datetime = utc_to_local(d["timestamp"])
-            self.gateway.on_tick(copy(tick))
+        for buf in d["asks"]:
+            price, volume = buf[:2]
+            book.update_ask(float(price), float(volume), f"{price}:{volume}")
+
+        if not book.validate(d["checksum"]):
+            self.gateway.write_log(f"{symbol}深度行情校验失败，重新订阅")
+            self.resubscribe_depth(symbol)
+            return
+
+        tick.datetime = utc_to_local(d["timestamp"])
+        book.datetime = tick.datetime
+        book.update_tick(tick)
+        self.gateway.on_tick(tick.snapshot())
+
+        if self.gateway.depth_enabled:
+            self.gateway.on_depth(book.to_depth())
+
+    def resubscribe_depth(self, symbol: str):
+        """
+        Subscribe depth channel again to receive a new snapshot, order
+        book is cleared when the snapshot arrives.
+        """
+        self.synced.discard(symbol)
+
+        channel_depth = f"futures/depth:{symbol}"
+        for op in ["unsubscribe", "subscribe"]:
+            req = {
+                "op": op,
+                "args": [channel_depth]
+            }
+            self.send_packet(req)
 
     def on_order(self, d):
         """"""
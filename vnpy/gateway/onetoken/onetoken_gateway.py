@@ -9,7 +9,6 @@ import time
 from datetime import datetime
 from threading import Lock
 from urllib.parse import urlparse
-from copy import copy
 
 from requests import ConnectionError
 
@@ -471,7 +470,7 @@ class OnetokenDataWebsocketApi(WebsocketClient):
             tick.__setattr__("ask_price_%s" % (n + 1), buf["price"])
             tick.__setattr__("ask_volume_%s" % (n + 1), buf["volume"])
 
-        self.gateway.on_tick(copy(tick))
+        self.gateway.on_tick(tick.snapshot())
 
     def ping(self):
         """"""
@@ -4,7 +4,6 @@ Please install tiger-api before use.
 pip install tigeropen
 """
 
-from copy import copy
 from datetime import datetime
 from multiprocessing.dummy import Pool
 from queue import Empty, Queue
@@ -254,7 +253,7 @@ class TigerGateway(BaseGateway):
         tick.ask_volume_1 = data.get("ask_size", tick.ask_volume_1)
         tick.bid_volume_1 = data.get("bid_size", tick.bid_volume_1)
 
-        self.on_tick(copy(tick))
+        self.on_tick(tick.snapshot())
 
     def on_asset_change(self, tiger_account: str, data: list):
         """"""
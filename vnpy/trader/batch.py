@@ -0,0 +1,313 @@
+"""
+Columnar containers of bar and tick data backed by NumPy structured arrays.
+"""
+
+from datetime import datetime
+from typing import Iterator, Sequence, Union
+
+import numpy as np
+
+from .constant import Exchange, Interval
+from .object import BarData, TickData
+
+DATETIME_DTYPE = "datetime64[us]"
+
+# Rows converted into Python objects at a time when iterating batch
+ITER_CHUNK_SIZE = 1024
+
+BAR_DTYPE = np.dtype([
+    ("datetime", DATETIME_DTYPE),
+    ("datetime_start", DATETIME_DTYPE),
+    ("datetime_end", DATETIME_DTYPE),
+    ("volume", "f8"),
+    ("open_interest", "f8"),
+    ("open_price", "f8"),
+    ("high_price", "f8"),
+    ("low_price", "f8"),
+    ("close_price", "f8"),
+])
+
+# Contract name is stored as fixed width text, longer names are truncated
+TICK_NAME_LENGTH = 32
+
+TICK_DTYPE = np.dtype(
+    [
+        ("datetime", DATETIME_DTYPE),
+        ("name", f"U{TICK_NAME_LENGTH}"),
+        ("volume", "f8"),
+        ("open_interest", "f8"),
+        ("last_price", "f8"),
+        ("last_volume", "f8"),
+        ("limit_up", "f8"),
+        ("limit_down", "f8"),
+        ("open_price", "f8"),
+        ("high_price", "f8"),
+        ("low_price", "f8"),
+        ("pre_close", "f8"),
+    ]
+    + [(f"bid_price_{n}", "f8") for n in range(1, 6)]
+    + [(f"ask_price_{n}", "f8") for n in range(1, 6)]
+    + [(f"bid_volume_{n}", "f8") for n in range(1, 6)]
+    + [(f"ask_volume_{n}", "f8") for n in range(1, 6)]
+)
+
+
+class DataBatch:
+    """
+    Base class of columnar container, data of a single contract is stored
+    in one structured array with a row for every bar/tick.
+
+    * columns are returned as NumPy arrays, e.g. batch["close_price"].
+    * slicing returns a new batch sharing memory with the original one.
+    * indexing or iterating creates BarData/TickData objects on demand,
+      so strategy callbacks can still be fed one object at a time.
+
+    Datetimes are stored as naive datetime64, timezone info is not kept.
+    """
+
+    dtype: np.dtype = None
+    data_class: type = None
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        data: np.ndarray = None,
+        gateway_name: str = "DB"
+    ):
+        """"""
+        self.symbol = symbol
+        self.exchange = exchange
+        self.gateway_name = gateway_name
+
+        if data is None:
+            data = np.empty(0, dtype=self.dtype)
+        elif data.dtype != self.dtype:
+            raise ValueError(f"数据类型{data.dtype}与{self.dtype}不一致")
+        self.data = data
+
+    def _create(self, data: np.ndarray) -> "DataBatch":
+        """
+        Create a new batch of the same contract with data.
+        """
+        return self.__class__(self.symbol, self.exchange, data, self.gateway_name)
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.data)
+
+    def __getitem__(self, key: Union[int, slice, str, np.ndarray]):
+        """
+        Column for str key, object for int key and batch for anything else.
+        """
+        if isinstance(key, str):
+            return self.data[key]
+
+        if isinstance(key, (int, np.integer)):
+            size = len(self.data)
+            if key < 0:
+                key += size
+            if not 0 <= key < size:
+                raise IndexError(f"数据索引{key}超出范围")
+
+            return next(self._iter_rows(self.data[key:key + 1]))
+
+        return self._create(self.data[key])
+
+    def __iter__(self) -> Iterator:
+        """
+        Iterate over objects created for each row, rows are converted in
+        chunks so that only one chunk of Python values is kept in memory.
+        """
+        data = self.data
+        for ix in range(0, len(data), ITER_CHUNK_SIZE):
+            yield from self._iter_rows(data[ix:ix + ITER_CHUNK_SIZE])
+
+    def _iter_rows(self, data: np.ndarray) -> Iterator:
+        """
+        Iterate over objects created for each row of data.
+        """
+        columns = self._get_columns(data)
+        names = list(columns.keys())
+        create = self._create_object
+
+        for values in zip(*columns.values()):
+            yield create(dict(zip(names, values)))
+
+    def _get_columns(self, data: np.ndarray) -> dict:
+        """
+        Convert columns to lists of Python objects, with datetimes converted
+        into datetime.datetime.
+        """
+        columns = {}
+        for name in self.dtype.names:
+            column = data[name]
+            if column.dtype.kind == "M":
+                column = column.astype(DATETIME_DTYPE).astype(datetime)
+            columns[name] = column.tolist()
+        return columns
+
+    def _create_object(self, values: dict):
+        """
+        Create data object from values of a row.
+        """
+        return self.data_class(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            gateway_name=self.gateway_name,
+            **values
+        )
+
+    @property
+    def datetime(self) -> np.ndarray:
+        """"""
+        return self.data["datetime"]
+
+    def to_list(self) -> list:
+        """
+        Convert into list of data objects.
+        """
+        return list(self)
+
+    @classmethod
+    def from_list(
+        cls,
+        datas: Sequence,
+        symbol: str = "",
+        exchange: Exchange = None,
+        **kwargs
+    ) -> "DataBatch":
+        """
+        Create from sequence of data objects of the same contract.
+        """
+        if datas:
+            first = datas[0]
+            symbol = symbol or first.symbol
+            exchange = exchange or first.exchange
+            kwargs.setdefault("gateway_name", first.gateway_name)
+
+        data = np.empty(len(datas), dtype=cls.dtype)
+        for name in cls.dtype.names:
+            column = [getattr(d, name) for d in datas]
+            if data.dtype[name].kind == "M":
+                column = [
+                    dt.replace(tzinfo=None) if dt is not None else None
+                    for dt in column
+                ]
+            data[name] = column
+
+        return cls(symbol, exchange, data, **kwargs)
+
+    def to_dataframe(self):
+        """
+        Convert into pandas DataFrame indexed by datetime.
+        """
+        from pandas import DataFrame
+
+        df = DataFrame(self.data)
+        return df.set_index("datetime")
+
+    @classmethod
+    def from_dataframe(cls, df, symbol: str, exchange: Exchange, **kwargs) -> "DataBatch":
+        """
+        Create from pandas DataFrame, with datetime either as index or as
+        column. Missing columns are filled with zero.
+        """
+        if "datetime" not in df.columns:
+            df = df.reset_index().rename(columns={df.index.name or "index": "datetime"})
+
+        data = np.zeros(len(df), dtype=cls.dtype)
+        for name in cls.dtype.names:
+            if name in df.columns:
+                column = df[name].to_numpy()
+                if data.dtype[name].kind == "M":
+                    column = column.astype(DATETIME_DTYPE)
+                data[name] = column
+
+        return cls(symbol, exchange, data, **kwargs)
+
+
+class BarBatch(DataBatch):
+    """
+    Columnar container of bar data with the same interval.
+    """
+
+    dtype = BAR_DTYPE
+    data_class = BarData
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        data: np.ndarray = None,
+        gateway_name: str = "DB",
+        interval: Interval = None
+    ):
+        """"""
+        super().__init__(symbol, exchange, data, gateway_name)
+        self.interval = interval
+
+    def _create(self, data: np.ndarray) -> "BarBatch":
+        """"""
+        return BarBatch(self.symbol, self.exchange, data, self.gateway_name, self.interval)
+
+    def _create_object(self, values: dict) -> BarData:
+        """"""
+        return BarData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            gateway_name=self.gateway_name,
+            interval=self.interval,
+            **values
+        )
+
+    @classmethod
+    def from_list(cls, datas: Sequence[BarData], **kwargs) -> "BarBatch":
+        """"""
+        if datas:
+            kwargs.setdefault("interval", datas[0].interval)
+        return super().from_list(datas, **kwargs)
+
+    @property
+    def open(self) -> np.ndarray:
+        """"""
+        return self.data["open_price"]
+
+    @property
+    def high(self) -> np.ndarray:
+        """"""
+        return self.data["high_price"]
+
+    @property
+    def low(self) -> np.ndarray:
+        """"""
+        return self.data["low_price"]
+
+    @property
+    def close(self) -> np.ndarray:
+        """"""
+        return self.data["close_price"]
+
+    @property
+    def volume(self) -> np.ndarray:
+        """"""
+        return self.data["volume"]
+
+
+class TickBatch(DataBatch):
+    """
+    Columnar container of tick data.
+    """
+
+    dtype = TICK_DTYPE
+    data_class = TickData
+
+    @property
+    def last_price(self) -> np.ndarray:
+        """"""
+        return self.data["last_price"]
+
+    @property
+    def volume(self) -> np.ndarray:
+        """"""
+        return self.data["volume"]
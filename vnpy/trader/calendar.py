@@ -0,0 +1,247 @@
+"""
+Trading calendar of Chinese futures market.
+"""
+
+import warnings
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Set, Union
+
+import numpy as np
+
+# Weekdays closed for public holidays, weekends are always closed. Years
+# not listed here can be added with "calendar.holidays" in vt_setting.json.
+HOLIDAYS = [
+    # 2015
+    "2015-01-01", "2015-01-02",
+    "2015-02-18", "2015-02-19", "2015-02-20", "2015-02-23", "2015-02-24",
+    "2015-04-06",
+    "2015-05-01",
+    "2015-06-22",
+    "2015-09-03", "2015-09-04",
+    "2015-10-01", "2015-10-02", "2015-10-05", "2015-10-06", "2015-10-07",
+    # 2016
+    "2016-01-01",
+    "2016-02-08", "2016-02-09", "2016-02-10", "2016-02-11", "2016-02-12",
+    "2016-04-04",
+    "2016-05-02",
+    "2016-06-09", "2016-06-10",
+    "2016-09-15", "2016-09-16",
+    "2016-10-03", "2016-10-04", "2016-10-05", "2016-10-06", "2016-10-07",
+    # 2017
+    "2017-01-02",
+    "2017-01-27", "2017-01-30", "2017-01-31", "2017-02-01", "2017-02-02",
+    "2017-04-03", "2017-04-04",
+    "2017-05-01",
+    "2017-05-29", "2017-05-30",
+    "2017-10-02", "2017-10-03", "2017-10-04", "2017-10-05", "2017-10-06",
+    # 2018
+    "2018-01-01",
+    "2018-02-15", "2018-02-16", "2018-02-19", "2018-02-20", "2018-02-21",
+    "2018-04-05", "2018-04-06",
+    "2018-04-30", "2018-05-01",
+    "2018-06-18",
+    "2018-09-24",
+    "2018-10-01", "2018-10-02", "2018-10-03", "2018-10-04", "2018-10-05",
+    "2018-12-31",
+    # 2019
+    "2019-01-01",
+    "2019-02-04", "2019-02-05", "2019-02-06", "2019-02-07", "2019-02-08",
+    "2019-04-05",
+    "2019-05-01", "2019-05-02", "2019-05-03",
+    "2019-06-07",
+    "2019-09-13",
+    "2019-10-01", "2019-10-02", "2019-10-03", "2019-10-04", "2019-10-07",
+    # 2020
+    "2020-01-01",
+    "2020-01-24", "2020-01-27", "2020-01-28", "2020-01-29", "2020-01-30", "2020-01-31",
+    "2020-04-06",
+    "2020-05-01", "2020-05-04", "2020-05-05",
+    "2020-06-25", "2020-06-26",
+    "2020-10-01", "2020-10-02", "2020-10-05", "2020-10-06", "2020-10-07", "2020-10-08",
+    # 2021
+    "2021-01-01",
+    "2021-02-11", "2021-02-12", "2021-02-15", "2021-02-16", "2021-02-17",
+    "2021-04-05",
+    "2021-05-03", "2021-05-04", "2021-05-05",
+    "2021-06-14",
+    "2021-09-20", "2021-09-21",
+    "2021-10-01", "2021-10-04", "2021-10-05", "2021-10-06", "2021-10-07",
+    # 2022
+    "2022-01-03",
+    "2022-01-31", "2022-02-01", "2022-02-02", "2022-02-03", "2022-02-04",
+    "2022-04-04", "2022-04-05",
+    "2022-05-02", "2022-05-03", "2022-05-04",
+    "2022-06-03",
+    "2022-09-12",
+    "2022-10-03", "2022-10-04", "2022-10-05", "2022-10-06", "2022-10-07",
+    # 2023
+    "2023-01-02",
+    "2023-01-23", "2023-01-24", "2023-01-25", "2023-01-26", "2023-01-27",
+    "2023-04-05",
+    "2023-05-01", "2023-05-02", "2023-05-03",
+    "2023-06-22", "2023-06-23",
+    "2023-09-29",
+    "2023-10-02", "2023-10-03", "2023-10-04", "2023-10-05", "2023-10-06",
+    # 2024
+    "2024-01-01",
+    "2024-02-09", "2024-02-12", "2024-02-13", "2024-02-14", "2024-02-15", "2024-02-16",
+    "2024-04-04", "2024-04-05",
+    "2024-05-01", "2024-05-02", "2024-05-03",
+    "2024-06-10",
+    "2024-09-16", "2024-09-17",
+    "2024-10-01", "2024-10-02", "2024-10-03", "2024-10-04", "2024-10-07",
+    # 2025
+    "2025-01-01",
+    "2025-01-28", "2025-01-29", "2025-01-30", "2025-01-31", "2025-02-03", "2025-02-04",
+    "2025-04-04",
+    "2025-05-01", "2025-05-02", "2025-05-05",
+    "2025-06-02",
+    "2025-10-01", "2025-10-02", "2025-10-03", "2025-10-06", "2025-10-07", "2025-10-08",
+    # 2026
+    "2026-01-01", "2026-01-02",
+    "2026-02-16", "2026-02-17", "2026-02-18", "2026-02-19", "2026-02-20", "2026-02-23",
+    "2026-04-06",
+    "2026-05-01", "2026-05-04", "2026-05-05",
+    "2026-06-19",
+    "2026-09-25",
+    "2026-10-01", "2026-10-02", "2026-10-05", "2026-10-06", "2026-10-07",
+]
+
+ONE_DAY = timedelta(days=1)
+
+DayType = Union[date, datetime]
+
+
+class TradingCalendar:
+    """
+    Trading days with holiday table.
+
+    Days are kept as integer ordinals, holidays are sorted so that
+    lookups are done by bisect.
+
+    Holiday table covers whole years from the first to the last year of
+    holidays given, a warning is issued once for every year out of it,
+    since holidays of that year are unknown and treated as trading days.
+    """
+
+    def __init__(self, holidays: Iterable[Union[str, date]] = HOLIDAYS):
+        """"""
+        self.holidays: List[int] = []
+        self.busdaycal: np.busdaycalendar = None
+
+        self.first_day: int = 0
+        self.last_day: int = 0
+        self.warned_years: Set[int] = set()
+
+        self.add_holidays(holidays)
+
+    def add_holidays(self, holidays: Iterable[Union[str, date]]) -> None:
+        """
+        Add holidays as date or "YYYY-MM-DD" string.
+        """
+        days = set(self.holidays)
+        for holiday in holidays:
+            if isinstance(holiday, str):
+                holiday = datetime.strptime(holiday, "%Y-%m-%d")
+            days.add(holiday.toordinal())
+
+        self.holidays = sorted(days)
+        if self.holidays:
+            self.first_day = date(date.fromordinal(self.holidays[0]).year, 1, 1).toordinal()
+            self.last_day = date(date.fromordinal(self.holidays[-1]).year, 12, 31).toordinal()
+
+        self.busdaycal = np.busdaycalendar(
+            holidays=[date.fromordinal(n) for n in self.holidays]
+        )
+
+    def is_holiday(self, ordinal: int) -> bool:
+        """"""
+        ix = bisect_left(self.holidays, ordinal)
+        return ix < len(self.holidays) and self.holidays[ix] == ordinal
+
+    def is_covered(self, day: DayType) -> bool:
+        """
+        Check if day is in years covered by holiday table.
+        """
+        return self.first_day <= day.toordinal() <= self.last_day
+
+    def check_covered(self, day: DayType) -> None:
+        """
+        Warn once for each year out of holiday table.
+        """
+        if self.is_covered(day) or day.year in self.warned_years:
+            return
+
+        self.warned_years.add(day.year)
+        warnings.warn(
+            f"交易日历缺少{day.year}年的节假日，节假日将被视为交易日，"
+            f"请在vt_setting.json的calendar.holidays中添加",
+            RuntimeWarning
+        )
+
+    def is_trading_day(self, day: DayType) -> bool:
+        """"""
+        ordinal = day.toordinal()
+        if not self.first_day <= ordinal <= self.last_day:
+            self.check_covered(day)
+        return day.weekday() < 5 and not self.is_holiday(ordinal)
+
+    def get_next_trading_day(self, day: DayType, include: bool = True) -> DayType:
+        """
+        Get the first trading day from day (included by default).
+        """
+        if not include:
+            day += ONE_DAY
+
+        while not self.is_trading_day(day):
+            day += ONE_DAY
+        return day
+
+    def get_previous_trading_day(self, day: DayType) -> DayType:
+        """
+        Get the last trading day before day.
+        """
+        day -= ONE_DAY
+        while not self.is_trading_day(day):
+            day -= ONE_DAY
+        return day
+
+    def has_night_session(self, trading_day: DayType) -> bool:
+        """
+        Check if night session is open before trading day. There is no night
+        session on the evening before holidays.
+        """
+        previous_day = self.get_previous_trading_day(trading_day)
+
+        weekday = trading_day - ONE_DAY
+        while weekday.weekday() >= 5:
+            weekday -= ONE_DAY
+
+        return previous_day == weekday
+
+    def roll_forward(self, days: np.ndarray) -> np.ndarray:
+        """
+        Vectorized get_next_trading_day on datetime64[D] array.
+        """
+        self.check_array(days)
+        return np.busday_offset(days, 0, roll="forward", busdaycal=self.busdaycal)
+
+    def roll_backward(self, days: np.ndarray) -> np.ndarray:
+        """
+        Vectorized get_previous_trading_day on datetime64[D] array.
+        """
+        self.check_array(days)
+        return np.busday_offset(days, -1, roll="forward", busdaycal=self.busdaycal)
+
+    def check_array(self, days: np.ndarray) -> None:
+        """"""
+        if not len(days):
+            return
+
+        for day in [days.min(), days.max()]:
+            if not np.isnat(day):
+                self.check_covered(day.astype("datetime64[D]").item())
+
+
+trading_calendar = TradingCalendar()
@@ -1,18 +1,47 @@
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
-from typing import Optional, Sequence, TYPE_CHECKING
+from typing import Iterator, Optional, Sequence, TYPE_CHECKING
+
+from vnpy.trader.constant import Interval
 
 if TYPE_CHECKING:
-    from vnpy.trader.constant import Interval, Exchange  # noqa
+    from vnpy.trader.constant import Exchange  # noqa
     from vnpy.trader.object import BarData, TickData  # noqa
 
+# Rows fetched from database each time when iterating data
+CHUNK_SIZE = 10000
+
+INTERVAL_DELTAS = {
+    Interval.MINUTE: timedelta(minutes=1),
+    Interval.MINUTE3: timedelta(minutes=3),
+    Interval.MINUTE5: timedelta(minutes=5),
+    Interval.MINUTE15: timedelta(minutes=15),
+    Interval.MINUTE30: timedelta(minutes=30),
+    Interval.HOUR: timedelta(hours=1),
+    Interval.HOUR2: timedelta(hours=2),
+    Interval.HOUR4: timedelta(hours=4),
+    Interval.HOUR6: timedelta(hours=6),
+    Interval.HOUR12: timedelta(hours=12),
+    Interval.DAILY: timedelta(days=1),
+    Interval.WEEKLY: timedelta(days=7),
+}
+
+
+def get_bar_end(dt: datetime, interval: Interval) -> datetime:
+    """
+    Get datetime_end of bar loaded from database, which only stores the
+    start datetime of bar.
+    """
+    return dt + INTERVAL_DELTAS.get(interval, timedelta())
+
 
 class Driver(Enum):
     SQLITE = "sqlite"
     MYSQL = "mysql"
     POSTGRESQL = "postgresql"
     MONGODB = "mongodb"
+    FILE = "file"
 
 
 class BaseDatabaseManager(ABC):
@@ -38,18 +67,58 @@ class BaseDatabaseManager(ABC):
     ) -> Sequence["TickData"]:
         pass
 
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        interval: "Interval",
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Iterator["BarData"]:
+        """
+        Iterate bars in datetime order, fetching chunk_size rows each time,
+        so that long ranges can be processed in constant memory.
+
+        Default implementation loads all bars at once, database managers
+        should override it with server side cursor.
+        """
+        yield from self.load_bar_data(symbol, exchange, interval, start, end)
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: "Exchange",
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Iterator["TickData"]:
+        """
+        Iterate ticks in datetime order, same as iter_bar_data.
+        """
+        yield from self.load_tick_data(symbol, exchange, start, end)
+
     @abstractmethod
     def save_bar_data(
         self,
         datas: Sequence["BarData"],
-    ):
+        batch_size: int,
+    ) -> int:
+        """
+        Upsert bars with batch_size rows written each time (with default
+        chosen by database), return number of bars saved.
+        """
         pass
 
     @abstractmethod
     def save_tick_data(
         self,
         datas: Sequence["TickData"],
-    ):
+        batch_size: int,
+    ) -> int:
+        """
+        Upsert ticks in the same way as save_bar_data.
+        """
         pass
 
     @abstractmethod
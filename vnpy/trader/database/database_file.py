@@ -0,0 +1,438 @@
+"""
+File based database of memory mapped record files.
+
+Data of each contract (and interval for bars) is stored in a folder with
+one file per month:
+
+    bar/rb2005.SHFE/1m/202001.dat
+    tick/rb2005.SHFE/202001.dat
+
+A file is the raw row-major records of NumPy structured array
+(BAR_DTYPE/TICK_DTYPE) sorted by datetime, without compression. Files
+are read with memory map, so only partitions and records within the
+queried range are loaded. New data later than the last record is
+appended to the end of file, otherwise the partition is merged and
+rewritten.
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from vnpy.trader.batch import BAR_DTYPE, TICK_DTYPE, BarBatch, TickBatch
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, TickData
+from vnpy.trader.utility import get_folder_path
+from .database import CHUNK_SIZE, INTERVAL_DELTAS, BaseDatabaseManager, Driver
+
+SCHEMA_FILENAME = "schema.json"
+PARTITION_SUFFIX = ".dat"
+
+# Number of data objects converted into array for each write
+BATCH_SIZE = 100000
+
+
+def init(_: Driver, settings: dict):
+    database = settings["database"]
+
+    path = Path(database)
+    if not path.is_absolute():
+        path = get_folder_path(database)
+
+    return FileManager(path)
+
+
+def to_datetime64(dt: datetime) -> np.datetime64:
+    """
+    Convert datetime into naive datetime64, timezone info is dropped in
+    the same way as DataBatch.
+    """
+    return np.datetime64(dt.replace(tzinfo=None), "us")
+
+
+def sort_unique(data: np.ndarray) -> np.ndarray:
+    """
+    Sort records by datetime, the last one is kept for the same datetime.
+    """
+    dt = data["datetime"]
+    if len(data) > 1 and not (dt[1:] > dt[:-1]).all():
+        data = data[np.argsort(dt, kind="stable")]
+        dt = data["datetime"]
+        data = data[np.append(dt[1:] != dt[:-1], True)]
+    return data
+
+
+def to_bar_array(bars: Sequence[BarData]) -> np.ndarray:
+    """
+    Convert bars into array, with datetime_start/datetime_end set in the
+    same way as other databases which only store datetime of bar.
+    """
+    data = BarBatch.from_list(bars).data
+
+    delta = INTERVAL_DELTAS.get(bars[0].interval, timedelta())
+    data["datetime_start"] = data["datetime"]
+    data["datetime_end"] = data["datetime"] + np.timedelta64(delta)
+    return data
+
+
+class Partition:
+    """
+    Data file of one month.
+    """
+
+    def __init__(self, path: Path, dtype: np.dtype):
+        """"""
+        self.path: Path = path
+        self.dtype: np.dtype = dtype
+
+    def __len__(self) -> int:
+        """
+        Number of complete records, partial record left by interrupted
+        append is ignored.
+        """
+        if not self.path.exists():
+            return 0
+        return self.path.stat().st_size // self.dtype.itemsize
+
+    def read(self, start: np.datetime64 = None, end: np.datetime64 = None) -> np.ndarray:
+        """
+        Read records within [start, end] through memory map, with range
+        located by binary search on datetime.
+        """
+        count = len(self)
+        if not count:
+            return np.empty(0, dtype=self.dtype)
+
+        mm = np.memmap(self.path, dtype=self.dtype, mode="r", shape=(count,))
+        dt = mm["datetime"]
+
+        left = 0 if start is None else np.searchsorted(dt, start, "left")
+        right = count if end is None else np.searchsorted(dt, end, "right")
+
+        # Copy out so that file is not kept mapped after reading
+        data = np.array(mm[left:right])
+        del dt, mm
+        return data
+
+    def read_last(self) -> Optional[np.ndarray]:
+        """"""
+        count = len(self)
+        if not count:
+            return None
+
+        with open(self.path, "rb") as f:
+            f.seek((count - 1) * self.dtype.itemsize)
+            buf = f.read(self.dtype.itemsize)
+        return np.frombuffer(buf, dtype=self.dtype).copy()
+
+    def write(self, data: np.ndarray) -> None:
+        """
+        Write sorted records into partition, append to file if all records
+        are later than the last one, otherwise merge and rewrite.
+        """
+        last = self.read_last()
+
+        if last is None:
+            mode = "wb"
+        elif data["datetime"][0] > last["datetime"][0]:
+            mode = "ab"
+            self.truncate()
+        else:
+            data = sort_unique(np.concatenate([self.read(), data]))
+
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "wb") as f:
+                f.write(data.tobytes())
+            os.replace(temp_path, self.path)
+            return
+
+        with open(self.path, mode) as f:
+            f.write(data.tobytes())
+
+    def truncate(self) -> None:
+        """
+        Remove partial record left by interrupted append.
+        """
+        size = len(self) * self.dtype.itemsize
+        if self.path.stat().st_size != size:
+            with open(self.path, "r+b") as f:
+                f.truncate(size)
+
+
+class DataStore:
+    """
+    Folder of monthly partitions of one contract (and interval).
+    """
+
+    def __init__(self, folder: Path, dtype: np.dtype):
+        """"""
+        self.folder: Path = folder
+        self.dtype: np.dtype = dtype
+
+    def get_partition(self, month: np.datetime64) -> Partition:
+        """"""
+        name = str(month).replace("-", "")
+        return Partition(self.folder.joinpath(name + PARTITION_SUFFIX), self.dtype)
+
+    def get_partitions(self, start: datetime = None, end: datetime = None) -> List[Partition]:
+        """
+        Get existing partitions overlapping with [start, end] in order.
+        """
+        if not self.folder.exists():
+            return []
+
+        first = to_datetime64(start).astype("datetime64[M]") if start else None
+        last = to_datetime64(end).astype("datetime64[M]") if end else None
+
+        partitions = []
+        for path in sorted(self.folder.glob("*" + PARTITION_SUFFIX)):
+            stem = path.stem
+            month = np.datetime64(f"{stem[:4]}-{stem[4:]}", "M")
+            if first is not None and month < first:
+                continue
+            if last is not None and month > last:
+                continue
+            partitions.append(Partition(path, self.dtype))
+        return partitions
+
+    def write(self, data: np.ndarray) -> None:
+        """
+        Save records into monthly partitions.
+        """
+        if not len(data):
+            return
+        data = sort_unique(data)
+
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+        months = data["datetime"].astype("datetime64[M]")
+        bounds = np.flatnonzero(months[1:] != months[:-1]) + 1
+
+        for part in np.split(data, bounds):
+            month = part["datetime"][0].astype("datetime64[M]")
+            self.get_partition(month).write(part)
+
+    def iter_partitions(self, start: datetime, end: datetime) -> Iterator[np.ndarray]:
+        """
+        Iterate records within [start, end] of each partition.
+        """
+        for partition in self.get_partitions(start, end):
+            data = partition.read(to_datetime64(start), to_datetime64(end))
+            if len(data):
+                yield data
+
+    def iter_chunks(
+        self,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[np.ndarray]:
+        """"""
+        for data in self.iter_partitions(start, end):
+            for ix in range(0, len(data), chunk_size):
+                yield data[ix:ix + chunk_size]
+
+    def read(self, start: datetime, end: datetime) -> np.ndarray:
+        """"""
+        datas = list(self.iter_partitions(start, end))
+        if not datas:
+            return np.empty(0, dtype=self.dtype)
+        return np.concatenate(datas)
+
+    def read_last(self) -> Optional[np.ndarray]:
+        """"""
+        for partition in reversed(self.get_partitions()):
+            last = partition.read_last()
+            if last is not None:
+                return last
+        return None
+
+
+class FileManager(BaseDatabaseManager):
+
+    def __init__(self, path: Path):
+        """"""
+        self.path: Path = path
+        self.bar_path: Path = path.joinpath("bar")
+        self.tick_path: Path = path.joinpath("tick")
+
+        self.check_schema()
+
+    def check_schema(self) -> None:
+        """
+        Record dtypes of data files, raise if they are different from
+        dtypes in current code.
+        """
+        schema = {
+            "bar": BAR_DTYPE.descr,
+            "tick": TICK_DTYPE.descr,
+        }
+        schema = json.loads(json.dumps(schema))
+
+        schema_path = self.path.joinpath(SCHEMA_FILENAME)
+        if schema_path.exists():
+            with open(schema_path, mode="r", encoding="UTF-8") as f:
+                saved = json.load(f)
+
+            if saved != schema:
+                raise ValueError(f"数据文件格式与当前版本不一致：{self.path}")
+        else:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(schema_path, mode="w", encoding="UTF-8") as f:
+                json.dump(schema, f, indent=4)
+
+    def get_bar_store(self, symbol: str, exchange: Exchange, interval: Interval) -> DataStore:
+        """"""
+        folder = self.bar_path.joinpath(f"{symbol}.{exchange.value}", interval.value)
+        return DataStore(folder, BAR_DTYPE)
+
+    def get_tick_store(self, symbol: str, exchange: Exchange) -> DataStore:
+        """"""
+        folder = self.tick_path.joinpath(f"{symbol}.{exchange.value}")
+        return DataStore(folder, TICK_DTYPE)
+
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> Sequence[BarData]:
+        """"""
+        return self.load_bar_batch(symbol, exchange, interval, start, end).to_list()
+
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> BarBatch:
+        """"""
+        data = self.get_bar_store(symbol, exchange, interval).read(start, end)
+        return BarBatch(symbol, exchange, data, interval=interval)
+
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[BarData]:
+        """"""
+        store = self.get_bar_store(symbol, exchange, interval)
+        for data in store.iter_chunks(start, end, chunk_size):
+            yield from BarBatch(symbol, exchange, data, interval=interval)
+
+    def load_tick_data(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> Sequence[TickData]:
+        """"""
+        return self.load_tick_batch(symbol, exchange, start, end).to_list()
+
+    def load_tick_batch(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> TickBatch:
+        """"""
+        data = self.get_tick_store(symbol, exchange).read(start, end)
+        return TickBatch(symbol, exchange, data)
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[TickData]:
+        """"""
+        store = self.get_tick_store(symbol, exchange)
+        for data in store.iter_chunks(start, end, chunk_size):
+            yield from TickBatch(symbol, exchange, data)
+
+    def save_bar_data(self, datas: Iterable[BarData], batch_size: int = BATCH_SIZE) -> int:
+        """
+        Save bars grouped by contract and interval, every batch_size bars
+        of a group are converted and written together.
+        """
+        return self.save_datas(
+            datas,
+            lambda bar: (bar.symbol, bar.exchange, bar.interval),
+            lambda key, bars: self.get_bar_store(*key).write(to_bar_array(bars)),
+            batch_size
+        )
+
+    def save_tick_data(self, datas: Iterable[TickData], batch_size: int = BATCH_SIZE) -> int:
+        """
+        Save ticks grouped by contract.
+        """
+        return self.save_datas(
+            datas,
+            lambda tick: (tick.symbol, tick.exchange),
+            lambda key, ticks: self.get_tick_store(*key).write(TickBatch.from_list(ticks).data),
+            batch_size
+        )
+
+    @staticmethod
+    def save_datas(
+        datas: Iterable,
+        get_key: Callable,
+        write: Callable,
+        batch_size: int
+    ) -> int:
+        """"""
+        groups = {}
+        count = 0
+
+        for data in datas:
+            key = get_key(data)
+            buf = groups.setdefault(key, [])
+            buf.append(data)
+            count += 1
+
+            if len(buf) >= batch_size:
+                write(key, buf)
+                groups[key] = []
+
+        for key, buf in groups.items():
+            if buf:
+                write(key, buf)
+
+        return count
+
+    def get_newest_bar_data(
+        self, symbol: str, exchange: "Exchange", interval: "Interval"
+    ) -> Optional["BarData"]:
+        """"""
+        data = self.get_bar_store(symbol, exchange, interval).read_last()
+        if data is None:
+            return None
+        return BarBatch(symbol, exchange, data, interval=interval)[0]
+
+    def get_newest_tick_data(
+        self, symbol: str, exchange: "Exchange"
+    ) -> Optional["TickData"]:
+        """"""
+        data = self.get_tick_store(symbol, exchange).read_last()
+        if data is None:
+            return None
+        return TickBatch(symbol, exchange, data)[0]
+
+    def clean(self, symbol: str):
+        """"""
+        for path in [self.bar_path, self.tick_path]:
+            if not path.exists():
+                continue
+
+            for folder in path.iterdir():
+                if folder.name.rsplit(".", 1)[0] == symbol:
+                    shutil.rmtree(folder)
@@ -1,12 +1,15 @@
-from datetime import datetime
-from enum import Enum
-from typing import Optional, Sequence
+from datetime import datetime, timedelta
+from operator import attrgetter
+from typing import Iterable, Iterator, Optional, Sequence
 
+import numpy as np
 from mongoengine import DateTimeField, Document, FloatField, StringField, connect
+from pymongo import ASCENDING, ReplaceOne
 
+from vnpy.trader.batch import BAR_DTYPE, DATETIME_DTYPE, TICK_DTYPE, BarBatch, TickBatch
 from vnpy.trader.constant import Exchange, Interval
 from vnpy.trader.object import BarData, TickData
-from .database import BaseDatabaseManager, Driver
+from .database import CHUNK_SIZE, INTERVAL_DELTAS, BaseDatabaseManager, Driver, get_bar_end
 
 
 def init(_: Driver, settings: dict):
@@ -34,6 +37,121 @@ def init(_: Driver, settings: dict):
     return MongoManager()
 
 
+# Requests sent in one bulk_write
+BATCH_SIZE = 1000
+
+BAR_FIELDS = (
+    "volume", "open_interest", "open_price", "high_price", "low_price", "close_price",
+)
+BAR_PROJECTION = dict.fromkeys(("datetime",) + BAR_FIELDS, 1)
+BAR_PROJECTION["_id"] = 0
+
+TICK_FIELDS = (
+    "name", "volume", "open_interest", "last_price", "last_volume",
+    "limit_up", "limit_down", "open_price", "high_price", "low_price", "pre_close",
+    "bid_price_1", "bid_price_2", "bid_price_3", "bid_price_4", "bid_price_5",
+    "ask_price_1", "ask_price_2", "ask_price_3", "ask_price_4", "ask_price_5",
+    "bid_volume_1", "bid_volume_2", "bid_volume_3", "bid_volume_4", "bid_volume_5",
+    "ask_volume_1", "ask_volume_2", "ask_volume_3", "ask_volume_4", "ask_volume_5",
+)
+TICK_PROJECTION = dict.fromkeys(("datetime",) + TICK_FIELDS, 1)
+TICK_PROJECTION["_id"] = 0
+
+_get_bar_values = attrgetter(*BAR_FIELDS)
+_get_tick_values = attrgetter(*TICK_FIELDS)
+
+
+def bar_to_document(bar: BarData) -> dict:
+    """
+    Convert BarData into raw document of DbBarData.
+    """
+    document = dict(zip(BAR_FIELDS, _get_bar_values(bar)))
+    document["symbol"] = bar.symbol
+    document["exchange"] = bar.exchange.value
+    document["datetime"] = bar.datetime
+    document["interval"] = bar.interval.value
+    return document
+
+
+def tick_to_document(tick: TickData) -> dict:
+    """
+    Convert TickData into raw document of DbTickData.
+    """
+    document = dict(zip(TICK_FIELDS, _get_tick_values(tick)))
+    document["symbol"] = tick.symbol
+    document["exchange"] = tick.exchange.value
+    document["datetime"] = tick.datetime
+    return document
+
+
+def documents_to_bars(
+    documents: Iterable[dict],
+    symbol: str,
+    exchange: Exchange,
+    interval: Interval
+) -> Iterator[BarData]:
+    """
+    Convert raw documents into BarData, enums are resolved only once.
+    """
+    delta = INTERVAL_DELTAS.get(interval, timedelta())
+
+    for d in documents:
+        dt = d["datetime"]
+        yield BarData(
+            "DB", symbol, exchange, dt, dt, dt + delta, interval,
+            *[d.get(name, 0) for name in BAR_FIELDS]
+        )
+
+
+def documents_to_ticks(
+    documents: Iterable[dict],
+    symbol: str,
+    exchange: Exchange
+) -> Iterator[TickData]:
+    """
+    Convert raw documents into TickData, missing depth fields are zero.
+    """
+    for d in documents:
+        yield TickData(
+            "DB", symbol, exchange, d["datetime"],
+            *[d.get(name, None) or 0 for name in TICK_FIELDS]
+        )
+
+
+def to_datetime64(values: list) -> np.ndarray:
+    """
+    Convert datetimes into naive datetime64 column.
+    """
+    if values[0].tzinfo:
+        values = [dt.replace(tzinfo=None) for dt in values]
+    return np.array(values, dtype=DATETIME_DTYPE)
+
+
+def bulk_write(collection, requests: Iterable[tuple], batch_size: int = BATCH_SIZE) -> int:
+    """
+    Send (key, request) pairs with unordered bulk_write in batches, return
+    number of requests sent.
+
+    Unordered requests with the same key may be applied in any order, so
+    they are collapsed into the last one within a batch.
+    """
+    count = 0
+    batch = {}
+
+    for key, request in requests:
+        batch[key] = request
+        if len(batch) >= batch_size:
+            collection.bulk_write(list(batch.values()), ordered=False)
+            count += len(batch)
+            batch = {}
+
+    if batch:
+        collection.bulk_write(list(batch.values()), ordered=False)
+        count += len(batch)
+
+    return count
+
+
 class DbBarData(Document):
     """
     Candlestick bar data for database storage.
@@ -86,11 +204,14 @@ class DbBarData(Document):
         """
         Generate BarData object from DbBarData.
         """
+        interval = Interval(self.interval)
         bar = BarData(
             symbol=self.symbol,
             exchange=Exchange(self.exchange),
             datetime=self.datetime,
-            interval=Interval(self.interval),
+            datetime_start=self.datetime,
+            datetime_end=get_bar_end(self.datetime, interval),
+            interval=interval,
             volume=self.volume,
             open_interest=self.open_interest,
             open_price=self.open_price,
@@ -270,56 +391,184 @@ class MongoManager(BaseDatabaseManager):
         start: datetime,
         end: datetime,
     ) -> Sequence[BarData]:
-        s = DbBarData.objects(
-            symbol=symbol,
-            exchange=exchange.value,
-            interval=interval.value,
-            datetime__gte=start,
-            datetime__lte=end,
+        """
+        Load bars from raw documents of pymongo cursor, with only needed
+        fields projected and no mongoengine Document created.
+        """
+        cursor = self.find_bars(symbol, exchange, interval, start, end)
+        return list(documents_to_bars(cursor, symbol, exchange, interval))
+
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> BarBatch:
+        """
+        Load bars as columnar BarBatch without creating BarData objects.
+        """
+        documents = list(self.find_bars(symbol, exchange, interval, start, end))
+
+        data = np.zeros(len(documents), dtype=BAR_DTYPE)
+        if documents:
+            dt = to_datetime64([d["datetime"] for d in documents])
+            data["datetime"] = dt
+            data["datetime_start"] = dt
+            data["datetime_end"] = dt + np.timedelta64(INTERVAL_DELTAS.get(interval, timedelta()))
+
+            for name in BAR_FIELDS:
+                data[name] = [d.get(name, 0) for d in documents]
+
+        return BarBatch(symbol, exchange, data, interval=interval)
+
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[BarData]:
+        """
+        Iterate bars with cursor batch size of chunk_size.
+        """
+        cursor = self.find_bars(symbol, exchange, interval, start, end, chunk_size)
+        yield from documents_to_bars(cursor, symbol, exchange, interval)
+
+    def find_bars(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        """
+        Get pymongo cursor of bar documents in datetime order.
+        """
+        collection = DbBarData._get_collection()
+        cursor = collection.find(
+            {
+                "symbol": symbol,
+                "exchange": exchange.value,
+                "interval": interval.value,
+                "datetime": {"$gte": start, "$lte": end},
+            },
+            BAR_PROJECTION,
         )
-        data = [db_bar.to_bar() for db_bar in s]
-        return data
+        return cursor.sort("datetime", ASCENDING).batch_size(chunk_size)
 
     def load_tick_data(
         self, symbol: str, exchange: Exchange, start: datetime, end: datetime
     ) -> Sequence[TickData]:
-        s = DbTickData.objects(
-            symbol=symbol,
-            exchange=exchange.value,
-            datetime__gte=start,
-            datetime__lte=end,
+        """
+        Load ticks from raw documents, same as load_bar_data.
+        """
+        cursor = self.find_ticks(symbol, exchange, start, end)
+        return list(documents_to_ticks(cursor, symbol, exchange))
+
+    def load_tick_batch(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> TickBatch:
+        """
+        Load ticks as columnar TickBatch without creating TickData objects.
+        """
+        documents = list(self.find_ticks(symbol, exchange, start, end))
+
+        data = np.zeros(len(documents), dtype=TICK_DTYPE)
+        if documents:
+            data["datetime"] = to_datetime64([d["datetime"] for d in documents])
+
+            for name in TICK_FIELDS:
+                if name in TICK_DTYPE.names:
+                    default = "" if name == "name" else 0
+                    data[name] = [d.get(name, None) or default for d in documents]
+
+        return TickBatch(symbol, exchange, data)
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[TickData]:
+        """
+        Iterate ticks with cursor batch size of chunk_size.
+        """
+        cursor = self.find_ticks(symbol, exchange, start, end, chunk_size)
+        yield from documents_to_ticks(cursor, symbol, exchange)
+
+    def find_ticks(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        """
+        Get pymongo cursor of tick documents in datetime order.
+        """
+        collection = DbTickData._get_collection()
+        cursor = collection.find(
+            {
+                "symbol": symbol,
+                "exchange": exchange.value,
+                "datetime": {"$gte": start, "$lte": end},
+            },
+            TICK_PROJECTION,
         )
-        data = [db_tick.to_tick() for db_tick in s]
-        return data
+        return cursor.sort("datetime", ASCENDING).batch_size(chunk_size)
 
-    @staticmethod
-    def to_update_param(d):
-        return {
-            "set__" + k: v.value if isinstance(v, Enum) else v
-            for k, v in d.__dict__.items()
-        }
-
-    def save_bar_data(self, datas: Sequence[BarData]):
-        for d in datas:
-            updates = self.to_update_param(d)
-            updates.pop("set__gateway_name")
-            updates.pop("set__vt_symbol")
+    def save_bar_data(self, datas: Iterable[BarData], batch_size: int = BATCH_SIZE) -> int:
+        """
+        Bulk upsert bars with unordered ReplaceOne batches, mongoengine
+        Document validation is bypassed.
+        """
+        requests = (
             (
-                DbBarData.objects(
-                    symbol=d.symbol, interval=d.interval.value, datetime=d.datetime
-                ).update_one(upsert=True, **updates)
+                (bar.symbol, bar.exchange, bar.interval, bar.datetime),
+                ReplaceOne(
+                    {
+                        "symbol": bar.symbol,
+                        "exchange": bar.exchange.value,
+                        "interval": bar.interval.value,
+                        "datetime": bar.datetime,
+                    },
+                    bar_to_document(bar),
+                    upsert=True,
+                )
             )
+            for bar in datas
+        )
+        return bulk_write(DbBarData._get_collection(), requests, batch_size)
 
-    def save_tick_data(self, datas: Sequence[TickData]):
-        for d in datas:
-            updates = self.to_update_param(d)
-            updates.pop("set__gateway_name")
-            updates.pop("set__vt_symbol")
+    def save_tick_data(self, datas: Iterable[TickData], batch_size: int = BATCH_SIZE) -> int:
+        """
+        Bulk upsert ticks with unordered ReplaceOne batches.
+        """
+        requests = (
             (
-                DbTickData.objects(
-                    symbol=d.symbol, exchange=d.exchange.value, datetime=d.datetime
-                ).update_one(upsert=True, **updates)
+                (tick.symbol, tick.exchange, tick.datetime),
+                ReplaceOne(
+                    {
+                        "symbol": tick.symbol,
+                        "exchange": tick.exchange.value,
+                        "datetime": tick.datetime,
+                    },
+                    tick_to_document(tick),
+                    upsert=True,
+                )
             )
+            for tick in datas
+        )
+        return bulk_write(DbTickData._get_collection(), requests, batch_size)
 
     def get_newest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
@@ -1,7 +1,13 @@
 """"""
-from datetime import datetime
-from typing import List, Optional, Sequence, Type
-
+import sqlite3
+from datetime import datetime, timedelta
+from functools import lru_cache
+from io import StringIO
+from operator import attrgetter
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+from uuid import uuid4
+
+import numpy as np
 from peewee import (
     AutoField,
     CharField,
@@ -12,13 +18,147 @@ from peewee import (
     MySQLDatabase,
     PostgresqlDatabase,
     SqliteDatabase,
+    Select,
     chunked,
+    fn,
+    mysql,
 )
 
+from vnpy.trader.batch import BAR_DTYPE, DATETIME_DTYPE, TICK_DTYPE, BarBatch, TickBatch
 from vnpy.trader.constant import Exchange, Interval
 from vnpy.trader.object import BarData, TickData
 from vnpy.trader.utility import get_file_path
-from .database import BaseDatabaseManager, Driver
+from .database import (
+    CHUNK_SIZE,
+    INTERVAL_DELTAS,
+    BaseDatabaseManager,
+    Driver,
+    get_bar_end,
+)
+
+# Rows sent in one multi-row upsert (or COPY) statement
+BATCH_SIZE = 1000
+
+# Host parameters allowed in one statement, which is 999 before SQLite 3.32
+if sqlite3.sqlite_version_info < (3, 32, 0):
+    SQLITE_MAX_VARIABLES = 999
+else:
+    SQLITE_MAX_VARIABLES = 32766
+
+# INSERT ... ON CONFLICT DO UPDATE is supported since SQLite 3.24, older
+# versions use INSERT OR REPLACE instead.
+SQLITE_UPSERT = sqlite3.sqlite_version_info >= (3, 24, 0)
+
+MAX_VARIABLES = {
+    Driver.SQLITE: SQLITE_MAX_VARIABLES,
+    Driver.MYSQL: 65535,
+    Driver.POSTGRESQL: 65535,
+}
+
+BAR_FIELDS = (
+    "symbol", "exchange", "datetime", "interval",
+    "volume", "open_interest", "open_price", "high_price", "low_price", "close_price",
+)
+BAR_KEYS = ("symbol", "exchange", "interval", "datetime")
+
+TICK_FIELDS = (
+    "symbol", "exchange", "datetime",
+    "name", "volume", "open_interest", "last_price", "last_volume",
+    "limit_up", "limit_down", "open_price", "high_price", "low_price", "pre_close",
+    "bid_price_1", "bid_price_2", "bid_price_3", "bid_price_4", "bid_price_5",
+    "ask_price_1", "ask_price_2", "ask_price_3", "ask_price_4", "ask_price_5",
+    "bid_volume_1", "bid_volume_2", "bid_volume_3", "bid_volume_4", "bid_volume_5",
+    "ask_volume_1", "ask_volume_2", "ask_volume_3", "ask_volume_4", "ask_volume_5",
+)
+TICK_KEYS = ("symbol", "exchange", "datetime")
+
+_get_bar_values = attrgetter(*BAR_FIELDS[4:])
+_get_tick_values = attrgetter(*TICK_FIELDS[3:])
+
+
+def to_datetime(value) -> datetime:
+    """
+    Convert datetime value of raw cursor, which is str on SQLite.
+    """
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def to_datetime64(values: Sequence) -> np.ndarray:
+    """
+    Convert column of datetime values of raw cursor into naive datetime64.
+    """
+    first = values[0]
+    if isinstance(first, str):
+        # Strings without utc offset are parsed by numpy directly
+        if len(first) in (19, 26):
+            return np.array(values, dtype=DATETIME_DTYPE)
+        values = [datetime.fromisoformat(v) for v in values]
+        first = values[0]
+
+    if first.tzinfo:
+        values = [dt.replace(tzinfo=None) for dt in values]
+    return np.array(values, dtype=DATETIME_DTYPE)
+
+
+def rows_to_bars(
+    rows: Iterable[tuple],
+    symbol: str,
+    exchange: Exchange,
+    interval: Interval
+) -> List[BarData]:
+    """
+    Convert rows of datetime and BAR_FIELDS values into BarData list.
+    """
+    delta = INTERVAL_DELTAS.get(interval, timedelta())
+
+    bars = []
+    for row in rows:
+        dt = to_datetime(row[0])
+        bar = BarData("DB", symbol, exchange, dt, dt, dt + delta, interval, *row[1:])
+        bars.append(bar)
+    return bars
+
+
+def rows_to_ticks(rows: Iterable[tuple], symbol: str, exchange: Exchange) -> List[TickData]:
+    """
+    Convert rows of datetime and TICK_FIELDS values into TickData list.
+    """
+    return [
+        TickData("DB", symbol, exchange, to_datetime(row[0]), *row[1:])
+        for row in rows
+    ]
+
+
+def fetch_chunks(cursor, chunk_size: int) -> Iterator[List[tuple]]:
+    """
+    Fetch rows from cursor in chunks, cursor is closed when finished.
+    """
+    try:
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield rows
+    finally:
+        cursor.close()
+
+
+def bar_to_row(bar: BarData) -> tuple:
+    """
+    Convert BarData into row of BAR_FIELDS without creating model object.
+    """
+    return (
+        bar.symbol, bar.exchange.value, bar.datetime, bar.interval.value
+    ) + _get_bar_values(bar)
+
+
+def tick_to_row(tick: TickData) -> tuple:
+    """
+    Convert TickData into row of TICK_FIELDS without creating model object.
+    """
+    return (tick.symbol, tick.exchange.value, tick.datetime) + _get_tick_values(tick)
 
 
 def init(driver: Driver, settings: dict):
@@ -110,11 +250,14 @@ def init_models(db: Database, driver: Driver):
             """
             Generate BarData object from DbBarData.
             """
+            interval = Interval(self.interval)
             bar = BarData(
                 symbol=self.symbol,
                 exchange=Exchange(self.exchange),
                 datetime=self.datetime,
-                interval=Interval(self.interval),
+                datetime_start=self.datetime,
+                datetime_end=get_bar_end(self.datetime, interval),
+                interval=interval,
                 volume=self.volume,
                 open_price=self.open_price,
                 high_price=self.high_price,
@@ -130,23 +273,15 @@ def init_models(db: Database, driver: Driver):
             """
             save a list of objects, update if exists.
             """
-            dicts = [i.to_dict() for i in objs]
-            with db.atomic():
-                if driver is Driver.POSTGRESQL:
-                    for bar in dicts:
-                        DbBarData.insert(bar).on_conflict(
-                            update=bar,
-                            conflict_target=(
-                                DbBarData.symbol,
-                                DbBarData.exchange,
-                                DbBarData.interval,
-                                DbBarData.datetime,
-                            ),
-                        ).execute()
-                else:
-                    for c in chunked(dicts, 50):
-                        DbBarData.insert_many(
-                            c).on_conflict_replace().execute()
+            rows = [tuple(obj.__data__.get(name) for name in BAR_FIELDS) for obj in objs]
+            DbBarData.save_rows(rows)
+
+        @staticmethod
+        def save_rows(rows: Iterable[tuple], batch_size: int = BATCH_SIZE) -> int:
+            """
+            Bulk upsert rows of BAR_FIELDS, return number of rows saved.
+            """
+            return upsert_rows(DbBarData, driver, BAR_FIELDS, BAR_KEYS, rows, batch_size)
 
     class DbTickData(ModelBase):
         """
@@ -303,27 +438,151 @@ def init_models(db: Database, driver: Driver):
 
         @staticmethod
         def save_all(objs: List["DbTickData"]):
-            dicts = [i.to_dict() for i in objs]
-            with db.atomic():
-                if driver is Driver.POSTGRESQL:
-                    for tick in dicts:
-                        DbTickData.insert(tick).on_conflict(
-                            update=tick,
-                            conflict_target=(
-                                DbTickData.symbol,
-                                DbTickData.exchange,
-                                DbTickData.datetime,
-                            ),
-                        ).execute()
-                else:
-                    for c in chunked(dicts, 50):
-                        DbTickData.insert_many(c).on_conflict_replace().execute()
+            rows = [tuple(obj.__data__.get(name) for name in TICK_FIELDS) for obj in objs]
+            DbTickData.save_rows(rows)
+
+        @staticmethod
+        def save_rows(rows: Iterable[tuple], batch_size: int = BATCH_SIZE) -> int:
+            """
+            Bulk upsert rows of TICK_FIELDS, return number of rows saved.
+            """
+            return upsert_rows(DbTickData, driver, TICK_FIELDS, TICK_KEYS, rows, batch_size)
 
     db.connect()
     db.create_tables([DbBarData, DbTickData])
     return DbBarData, DbTickData
 
 
+def upsert_rows(
+    model: Type[Model],
+    driver: Driver,
+    names: Tuple[str, ...],
+    keys: Tuple[str, ...],
+    rows: Iterable[tuple],
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """
+    Upsert rows of names fields in batches within one transaction.
+
+    Each batch is sent as one multi-row INSERT ... ON CONFLICT statement,
+    or copied into a staging table and merged on PostgreSQL.
+    """
+    db = model._meta.database
+    fields = [model._meta.fields[name] for name in names]
+    key_indexes = [names.index(name) for name in keys]
+
+    batch_size = max(min(batch_size, MAX_VARIABLES[driver] // len(fields)), 1)
+
+    use_copy = isinstance(db, PostgresqlDatabase)
+
+    count = 0
+    with db.atomic():
+        for batch in chunked(rows, batch_size):
+            # Same key can not be affected twice in one statement
+            batch = dedup_rows(batch, key_indexes)
+
+            if use_copy:
+                copy_upsert(model, fields, keys, batch)
+            else:
+                sql = get_upsert_sql(model, driver, names, keys, len(batch))
+                db.execute_sql(sql, [value for row in batch for value in row])
+
+            count += len(batch)
+    return count
+
+
+@lru_cache(maxsize=None)
+def get_upsert_sql(
+    model: Type[Model],
+    driver: Driver,
+    names: Tuple[str, ...],
+    keys: Tuple[str, ...],
+    count: int
+) -> str:
+    """
+    Generate multi-row upsert SQL of count rows with placeholders.
+
+    SQL is generated by peewee only once for every batch size, since
+    building query with peewee costs much more than executing it.
+    """
+    fields = [model._meta.fields[name] for name in names]
+    query = model.insert_many([(None,) * len(fields)] * count, fields=fields)
+
+    if driver is Driver.MYSQL:
+        query = query.on_conflict(preserve=fields)
+    elif driver is Driver.SQLITE and not SQLITE_UPSERT:
+        query = query.on_conflict_replace()
+    else:
+        query = query.on_conflict(
+            conflict_target=[model._meta.fields[name] for name in keys],
+            preserve=fields,
+        )
+
+    sql, _ = query.sql()
+    return sql
+
+
+def dedup_rows(rows: List[tuple], key_indexes: List[int]) -> List[tuple]:
+    """
+    Remove rows with duplicated key, the last one is kept.
+    """
+    unique = {tuple(row[i] for i in key_indexes): row for row in rows}
+    if len(unique) == len(rows):
+        return rows
+    return list(unique.values())
+
+
+def copy_upsert(model: Type[Model], fields: list, keys: Tuple[str, ...], rows: List[tuple]):
+    """
+    COPY rows into temporary staging table and then merge into model table.
+    """
+    db = model._meta.database
+    table = model._meta.table_name
+    staging = f"{table}_staging"
+
+    columns = ", ".join(f'"{field.column_name}"' for field in fields)
+    updates = ", ".join(
+        f'"{field.column_name}" = EXCLUDED."{field.column_name}"' for field in fields
+    )
+    conflict = ", ".join(f'"{key}"' for key in keys)
+
+    buf = StringIO()
+    for row in rows:
+        buf.write("\t".join([to_copy_text(field, value) for field, value in zip(fields, row)]))
+        buf.write("\n")
+    buf.seek(0)
+
+    with db.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TEMP TABLE IF NOT EXISTS "{staging}" ON COMMIT DROP AS '
+            f'SELECT {columns} FROM "{table}" WITH NO DATA'
+        )
+        cursor.copy_expert(f'COPY "{staging}" ({columns}) FROM STDIN', buf)
+        cursor.execute(
+            f'INSERT INTO "{table}" ({columns}) SELECT {columns} FROM "{staging}" '
+            f'ON CONFLICT ({conflict}) DO UPDATE SET {updates}'
+        )
+        cursor.execute(f'TRUNCATE "{staging}"')
+
+
+def to_copy_text(field, value) -> str:
+    """
+    Convert value into text format of PostgreSQL COPY.
+    """
+    if value is None:
+        return "\\N"
+
+    text = str(field.db_value(value))
+    if isinstance(value, str):
+        text = (
+            text.replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r")
+        )
+    return text
+
+
 class SqlManager(BaseDatabaseManager):
 
     def __init__(self, class_bar: Type[Model], class_tick: Type[Model]):
@@ -338,44 +597,200 @@ class SqlManager(BaseDatabaseManager):
         start: datetime,
         end: datetime,
     ) -> Sequence[BarData]:
-        s = (
-            self.class_bar.select()
-                .where(
-                (self.class_bar.symbol == symbol)
-                & (self.class_bar.exchange == exchange.value)
-                & (self.class_bar.interval == interval.value)
-                & (self.class_bar.datetime >= start)
-                & (self.class_bar.datetime <= end)
+        """
+        Load bars through raw cursor, enums and bar length are resolved
+        once per query instead of once per row.
+        """
+        query = self.select_bar_rows(symbol, exchange, interval, start, end)
+        return rows_to_bars(self.execute(query), symbol, exchange, interval)
+
+    def load_bar_batch(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> BarBatch:
+        """
+        Load bars as columnar BarBatch without creating BarData objects.
+        """
+        query = self.select_bar_rows(symbol, exchange, interval, start, end)
+        rows = self.execute(query).fetchall()
+
+        data = np.zeros(len(rows), dtype=BAR_DTYPE)
+        if rows:
+            columns = list(zip(*rows))
+
+            dt = to_datetime64(columns[0])
+            data["datetime"] = dt
+            data["datetime_start"] = dt
+            data["datetime_end"] = dt + np.timedelta64(INTERVAL_DELTAS.get(interval, timedelta()))
+
+            for name, column in zip(BAR_FIELDS[4:], columns[1:]):
+                data[name] = column
+
+        return BarBatch(symbol, exchange, data, interval=interval)
+
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[BarData]:
+        """
+        Iterate bars with server side cursor, chunk_size rows are fetched
+        from database each time.
+        """
+        query = self.select_bar_rows(symbol, exchange, interval, start, end)
+        for rows in self.iter_chunks(query, chunk_size):
+            yield from rows_to_bars(rows, symbol, exchange, interval)
+
+    def select_bar_rows(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+    ) -> Select:
+        """
+        Query of bar rows with datetime and BAR_FIELDS values.
+        """
+        model = self.class_bar
+        fields = [model._meta.fields[name] for name in BAR_FIELDS[4:]]
+
+        query = (
+            model.select(model.datetime, *fields)
+            .where(
+                (model.symbol == symbol)
+                & (model.exchange == exchange.value)
+                & (model.interval == interval.value)
+                & (model.datetime >= start)
+                & (model.datetime <= end)
             )
-            .order_by(self.class_bar.datetime)
+            .order_by(model.datetime)
         )
-        data = [db_bar.to_bar() for db_bar in s]
-        return data
+        return query
 
     def load_tick_data(
         self, symbol: str, exchange: Exchange, start: datetime, end: datetime
     ) -> Sequence[TickData]:
-        s = (
-            self.class_tick.select()
-                .where(
-                (self.class_tick.symbol == symbol)
-                & (self.class_tick.exchange == exchange.value)
-                & (self.class_tick.datetime >= start)
-                & (self.class_tick.datetime <= end)
+        """
+        Load ticks through raw cursor, same as load_bar_data.
+        """
+        query = self.select_tick_rows(symbol, exchange, start, end)
+        return rows_to_ticks(self.execute(query), symbol, exchange)
+
+    def load_tick_batch(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> TickBatch:
+        """
+        Load ticks as columnar TickBatch without creating TickData objects.
+        """
+        query = self.select_tick_rows(symbol, exchange, start, end)
+        rows = self.execute(query).fetchall()
+
+        data = np.zeros(len(rows), dtype=TICK_DTYPE)
+        if rows:
+            columns = list(zip(*rows))
+            data["datetime"] = to_datetime64(columns[0])
+
+            for name, column in zip(TICK_FIELDS[3:], columns[1:]):
+                if name in TICK_DTYPE.names:
+                    data[name] = column
+
+        return TickBatch(symbol, exchange, data)
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[TickData]:
+        """
+        Iterate ticks with server side cursor, same as iter_bar_data.
+        """
+        query = self.select_tick_rows(symbol, exchange, start, end)
+        for rows in self.iter_chunks(query, chunk_size):
+            yield from rows_to_ticks(rows, symbol, exchange)
+
+    def select_tick_rows(
+        self, symbol: str, exchange: Exchange, start: datetime, end: datetime
+    ) -> Select:
+        """
+        Query of tick rows with datetime and TICK_FIELDS values, null depth
+        fields are returned as zero.
+        """
+        model = self.class_tick
+
+        fields = []
+        for name in TICK_FIELDS[3:]:
+            field = model._meta.fields[name]
+            if field.null:
+                field = fn.COALESCE(field, 0)
+            fields.append(field)
+
+        query = (
+            model.select(model.datetime, *fields)
+            .where(
+                (model.symbol == symbol)
+                & (model.exchange == exchange.value)
+                & (model.datetime >= start)
+                & (model.datetime <= end)
             )
-            .order_by(self.class_tick.datetime)
+            .order_by(model.datetime)
         )
+        return query
+
+    def execute(self, query: Select):
+        """
+        Execute query and return raw cursor, no peewee model or field
+        conversion is done on rows.
+        """
+        return query.model._meta.database.execute_sql(*query.sql())
+
+    def iter_chunks(self, query: Select, chunk_size: int) -> Iterator[List[tuple]]:
+        """
+        Execute query with server side cursor and yield rows in chunks.
 
-        data = [db_tick.to_tick() for db_tick in s]
-        return data
+        PostgreSQL uses named cursor within a transaction and MySQL uses
+        unbuffered cursor, so that memory usage does not grow with result
+        size. SQLite cursor steps through result lazily by itself.
+        """
+        db = query.model._meta.database
+        sql, params = query.sql()
 
-    def save_bar_data(self, datas: Sequence[BarData]):
-        ds = [self.class_bar.from_bar(i) for i in datas]
-        self.class_bar.save_all(ds)
+        if isinstance(db, PostgresqlDatabase):
+            with db.atomic():
+                cursor = db.connection().cursor(f"vnpy_{uuid4().hex}", withhold=True)
+                cursor.itersize = chunk_size
+                cursor.execute(sql, params)
+                yield from fetch_chunks(cursor, chunk_size)
+        elif isinstance(db, MySQLDatabase):
+            cursor = db.connection().cursor(mysql.cursors.SSCursor)
+            cursor.execute(sql, params)
+            yield from fetch_chunks(cursor, chunk_size)
+        else:
+            cursor = db.execute_sql(sql, params)
+            yield from fetch_chunks(cursor, chunk_size)
+
+    def save_bar_data(self, datas: Iterable[BarData], batch_size: int = BATCH_SIZE) -> int:
+        """
+        Bulk upsert bars, datas can be a generator for streaming import.
+        """
+        return self.class_bar.save_rows(map(bar_to_row, datas), batch_size)
 
-    def save_tick_data(self, datas: Sequence[TickData]):
-        ds = [self.class_tick.from_tick(i) for i in datas]
-        self.class_tick.save_all(ds)
+    def save_tick_data(self, datas: Iterable[TickData], batch_size: int = BATCH_SIZE) -> int:
+        """
+        Bulk upsert ticks, datas can be a generator for streaming import.
+        """
+        return self.class_tick.save_rows(map(tick_to_row, datas), batch_size)
 
     def get_newest_bar_data(
         self, symbol: str, exchange: "Exchange", interval: "Interval"
@@ -11,7 +11,7 @@ from queue import Empty, Queue
 from threading import Thread
 from typing import Any, Sequence
 
-from vnpy.event import Event, EventEngine
+from vnpy.event import Event, EventEngine, EVENT_OVERFLOW
 from .app import BaseApp
 from .event import (
     EVENT_TICK,
@@ -55,6 +55,8 @@ class MainEngine:
         os.chdir(TRADER_DIR)    # Change working directory
         self.init_engines()     # Initialize function engines
 
+        self.event_engine.register(EVENT_OVERFLOW, self.process_overflow_event)
+
     def add_engine(self, engine_class: Any):
         """
         Add function engine.
@@ -103,6 +105,16 @@ class MainEngine:
         event = Event(EVENT_LOG, log)
         self.event_engine.put(event)
 
+    def process_overflow_event(self, event: Event):
+        """
+        Write log when event queue is full and overflow policy fired.
+        """
+        data = event.data
+        self.write_log(
+            f"事件队列已满（容量{data['capacity']}），"
+            f"{data['type']}触发{data['policy']}策略，累计{data['count']}次"
+        )
+
     def get_gateway(self, gateway_name: str):
         """
         Return gateway object by name.
@@ -2,7 +2,7 @@
 Event type string used in VN Trader.
 """
 
-from vnpy.event import EVENT_TIMER  # noqa
+from vnpy.event import EVENT_TIMER, EVENT_OVERFLOW, OverflowPolicy  # noqa
 
 EVENT_TICK = "eTick."
 EVENT_TRADE = "eTrade."
@@ -12,4 +12,23 @@ EVENT_ACCOUNT = "eAccount."
 EVENT_CONTRACT = "eContract."
 EVENT_LOG = "eLog"
 
-EVENT_BAR = "eBar."
\ No newline at end of file
+EVENT_BAR = "eBar."
+EVENT_DEPTH = "eDepth."
+# Priority lanes for EventEngine: trading > market data > log/UI > timer.
+# Events of apps and other unknown types go to log/UI lane.
+EVENT_LANES = [
+    [EVENT_ORDER, EVENT_TRADE, EVENT_POSITION, EVENT_ACCOUNT, EVENT_CONTRACT],
+    [EVENT_TICK, EVENT_BAR, EVENT_DEPTH],
+    [EVENT_LOG, ""],
+    [EVENT_TIMER],
+]
+
+# Overflow policies for EventEngine with bounded capacity: market data
+# is conflated, log and timer events are dropped, trading events block.
+EVENT_OVERFLOW_POLICIES = {
+    EVENT_TICK: OverflowPolicy.CONFLATE,
+    EVENT_DEPTH: OverflowPolicy.CONFLATE,
+    EVENT_BAR: OverflowPolicy.DROP_OLDEST,
+    EVENT_LOG: OverflowPolicy.DROP_OLDEST,
+    EVENT_TIMER: OverflowPolicy.DROP_NEWEST,
+}
@@ -16,6 +16,7 @@ from .event import (
     EVENT_CONTRACT,
     EVENT_LOG,
     EVENT_BAR,
+    EVENT_DEPTH,
 )
 from .object import (
     TickData,
@@ -30,6 +31,7 @@ from .object import (
     SubscribeRequest,
     HistoryRequest,
     BarData,
+    DepthData,
 )
 
 
@@ -78,6 +80,10 @@ class BaseGateway(ABC):
     # Exchanges supported in the gateway.
     exchanges = []
 
+    # Whether to push full depth of order book, for gateways maintaining
+    # an OrderBook of each contract.
+    depth_enabled = False
+
     def __init__(self, event_engine: EventEngine, gateway_name: str):
         """"""
         self.event_engine = event_engine
@@ -98,6 +104,14 @@ class BaseGateway(ABC):
         self.on_event(EVENT_TICK, tick)
         self.on_event(EVENT_TICK + tick.vt_symbol, tick)
 
+    def on_depth(self, depth: DepthData):
+        """
+        Depth event push.
+        Depth event of a specific vt_symbol is also pushed.
+        """
+        self.on_event(EVENT_DEPTH, depth)
+        self.on_event(EVENT_DEPTH + depth.vt_symbol, depth)
+
     def on_bar(self, bar: BarData):
         """
         Bar event push.
@@ -0,0 +1,510 @@
+"""
+Incremental technical indicators updated in O(1) per new bar.
+
+Every indicator follows the same calculation rules of talib, so value
+after each update is the same (within floating point tolerance) as the
+last element of talib result on the whole history.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Tuple
+
+from .object import BarData
+
+NAN = float("nan")
+
+# Same threshold as TA_IS_ZERO in talib
+ZERO = 1e-8
+
+
+def is_zero(value: float) -> bool:
+    """"""
+    return -ZERO < value < ZERO
+
+
+class Indicator(ABC):
+    """
+    Base class of incremental indicator.
+
+    * update/update_bar feeds a new value and returns indicator value.
+    * value is nan before enough data is received, and inited is set
+      when the first valid value is calculated.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        self.n: int = n
+        self.count: int = 0
+        self.inited: bool = False
+        self.value = NAN
+
+    @abstractmethod
+    def update(self, value: float):
+        """
+        Update with new close price.
+        """
+        pass
+
+    def update_bar(self, bar: BarData):
+        """
+        Update with new bar data.
+        """
+        return self.update(bar.close_price)
+
+
+class HlcIndicator(Indicator):
+    """
+    Base class of indicator calculated from high/low/close prices.
+    """
+
+    @abstractmethod
+    def update(self, high: float, low: float, close: float):
+        """"""
+        pass
+
+    def update_bar(self, bar: BarData):
+        """"""
+        return self.update(bar.high_price, bar.low_price, bar.close_price)
+
+
+class SmaIndicator(Indicator):
+    """
+    Simple moving average.
+
+    The running sum is recalculated every n updates to avoid floating
+    point error accumulating in long running process.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__(n)
+
+        self.window: deque = deque(maxlen=n)
+        self.total: float = 0
+
+    def update(self, value: float) -> float:
+        """"""
+        window = self.window
+        n = self.n
+
+        if len(window) == n:
+            self.total -= window[0]
+        window.append(value)
+        self.total += value
+
+        self.count += 1
+        if not self.count % n:
+            self.total = sum(window)
+
+        if self.count >= n:
+            self.inited = True
+            self.value = self.total / n
+
+        return self.value
+
+
+class EmaIndicator(Indicator):
+    """
+    Exponential moving average, seeded with SMA of the first n values.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__(n)
+
+        self.k: float = 2 / (n + 1)
+        self.total: float = 0
+
+    def update(self, value: float) -> float:
+        """"""
+        self.count += 1
+
+        if self.inited:
+            self.value += (value - self.value) * self.k
+        else:
+            self.total += value
+            if self.count == self.n:
+                self.inited = True
+                self.value = self.total / self.n
+
+        return self.value
+
+
+class StdIndicator(Indicator):
+    """
+    Standard deviation (population) of the last n values.
+    """
+
+    def __init__(self, n: int, dev: float = 1):
+        """"""
+        super().__init__(n)
+
+        self.dev: float = dev
+        self.window: deque = deque(maxlen=n)
+        self.total: float = 0
+        self.total_square: float = 0
+        self.mean: float = NAN
+
+    def update(self, value: float) -> float:
+        """"""
+        window = self.window
+        n = self.n
+
+        if len(window) == n:
+            old = window[0]
+            self.total -= old
+            self.total_square -= old * old
+        window.append(value)
+        self.total += value
+        self.total_square += value * value
+
+        self.count += 1
+        if not self.count % n:
+            self.total = sum(window)
+            self.total_square = sum(v * v for v in window)
+
+        if self.count >= n:
+            self.inited = True
+
+            mean = self.total / n
+            variance = self.total_square / n - mean * mean
+            if is_zero(variance) or variance < 0:
+                self.value = 0
+            else:
+                self.value = variance ** 0.5 * self.dev
+            self.mean = mean
+
+        return self.value
+
+
+class AtrIndicator(HlcIndicator):
+    """
+    Average True Range with Wilder's smoothing.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__(n)
+
+        self.pre_close: float = NAN
+        self.total: float = 0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """"""
+        self.count += 1
+
+        pre_close = self.pre_close
+        self.pre_close = close
+        if self.count == 1:
+            return self.value
+
+        tr = max(high - low, abs(high - pre_close), abs(low - pre_close))
+        n = self.n
+
+        if self.inited:
+            self.value = (self.value * (n - 1) + tr) / n
+        else:
+            self.total += tr
+            if self.count == n + 1:
+                self.inited = True
+                self.value = self.total / n
+
+        return self.value
+
+
+class RsiIndicator(Indicator):
+    """
+    Relative Strength Index with Wilder's smoothing.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__(n)
+
+        self.pre_value: float = NAN
+        self.gain: float = 0
+        self.loss: float = 0
+
+    def update(self, value: float) -> float:
+        """"""
+        self.count += 1
+
+        pre_value = self.pre_value
+        self.pre_value = value
+        if self.count == 1:
+            return self.value
+
+        change = value - pre_value
+        n = self.n
+
+        if self.inited:
+            self.gain *= n - 1
+            self.loss *= n - 1
+
+        if change < 0:
+            self.loss -= change
+        else:
+            self.gain += change
+
+        if self.inited:
+            self.gain /= n
+            self.loss /= n
+        elif self.count == n + 1:
+            self.inited = True
+            self.gain /= n
+            self.loss /= n
+        else:
+            return self.value
+
+        total = self.gain + self.loss
+        if is_zero(total):
+            self.value = 0
+        else:
+            self.value = 100 * self.gain / total
+
+        return self.value
+
+
+class MacdIndicator(Indicator):
+    """
+    MACD with value of (macd, signal, hist).
+
+    Same as talib, fast EMA is seeded at the same bar as slow EMA, with
+    SMA of the last fast_period values.
+    """
+
+    def __init__(self, fast_period: int, slow_period: int, signal_period: int):
+        """"""
+        if slow_period < fast_period:
+            fast_period, slow_period = slow_period, fast_period
+
+        super().__init__(slow_period + signal_period - 1)
+
+        self.fast_period: int = fast_period
+        self.slow_period: int = slow_period
+        self.signal_period: int = signal_period
+
+        self.fast_k: float = 2 / (fast_period + 1)
+        self.slow_k: float = 2 / (slow_period + 1)
+
+        self.window: deque = deque(maxlen=fast_period)
+        self.slow_total: float = 0
+        self.fast: float = NAN
+        self.slow: float = NAN
+
+        self.signal: EmaIndicator = EmaIndicator(signal_period)
+        self.value = (NAN, NAN, NAN)
+
+    def update(self, value: float) -> Tuple[float, float, float]:
+        """"""
+        self.count += 1
+
+        if self.count < self.slow_period:
+            self.window.append(value)
+            self.slow_total += value
+            return self.value
+        elif self.count == self.slow_period:
+            self.window.append(value)
+            self.slow_total += value
+            self.fast = sum(self.window) / self.fast_period
+            self.slow = self.slow_total / self.slow_period
+        else:
+            self.fast += (value - self.fast) * self.fast_k
+            self.slow += (value - self.slow) * self.slow_k
+
+        macd = self.fast - self.slow
+        signal = self.signal.update(macd)
+
+        if self.signal.inited:
+            self.inited = True
+            self.value = (macd, signal, macd - signal)
+
+        return self.value
+
+
+class AdxIndicator(HlcIndicator):
+    """
+    Average Directional Movement Index.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__(n)
+
+        self.pre_high: float = NAN
+        self.pre_low: float = NAN
+        self.pre_close: float = NAN
+
+        self.plus_dm: float = 0
+        self.minus_dm: float = 0
+        self.tr: float = 0
+        self.dx_total: float = 0
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """"""
+        self.count += 1
+        count = self.count
+        n = self.n
+
+        pre_close = self.pre_close
+        diff_plus = high - self.pre_high
+        diff_minus = self.pre_low - low
+
+        self.pre_high = high
+        self.pre_low = low
+        self.pre_close = close
+
+        if count == 1:
+            return self.value
+
+        # Wilder's smoothing starts after the first n - 1 movements summed
+        if count > n:
+            self.plus_dm -= self.plus_dm / n
+            self.minus_dm -= self.minus_dm / n
+
+        if diff_minus > 0 and diff_plus < diff_minus:
+            self.minus_dm += diff_minus
+        elif diff_plus > 0 and diff_plus > diff_minus:
+            self.plus_dm += diff_plus
+
+        tr = max(high - low, abs(high - pre_close), abs(low - pre_close))
+        if count > n:
+            self.tr = self.tr - self.tr / n + tr
+        else:
+            self.tr += tr
+            return self.value
+
+        dx = self.calculate_dx()
+
+        if self.inited:
+            if dx is not None:
+                self.value = (self.value * (n - 1) + dx) / n
+        else:
+            if dx is not None:
+                self.dx_total += dx
+
+            if count == 2 * n:
+                self.inited = True
+                self.value = self.dx_total / n
+
+        return self.value
+
+    def calculate_dx(self) -> float:
+        """
+        Calculate DX, None is returned if it cannot be calculated.
+        """
+        if is_zero(self.tr):
+            return None
+
+        minus_di = 100 * self.minus_dm / self.tr
+        plus_di = 100 * self.plus_dm / self.tr
+
+        total = minus_di + plus_di
+        if is_zero(total):
+            return None
+
+        return 100 * abs(minus_di - plus_di) / total
+
+
+class CciIndicator(HlcIndicator):
+    """
+    Commodity Channel Index.
+
+    Mean deviation from average can not be updated incrementally, so it
+    is calculated over the window of typical prices in O(n).
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__(n)
+
+        self.sma: SmaIndicator = SmaIndicator(n)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """"""
+        self.count += 1
+
+        tp = (high + low + close) / 3
+        mean = self.sma.update(tp)
+
+        if not self.sma.inited:
+            return self.value
+        self.inited = True
+
+        deviation = sum([abs(v - mean) for v in self.sma.window])
+        diff = tp - mean
+
+        if diff and deviation:
+            self.value = diff / (0.015 * deviation / self.n)
+        else:
+            self.value = 0
+
+        return self.value
+
+
+class DonchianIndicator(HlcIndicator):
+    """
+    Donchian Channel with value of (up, down), using monotonic queues
+    of highest high and lowest low.
+    """
+
+    def __init__(self, n: int):
+        """"""
+        super().__init__(n)
+
+        self.highs: deque = deque()
+        self.lows: deque = deque()
+        self.value = (NAN, NAN)
+
+    def update(self, high: float, low: float, close: float = 0) -> Tuple[float, float]:
+        """"""
+        count = self.count
+        self.count += 1
+
+        highs = self.highs
+        while highs and highs[-1][1] <= high:
+            highs.pop()
+        highs.append((count, high))
+        if highs[0][0] <= count - self.n:
+            highs.popleft()
+
+        lows = self.lows
+        while lows and lows[-1][1] >= low:
+            lows.pop()
+        lows.append((count, low))
+        if lows[0][0] <= count - self.n:
+            lows.popleft()
+
+        if self.count >= self.n:
+            self.inited = True
+            self.value = (highs[0][1], lows[0][1])
+
+        return self.value
+
+
+class BollIndicator(Indicator):
+    """
+    Bollinger Channel with value of (up, down).
+    """
+
+    def __init__(self, n: int, dev: float):
+        """"""
+        super().__init__(n)
+
+        self.std: StdIndicator = StdIndicator(n)
+        self.dev: float = dev
+        self.value = (NAN, NAN)
+
+    def update(self, value: float) -> Tuple[float, float]:
+        """"""
+        self.count += 1
+
+        std = self.std.update(value)
+        if self.std.inited:
+            self.inited = True
+
+            mid = self.std.mean
+            self.value = (mid + std * self.dev, mid - std * self.dev)
+
+        return self.value
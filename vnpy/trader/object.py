@@ -2,14 +2,31 @@
 Basic data structure used for general trading function in VN Trader.
 """
 
-from dataclasses import dataclass
+import sys
+from dataclasses import MISSING, dataclass, field, fields
 from datetime import datetime
 from logging import INFO
+from typing import Dict, List, Tuple
 
 from .constant import Direction, Exchange, Interval, Offset, Status, Product, OptionType, OrderType
 
 ACTIVE_STATUSES = set([Status.SUBMITTING, Status.NOTTRADED, Status.PARTTRADED])
 
+# Interned vt_symbol strings, so that every tick/bar of the same contract
+# shares one string object instead of building a new one.
+_vt_symbols: Dict[Tuple[str, Exchange], str] = {}
+
+
+def get_vt_symbol(symbol: str, exchange: Exchange) -> str:
+    """
+    Get cached and interned vt_symbol of symbol and exchange.
+    """
+    vt_symbol = _vt_symbols.get((symbol, exchange), None)
+    if not vt_symbol:
+        vt_symbol = sys.intern(f"{symbol}.{exchange.value}")
+        _vt_symbols[(symbol, exchange)] = vt_symbol
+    return vt_symbol
+
 
 @dataclass
 class BaseData:
@@ -73,7 +90,91 @@ class TickData(BaseData):
 
     def __post_init__(self):
         """"""
-        self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol = get_vt_symbol(self.symbol, self.exchange)
+
+    def snapshot(self) -> "FrozenTickData":
+        """
+        Get an immutable snapshot of current tick data, which can be shared
+        by all consumers without copying again.
+        """
+        snapshot = object.__new__(FrozenTickData)
+        snapshot.__dict__.update(self.__dict__)
+        return snapshot
+
+
+class FrozenTickData(TickData):
+    """
+    Immutable snapshot of tick data created by TickData.snapshot.
+
+    Gateways keep updating their own mutable TickData and push a snapshot
+    of it, so copy/deepcopy of the snapshot simply returns itself.
+    """
+
+    def __setattr__(self, name: str, value) -> None:
+        """"""
+        raise AttributeError(f"Tick快照不可修改：{name}")
+
+    def __delattr__(self, name: str) -> None:
+        """"""
+        raise AttributeError(f"Tick快照不可修改：{name}")
+
+    def __eq__(self, other) -> bool:
+        """"""
+        if isinstance(other, TickData):
+            return self.__dict__ == other.__dict__
+        return NotImplemented
+
+    def __copy__(self) -> "FrozenTickData":
+        """"""
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "FrozenTickData":
+        """"""
+        return self
+
+    def __reduce__(self):
+        """"""
+        return (_restore_snapshot, (self.__dict__,))
+
+    def snapshot(self) -> "FrozenTickData":
+        """"""
+        return self
+
+    def thaw(self) -> TickData:
+        """
+        Get a mutable copy of the snapshot.
+        """
+        tick = object.__new__(TickData)
+        tick.__dict__.update(self.__dict__)
+        return tick
+
+
+def _restore_snapshot(data: dict) -> FrozenTickData:
+    """
+    Unpickle FrozenTickData without calling __setattr__.
+    """
+    snapshot = object.__new__(FrozenTickData)
+    snapshot.__dict__.update(data)
+    return snapshot
+
+
+@dataclass
+class DepthData(BaseData):
+    """
+    Order book depth of a certain contract, price levels are sorted
+    from best to worst as (price, volume).
+    """
+
+    symbol: str
+    exchange: Exchange
+    datetime: datetime
+
+    bids: List[Tuple[float, float]] = field(default_factory=list)
+    asks: List[Tuple[float, float]] = field(default_factory=list)
+
+    def __post_init__(self):
+        """"""
+        self.vt_symbol = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -98,7 +199,7 @@ class BarData(BaseData):
 
     def __post_init__(self):
         """"""
-        self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
+        self.vt_symbol = get_vt_symbol(self.symbol, self.exchange)
 
 
 @dataclass
@@ -332,3 +433,78 @@ class HistoryRequest:
     def __post_init__(self):
         """"""
         self.vt_symbol = f"{self.symbol}.{self.exchange.value}"
+
+
+def _make_compact(data_class: type, name: str) -> type:
+    """
+    Create a class with __slots__ instead of per-instance __dict__,
+    with the same fields, defaults and constructor as data_class.
+    """
+    data_fields = fields(data_class)
+    field_names = [data_field.name for data_field in data_fields]
+
+    namespace = {"get_vt_symbol": get_vt_symbol}
+    args = ["self"]
+    for data_field in data_fields:
+        if data_field.default is MISSING:
+            args.append(data_field.name)
+        else:
+            namespace[f"_default_{data_field.name}"] = data_field.default
+            args.append(f"{data_field.name}=_default_{data_field.name}")
+
+    lines = [f"def __init__({', '.join(args)}):"]
+    lines.extend(f"    self.{field_name} = {field_name}" for field_name in field_names)
+    lines.append("    self.vt_symbol = get_vt_symbol(symbol, exchange)")
+    exec("\n".join(lines), namespace)
+
+    def __repr__(self):
+        """"""
+        values = ", ".join(
+            f"{field_name}={getattr(self, field_name)!r}" for field_name in field_names
+        )
+        return f"{name}({values})"
+
+    def __eq__(self, other):
+        """"""
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(
+            getattr(self, field_name) == getattr(other, field_name)
+            for field_name in field_names
+        )
+
+    def __copy__(self):
+        """"""
+        return self.__class__(*[getattr(self, field_name) for field_name in field_names])
+
+    def to_data(self):
+        """
+        Convert into dataclass object.
+        """
+        return data_class(*[getattr(self, field_name) for field_name in field_names])
+
+    @classmethod
+    def from_data(cls, data):
+        """
+        Create from dataclass object.
+        """
+        return cls(*[getattr(data, field_name) for field_name in field_names])
+
+    return type(name, (), {
+        "__doc__": f"{data_class.__name__} stored in __slots__, without __dict__.",
+        "__slots__": tuple(field_names) + ("vt_symbol",),
+        "__init__": namespace["__init__"],
+        "__repr__": __repr__,
+        "__eq__": __eq__,
+        "__hash__": None,
+        "__copy__": __copy__,
+        "to_data": to_data,
+        "from_data": from_data,
+        "__module__": __name__,
+    })
+
+
+# Attribute compatible variants of TickData and BarData using much less
+# memory, for large amount of data such as bars loaded for backtesting.
+CompactTickData = _make_compact(TickData, "CompactTickData")
+CompactBarData = _make_compact(BarData, "CompactBarData")
@@ -0,0 +1,281 @@
+"""
+Full depth order book maintained from incremental market data updates.
+"""
+
+from bisect import bisect_left, insort
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Tuple
+from zlib import crc32
+
+from .constant import Exchange
+from .object import DepthData, TickData
+
+TICK_DEPTH = 5
+
+BID_PRICE_FIELDS = tuple(f"bid_price_{n}" for n in range(1, TICK_DEPTH + 1))
+BID_VOLUME_FIELDS = tuple(f"bid_volume_{n}" for n in range(1, TICK_DEPTH + 1))
+ASK_PRICE_FIELDS = tuple(f"ask_price_{n}" for n in range(1, TICK_DEPTH + 1))
+ASK_VOLUME_FIELDS = tuple(f"ask_volume_{n}" for n in range(1, TICK_DEPTH + 1))
+
+CHECKSUM_DEPTH = 25
+
+
+def format_number(value: float) -> str:
+    """
+    Format number in the same way as Number.prototype.toString of
+    JavaScript, which is used in checksum texts of BITFINEX, e.g.
+    0.00001 instead of 1e-05 and 1 instead of 1.0.
+    """
+    sign, digits, exponent = Decimal(repr(float(value))).as_tuple()
+
+    # Shortest digits without trailing zeros, value = 0.digits * 10 ** n
+    while len(digits) > 1 and digits[-1] == 0:
+        digits = digits[:-1]
+        exponent += 1
+
+    text = "".join(str(d) for d in digits)
+    if text == "0":
+        return "0"
+
+    k = len(text)
+    n = exponent + k
+
+    if k <= n <= 21:
+        result = text + "0" * (n - k)
+    elif 0 < n <= 21:
+        result = text[:n] + "." + text[n:]
+    elif -6 < n <= 0:
+        result = "0." + "0" * -n + text
+    else:
+        mantissa = text[0]
+        if k > 1:
+            mantissa += "." + text[1:]
+        result = f"{mantissa}e{n - 1:+d}"
+
+    if sign:
+        result = "-" + result
+    return result
+
+
+class BookSide:
+    """
+    One side of order book, with prices kept in ascending order.
+    """
+
+    def __init__(self, reverse: bool):
+        """"""
+        self.reverse: bool = reverse
+
+        self.volumes: Dict[float, float] = {}
+        self.texts: Dict[float, str] = {}
+        self.prices: List[float] = []
+
+    def __len__(self) -> int:
+        """"""
+        return len(self.prices)
+
+    def clear(self) -> None:
+        """"""
+        self.volumes.clear()
+        self.texts.clear()
+        self.prices.clear()
+
+    def update(self, price: float, volume: float, text: str = "") -> None:
+        """
+        Update volume of price level, zero volume deletes the level.
+
+        Text is the original "price:volume" string received from exchange,
+        which is used for checksum calculation.
+        """
+        if not volume:
+            self.delete(price)
+            return
+
+        if price not in self.volumes:
+            insort(self.prices, price)
+
+        self.volumes[price] = volume
+        if text:
+            self.texts[price] = text
+
+    def delete(self, price: float) -> None:
+        """"""
+        if self.volumes.pop(price, None) is None:
+            return
+        self.texts.pop(price, None)
+
+        ix = bisect_left(self.prices, price)
+        del self.prices[ix]
+
+    def get_prices(self, depth: int = 0) -> List[float]:
+        """
+        Get prices from best to worst.
+        """
+        prices = self.prices
+
+        if self.reverse:
+            if depth:
+                return prices[:-depth - 1:-1]
+            return prices[::-1]
+        else:
+            if depth:
+                return prices[:depth]
+            return prices[:]
+
+    def get_levels(self, depth: int = 0) -> List[Tuple[float, float]]:
+        """
+        Get (price, volume) levels from best to worst.
+        """
+        volumes = self.volumes
+        return [(price, volumes[price]) for price in self.get_prices(depth)]
+
+    def get_texts(self, depth: int = 0) -> List[str]:
+        """"""
+        texts = self.texts
+        return [texts[price] for price in self.get_prices(depth)]
+
+
+class OrderBook:
+    """
+    Order book of a contract with arbitrary depth.
+
+    Gateways apply snapshot and incremental updates received from exchange,
+    and then derive the 5 level quote fields of TickData from it.
+    """
+
+    def __init__(self, symbol: str, exchange: Exchange, gateway_name: str):
+        """"""
+        self.symbol: str = symbol
+        self.exchange: Exchange = exchange
+        self.gateway_name: str = gateway_name
+
+        self.bids: BookSide = BookSide(reverse=True)
+        self.asks: BookSide = BookSide(reverse=False)
+        self.datetime: datetime = None
+
+    def clear(self) -> None:
+        """"""
+        self.bids.clear()
+        self.asks.clear()
+
+    def update_bid(self, price: float, volume: float, text: str = "") -> None:
+        """"""
+        self.bids.update(price, volume, text)
+
+    def update_ask(self, price: float, volume: float, text: str = "") -> None:
+        """"""
+        self.asks.update(price, volume, text)
+
+    def apply_snapshot(
+        self,
+        bids: Iterable[Tuple[float, float]],
+        asks: Iterable[Tuple[float, float]]
+    ) -> None:
+        """
+        Replace all price levels with snapshot.
+        """
+        self.clear()
+        self.apply_update(bids, asks)
+
+    def apply_update(
+        self,
+        bids: Iterable[Tuple[float, float]],
+        asks: Iterable[Tuple[float, float]]
+    ) -> None:
+        """
+        Apply incremental update of price levels.
+        """
+        for price, volume in bids:
+            self.bids.update(price, volume)
+
+        for price, volume in asks:
+            self.asks.update(price, volume)
+
+    def get_best_bid(self) -> float:
+        """"""
+        if self.bids.prices:
+            return self.bids.prices[-1]
+        return 0
+
+    def get_best_ask(self) -> float:
+        """"""
+        if self.asks.prices:
+            return self.asks.prices[0]
+        return 0
+
+    def is_crossed(self) -> bool:
+        """
+        Check if best bid is not lower than best ask, which means the book
+        is out of sync with exchange.
+        """
+        if not self.bids.prices or not self.asks.prices:
+            return False
+        return self.bids.prices[-1] >= self.asks.prices[0]
+
+    def get_checksum(self, depth: int = CHECKSUM_DEPTH) -> int:
+        """
+        Calculate signed CRC32 checksum of the top price levels, with bid
+        and ask texts interleaved as "bid:ask:bid:ask...".
+
+        Both OKEX and BITFINEX use this algorithm with depth of 25.
+        """
+        bid_texts = self.bids.get_texts(depth)
+        ask_texts = self.asks.get_texts(depth)
+
+        buf = []
+        for n in range(max(len(bid_texts), len(ask_texts))):
+            if n < len(bid_texts):
+                buf.append(bid_texts[n])
+            if n < len(ask_texts):
+                buf.append(ask_texts[n])
+
+        checksum = crc32(":".join(buf).encode())
+        if checksum >= 0x80000000:
+            checksum -= 0x100000000
+        return checksum
+
+    def validate(self, checksum: int, depth: int = CHECKSUM_DEPTH) -> bool:
+        """"""
+        return self.get_checksum(depth) == checksum
+
+    def update_tick(self, tick: TickData) -> None:
+        """
+        Set 5 level quote fields of tick from the top of order book, missing
+        levels are set to zero.
+        """
+        self._update_fields(tick, self.bids, BID_PRICE_FIELDS, BID_VOLUME_FIELDS)
+        self._update_fields(tick, self.asks, ASK_PRICE_FIELDS, ASK_VOLUME_FIELDS)
+
+    def _update_fields(
+        self,
+        tick: TickData,
+        side: BookSide,
+        price_fields: Tuple[str],
+        volume_fields: Tuple[str]
+    ) -> None:
+        """"""
+        d = tick.__dict__
+        volumes = side.volumes
+        prices = side.get_prices(TICK_DEPTH)
+
+        for n, price in enumerate(prices):
+            d[price_fields[n]] = price
+            d[volume_fields[n]] = volumes[price]
+
+        for n in range(len(prices), TICK_DEPTH):
+            d[price_fields[n]] = 0
+            d[volume_fields[n]] = 0
+
+    def to_depth(self, depth: int = 0) -> DepthData:
+        """
+        Create DepthData of the top price levels, all levels if depth is 0.
+        """
+        return DepthData(
+            symbol=self.symbol,
+            exchange=self.exchange,
+            datetime=self.datetime,
+            bids=self.bids.get_levels(depth),
+            asks=self.asks.get_levels(depth),
+            gateway_name=self.gateway_name
+        )
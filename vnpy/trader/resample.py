@@ -0,0 +1,141 @@
+"""
+Vectorized resampling of 1 minute bars into bars of larger windows.
+"""
+
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+
+from .batch import BarBatch, DATETIME_DTYPE
+from .constant import Interval
+from .session import MINUTES_PER_DAY, NIGHT_END_LIMIT, SessionTable, get_session_table
+from .utility import WINDOW_INTERVALS
+
+WindowType = Tuple[int, Interval]
+
+
+def get_window_minutes(window: int, interval: Interval) -> int:
+    """
+    Get window minutes with the same rule of SessionBarGenerator.
+    """
+    if interval == Interval.DAILY:
+        return 0
+    elif interval == Interval.HOUR:
+        return window * 60
+    else:
+        return window
+
+
+class BarResampler:
+    """
+    Resample 1 minute BarBatch of a contract into multiple windows in one
+    pass, with output identical to SessionBarGenerator fed bar by bar.
+
+    Minute offset and trading day of every bar are calculated once, then
+    each window only needs a table lookup and numpy reduceat per column.
+    """
+
+    def __init__(self, batch: BarBatch):
+        """"""
+        self.batch: BarBatch = batch
+        self.table: SessionTable = get_session_table(batch.symbol, batch.exchange)
+
+        dt = batch["datetime"].astype("datetime64[m]")
+        days = dt.astype("datetime64[D]")
+        minutes = (dt - days).astype(int)
+
+        table = self.table
+        self.offsets: np.ndarray = (minutes - table.day_start) % MINUTES_PER_DAY
+
+        if table.day_start:
+            days = days + (minutes >= table.day_start)
+            days = table.calendar.roll_forward(days)
+        self.trading_days: np.ndarray = days
+
+    def resample(self, window: int, interval: Interval = Interval.MINUTE) -> BarBatch:
+        """"""
+        batch = self.batch
+        offsets = self.offsets
+        trading_days = self.trading_days
+
+        window_minutes = get_window_minutes(window, interval)
+        starts, ends = self.table.get_window_table(window_minutes)
+        starts = np.array(starts)
+        ends = np.array(ends)
+
+        index = self.table.get_window_index(window_minutes)[offsets]
+        bar_ends = ends[index]
+
+        # Window bar starts when window changes, previous window finished,
+        # or bar is after the end of window.
+        new_window = np.empty(len(batch), dtype=bool)
+        if len(batch):
+            new_window[0] = True
+            new_window[1:] = (
+                (index[1:] != index[:-1])
+                | (trading_days[1:] != trading_days[:-1])
+                | (offsets[:-1] + 1 >= bar_ends[:-1])
+            )
+        new_window |= offsets >= bar_ends
+
+        first = np.flatnonzero(new_window)
+        last = np.append(first[1:], len(batch)) - 1
+
+        data = np.zeros(len(first), dtype=batch.dtype)
+        if len(first):
+            source = batch.data
+            data["datetime"] = source["datetime"][first].astype("datetime64[m]")
+            data["open_price"] = source["open_price"][first]
+            data["high_price"] = np.maximum.reduceat(source["high_price"], first)
+            data["low_price"] = np.minimum.reduceat(source["low_price"], first)
+            data["close_price"] = source["close_price"][last]
+            data["volume"] = np.add.reduceat(source["volume"], first)
+            data["open_interest"] = source["open_interest"][last]
+
+            days = trading_days[first]
+            data["datetime_start"] = self.get_datetime(days, starts[index[first]])
+            data["datetime_end"] = self.get_datetime(days, ends[index[first]])
+
+        return BarBatch(
+            batch.symbol,
+            batch.exchange,
+            data,
+            batch.gateway_name,
+            WINDOW_INTERVALS.get(window_minutes, interval)
+        )
+
+    def resample_all(self, windows: Iterable[WindowType]) -> Dict[WindowType, BarBatch]:
+        """
+        Resample into all windows of (window, interval).
+        """
+        return {
+            (window, interval): self.resample(window, interval)
+            for window, interval in windows
+        }
+
+    def get_datetime(self, trading_days: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of SessionTable.get_datetime.
+        """
+        day_start = self.table.day_start
+        days = trading_days.astype(DATETIME_DTYPE)
+
+        if not day_start:
+            return days + offsets.astype("timedelta64[m]")
+
+        clock = (offsets + day_start) % MINUTES_PER_DAY
+        in_day = (clock >= NIGHT_END_LIMIT) & (offsets >= MINUTES_PER_DAY - day_start)
+
+        evenings = self.table.calendar.roll_backward(trading_days).astype(DATETIME_DTYPE)
+        return np.where(
+            in_day,
+            days + clock.astype("timedelta64[m]"),
+            evenings + (offsets + day_start).astype("timedelta64[m]")
+        )
+
+
+def resample_bars(batch: BarBatch, windows: Iterable[WindowType]) -> Dict[WindowType, BarBatch]:
+    """
+    Resample 1 minute BarBatch into all windows of (window, interval).
+    """
+    return BarResampler(batch).resample_all(windows)
@@ -0,0 +1,385 @@
+"""
+Trading session table of Chinese futures products.
+
+Time of a day is represented as integer minute offset from the start of
+trading day, which is 21:00 of previous evening for Chinese futures, so
+that night and day sessions of one trading day are in ascending order.
+"""
+
+import re
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .calendar import TradingCalendar, trading_calendar
+from .constant import Exchange
+
+# 日盘品种
+# 晚稻 鸡蛋 硅铁 锰硅 苹果 红枣
+DAYGROUP_1500 = ['wr', 'jd', 'sf', 'sm', 'ap', 'cj']
+# 塑料 PVC EG PP
+# 螺纹 热卷 燃油 沥青 橡胶 纸浆
+# 豆粕 豆油 豆一 豆二 棕榈油 玉米 玉米淀粉
+# 焦炭 焦煤 铁矿
+NIGHTGROUP_2300 = ['l', 'v', 'eg', 'pp',
+                   'rb', 'hc', 'fu', 'bu', 'ru', 'sp',
+                   'm', 'y', 'a', 'b', 'p', 'c', 'cs',
+                   'j', 'jm', 'i']
+# 白糖 棉花 棉纱 动力煤 玻璃 PTA 甲醇 菜油 菜粕
+NIGHTGROUP_2330 = ['sr', 'cf', 'cy', 'zc', 'fg', 'ta', 'ma', 'oi', 'rm']
+# 铜 铝 锌 铅 镍 锡
+NIGHTGROUP_0100 = ['cu', 'al', 'zn', 'pb', 'ni', 'sn']
+# 原油 黄金 白银
+NIGHTGROUP_0230 = ['sc', 'au', 'ag']
+COMMODITY = ['wr', 'jd', 'sf', 'sm', 'ap', 'cj',
+             'l', 'v', 'eg', 'pp',
+             'rb', 'hc', 'fu', 'bu', 'ru', 'sp',
+             'm', 'y', 'a', 'b', 'p', 'c', 'cs',
+             'j', 'jm', 'i',
+             'sr', 'cf', 'cy', 'zc', 'fg', 'ta', 'ma', 'oi', 'rm',
+             'cu', 'al', 'zn', 'pb', 'ni', 'sn',
+             'sc', 'au', 'ag'
+             ]
+# 股指 国债
+INDEXGROUP = ["if", "ih", "ic"]
+BONDGROUP = ["t", "ts", "tf"]
+FINANCE = INDEXGROUP + BONDGROUP
+
+# Exchanges using trading day and session rules of Chinese futures.
+FUTURES_EXCHANGES = {
+    Exchange.CFFEX, Exchange.SHFE, Exchange.DCE, Exchange.CZCE, Exchange.INE
+}
+STOCK_EXCHANGES = {Exchange.SSE, Exchange.SZSE}
+CRYPTO_EXCHANGES = {
+    Exchange.BITMEX, Exchange.OKEX, Exchange.HUOBI, Exchange.BITFINEX, Exchange.BINANCE
+}
+
+MINUTES_PER_DAY = 1440
+
+# Trading day of Chinese futures starts from 21:00 of previous evening
+FUTURES_DAY_START = 21 * 60
+
+# Night session always ends before 06:00
+NIGHT_END_LIMIT = 6 * 60
+
+ONE_DAY = timedelta(days=1)
+
+STOCK_DAY_SESSIONS = [("09:30", "11:30"), ("13:00", "15:00")]
+COMMODITY_DAY_SESSIONS = [("09:00", "10:15"), ("10:30", "11:30"), ("13:30", "15:00")]
+INDEX_DAY_SESSIONS = [("09:30", "11:30"), ("13:00", "15:00")]
+BOND_DAY_SESSIONS = [("09:15", "11:30"), ("13:00", "15:15")]
+
+NIGHT_SESSIONS = {}
+for products, night_end in [
+    (NIGHTGROUP_2300, "23:00"),
+    (NIGHTGROUP_2330, "23:30"),
+    (NIGHTGROUP_0100, "01:00"),
+    (NIGHTGROUP_0230, "02:30"),
+]:
+    for product in products:
+        NIGHT_SESSIONS[product] = ("21:00", night_end)
+
+
+def get_product(symbol: str) -> str:
+    """
+    Get lower case product root of futures symbol, e.g. rb from RB2005
+    and m from m2005-C-2800.
+    """
+    return _get_product(symbol)
+
+
+@lru_cache(maxsize=None)
+def _get_product(symbol: str) -> str:
+    """"""
+    return re.match(r"[A-Za-z]*", symbol).group().lower()
+
+
+def parse_minute(text: str) -> int:
+    """
+    Convert "HH:MM" into minute of day.
+    """
+    hour, minute = text.split(":")
+    return int(hour) * 60 + int(minute)
+
+
+class SessionTable:
+    """
+    Trading sessions of a product, as sorted [start, end) minute offsets
+    from the start of trading day.
+
+    Window lookups are precomputed for every window size requested, and
+    then answered by bisect on minute offset.
+    """
+
+    def __init__(
+        self,
+        sessions: List[Tuple[str, str]],
+        day_start: int,
+        calendar: TradingCalendar = trading_calendar
+    ):
+        """"""
+        self.day_start: int = day_start
+        self.calendar: TradingCalendar = calendar
+        self.sessions: List[Tuple[int, int]] = []
+
+        for start, end in sessions:
+            start_offset = self.get_offset(parse_minute(start))
+            end_offset = self.get_offset(parse_minute(end)) or MINUTES_PER_DAY
+            self.sessions.append((start_offset, end_offset))
+        self.sessions.sort()
+
+        self.session_starts: List[int] = [start for start, _ in self.sessions]
+        self.windows: Dict[int, Tuple[List[int], List[int]]] = {}
+        self.window_indexes: Dict[int, np.ndarray] = {}
+
+    def get_offset(self, minute: int) -> int:
+        """
+        Convert minute of day into offset from the start of trading day.
+        """
+        return (minute - self.day_start) % MINUTES_PER_DAY
+
+    def get_minute_offset(self, dt: datetime) -> int:
+        """"""
+        return self.get_offset(dt.hour * 60 + dt.minute)
+
+    def get_trading_day(self, dt: datetime) -> datetime:
+        """
+        Get trading day (at 00:00) which dt belongs to, night session after
+        21:00 belongs to the next trading day.
+        """
+        day = dt.replace(hour=0, minute=0, second=0, microsecond=0)
+        if not self.day_start:
+            return day
+
+        if dt.hour * 60 + dt.minute >= self.day_start:
+            day += ONE_DAY
+        return self.calendar.get_next_trading_day(day)
+
+    def get_datetime(self, trading_day: datetime, offset: int) -> datetime:
+        """
+        Convert minute offset of trading day into datetime, night session
+        is in the evening of previous trading day.
+        """
+        if not self.day_start:
+            return trading_day + timedelta(minutes=offset)
+
+        if not self.is_night(offset):
+            clock = (offset + self.day_start) % MINUTES_PER_DAY
+            return trading_day + timedelta(minutes=clock)
+
+        evening = self.calendar.get_previous_trading_day(trading_day)
+        return evening + timedelta(minutes=offset + self.day_start)
+
+    def is_night(self, offset: int) -> bool:
+        """
+        Check if minute offset is in night (from 21:00 to 06:00).
+        """
+        if not self.day_start:
+            return False
+        return offset < MINUTES_PER_DAY - self.day_start + NIGHT_END_LIMIT
+
+    def is_trading_time(self, dt: datetime) -> bool:
+        """
+        Check if dt is in trading sessions, with weekends, holidays and
+        night session before holidays excluded.
+        """
+        offset = self.get_minute_offset(dt)
+        if not self.is_in_session(offset):
+            return False
+
+        trading_day = self.get_trading_day(dt)
+        if self.get_datetime(trading_day, offset) != dt.replace(second=0, microsecond=0):
+            return False
+
+        if self.is_night(offset):
+            return self.calendar.has_night_session(trading_day)
+        return True
+
+    def get_bar_window(self, dt: datetime, window: int) -> Tuple[datetime, datetime]:
+        """
+        Get (start, end) datetime of bar window with window minutes which
+        dt belongs to.
+        """
+        trading_day = self.get_trading_day(dt)
+        start, end = self.get_window(self.get_minute_offset(dt), window)
+        return (
+            self.get_datetime(trading_day, start),
+            self.get_datetime(trading_day, end)
+        )
+
+    def is_in_session(self, offset: int) -> bool:
+        """"""
+        ix = bisect_right(self.session_starts, offset) - 1
+        return ix >= 0 and offset < self.sessions[ix][1]
+
+    def is_session_start(self, offset: int) -> bool:
+        """"""
+        ix = bisect_right(self.session_starts, offset) - 1
+        return ix >= 0 and self.session_starts[ix] == offset
+
+    def get_session_minutes(self) -> List[int]:
+        """
+        Get all minute offsets in trading sessions.
+        """
+        minutes = []
+        for start, end in self.sessions:
+            minutes.extend(range(start, end))
+        return minutes
+
+    def get_window_table(self, window: int) -> Tuple[List[int], List[int]]:
+        """
+        Get (starts, ends) offsets of all bar windows with window minutes.
+
+        If window can divide a whole day, bar windows are aligned to clock
+        time (e.g. 30 minutes bar always starts at xx:00 or xx:30), otherwise
+        every window minutes in trading sessions are grouped into a bar.
+        Zero window means the whole trading day.
+
+        Minutes out of trading sessions in a window are not counted, so bar
+        window is clipped to trading sessions, e.g. 10:00-10:15 for
+        30 minutes bar of commodity futures.
+        """
+        table = self.windows.get(window, None)
+        if table:
+            return table
+
+        groups: Dict[int, List[int]] = {}
+        for n, offset in enumerate(self.get_session_minutes()):
+            if not window:
+                key = 0
+            elif MINUTES_PER_DAY % window:
+                key = n // window
+            else:
+                clock = (offset + self.day_start) % MINUTES_PER_DAY
+                key = max(offset - clock % window, 0)
+
+            groups.setdefault(key, []).append(offset)
+
+        starts = []
+        ends = []
+        for key in sorted(groups.keys()):
+            offsets = groups[key]
+            starts.append(offsets[0])
+            ends.append(offsets[-1] + 1)
+
+        table = (starts, ends)
+        self.windows[window] = table
+        return table
+
+    def get_window_index(self, window: int) -> np.ndarray:
+        """
+        Get array of window index for every minute offset of trading day,
+        which is used for vectorized lookup.
+        """
+        index = self.window_indexes.get(window, None)
+        if index is None:
+            starts, _ = self.get_window_table(window)
+            ix = {start: n for n, start in enumerate(starts)}
+
+            index = np.array([
+                ix[self.get_window(offset, window)[0]]
+                for offset in range(MINUTES_PER_DAY)
+            ])
+            self.window_indexes[window] = index
+        return index
+
+    def get_window(self, offset: int, window: int) -> Tuple[int, int]:
+        """
+        Get (start, end) offsets of bar window which offset belongs to.
+
+        Minute out of trading sessions is put into the next window, or the
+        last window if it is after the last session.
+        """
+        starts, ends = self.get_window_table(window)
+
+        ix = bisect_right(starts, offset) - 1
+        if ix < 0:
+            ix = 0
+        elif offset >= ends[ix] and ix + 1 < len(starts):
+            ix += 1
+
+        return starts[ix], ends[ix]
+
+
+def create_session_table(product: str, exchange: Exchange = None) -> SessionTable:
+    """
+    Create session table of product on exchange, Chinese futures are
+    assumed if exchange is not given.
+    """
+    if exchange in CRYPTO_EXCHANGES:
+        return SessionTable([("00:00", "00:00")], 0)
+    elif exchange in STOCK_EXCHANGES:
+        return SessionTable(STOCK_DAY_SESSIONS, 0)
+    elif exchange and exchange not in FUTURES_EXCHANGES:
+        # Sessions of overseas exchanges are not known, so no time is
+        # filtered out.
+        return SessionTable([("00:00", "00:00")], 0)
+
+    if product in INDEXGROUP:
+        sessions = INDEX_DAY_SESSIONS
+    elif product in BONDGROUP:
+        sessions = BOND_DAY_SESSIONS
+    elif exchange is Exchange.CFFEX:
+        # Products not listed on CFFEX, e.g. index options
+        sessions = INDEX_DAY_SESSIONS
+    else:
+        # Products not listed, e.g. new products, are at least traded
+        # in commodity day sessions.
+        sessions = list(COMMODITY_DAY_SESSIONS)
+        if product in NIGHT_SESSIONS:
+            sessions.append(NIGHT_SESSIONS[product])
+
+    return SessionTable(sessions, FUTURES_DAY_START)
+
+
+_session_tables: Dict[Tuple[Exchange, str], SessionTable] = {}
+
+
+def get_session_table(symbol: str, exchange: Exchange = None) -> SessionTable:
+    """
+    Get cached session table of the product of symbol on exchange.
+    """
+    key = (exchange, get_product(symbol))
+
+    table = _session_tables.get(key, None)
+    if not table:
+        table = create_session_table(key[1], exchange)
+        _session_tables[key] = table
+    return table
+
+
+def is_futures_exchange(exchange: Exchange) -> bool:
+    """
+    Check if exchange uses trading day of Chinese futures, which starts
+    from night session of previous evening.
+    """
+    return exchange in FUTURES_EXCHANGES
+
+
+def is_trading_time(symbol: str, dt: datetime, exchange: Exchange = None) -> bool:
+    """
+    Check if dt is in trading sessions of the product of symbol.
+    """
+    return get_session_table(symbol, exchange).is_trading_time(dt)
+
+
+def get_trading_day(symbol: str, dt: datetime, exchange: Exchange = None) -> datetime:
+    """
+    Get trading day which dt belongs to for the product of symbol.
+    """
+    return get_session_table(symbol, exchange).get_trading_day(dt)
+
+
+def get_bar_window(
+    symbol: str,
+    dt: datetime,
+    window: int,
+    exchange: Exchange = None
+) -> Tuple[datetime, datetime]:
+    """
+    Get (start, end) datetime of bar window for the product of symbol.
+    """
+    return get_session_table(symbol, exchange).get_bar_window(dt, window)
@@ -4,6 +4,7 @@ Global setting of VN Trader.
 
 from logging import CRITICAL
 
+from .calendar import trading_calendar
 from .utility import load_json
 
 SETTINGS = {
@@ -26,18 +27,22 @@ SETTINGS = {
     "rqdata.password": "",
 
     "database.driver": "sqlite",  # see database.Driver
-    "database.database": "database.db",  # for sqlite, use this as filepath
+    "database.database": "database.db",  # for sqlite, use this as filepath, for file, as folder
     "database.host": "localhost",
     "database.port": 3306,
     "database.user": "root",
     "database.password": "",
     "database.authentication_source": "admin",  # for mongodb
+
+    "calendar.holidays": [],  # extra holidays as "YYYY-MM-DD", see calendar.HOLIDAYS
 }
 
 # Load global setting from json file.
 SETTING_FILENAME = "vt_setting.json"
 SETTINGS.update(load_json(SETTING_FILENAME))
 
+trading_calendar.add_holidays(SETTINGS["calendar.holidays"])
+
 
 def get_settings(prefix: str = ""):
     prefix_length = len(prefix)
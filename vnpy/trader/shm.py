@@ -0,0 +1,288 @@
+"""
+Shared memory event bus for distributing tick data to several
+processes on the same host.
+
+One market data process runs SharedTickPublisher, which writes every
+EVENT_TICK into a ring buffer of fixed-size binary records. Strategy
+processes run SharedTickSubscriber, which polls the ring buffer and
+puts tick events into their own event engine, just like a gateway.
+
+There is only one writer and any number of readers. Every reader keeps
+its own position, and if it falls more than capacity records behind,
+the oldest records are lost (and counted) instead of blocking writer.
+"""
+
+import struct
+from datetime import datetime, timedelta
+from threading import Thread
+from time import sleep
+from typing import List, Tuple
+
+from vnpy.event import Event, EventEngine
+from .constant import Exchange
+from .event import EVENT_TICK
+from .object import TickData
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:     # Python < 3.8
+    shared_memory = None
+
+MAGIC = 0x764E5079544B3031      # "vNPyTK01"
+
+# magic, capacity, record size, reserved, then sequence of last record
+# written in a cache line of its own.
+HEADER = struct.Struct("<QQQQ")
+HEADER_SIZE = 128
+WRITE_SEQ_OFFSET = 64
+
+SEQ = struct.Struct("<Q")
+
+# seq, symbol, exchange, gateway_name, name, datetime in microseconds,
+# then 10 market fields and 20 orderbook fields.
+RECORD = struct.Struct("<Q32s16s16s32sq30d")
+
+PRICE_FIELDS = [
+    "volume", "open_interest", "last_price", "last_volume",
+    "limit_up", "limit_down", "open_price", "high_price",
+    "low_price", "pre_close",
+]
+DEPTH_FIELDS = (
+    [f"bid_price_{n}" for n in range(1, 6)]
+    + [f"ask_price_{n}" for n in range(1, 6)]
+    + [f"bid_volume_{n}" for n in range(1, 6)]
+    + [f"ask_volume_{n}" for n in range(1, 6)]
+)
+FLOAT_FIELDS = PRICE_FIELDS + DEPTH_FIELDS
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Names of shared memory created in this process.
+_created = set()
+
+
+def _attach(name: str) -> "shared_memory.SharedMemory":
+    """
+    Attach to existing shared memory without registering it in resource
+    tracker, which would otherwise unlink it when reader process exits.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    if name in _created:
+        return shm
+
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except (ImportError, AttributeError, KeyError):
+        pass
+    return shm
+
+
+class TickRingBuffer:
+    """
+    Ring buffer of TickData records in shared memory.
+
+    Datetime is stored as wall-clock time, timezone info is not kept.
+    Strings longer than their field (32 bytes for symbol and name, 16
+    bytes for exchange and gateway_name) are truncated.
+    """
+
+    def __init__(self, name: str, capacity: int = 65536, create: bool = False):
+        """
+        Create a new ring buffer (writer), or attach to an existing one
+        (reader), in which case capacity is read from shared memory.
+        """
+        if not shared_memory:
+            raise RuntimeError("共享内存行情总线需要Python 3.8及以上版本")
+
+        self.name = name
+
+        if create:
+            size = HEADER_SIZE + capacity * RECORD.size
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            _created.add(name)
+            self.buf = self.shm.buf
+            HEADER.pack_into(self.buf, 0, MAGIC, capacity, RECORD.size, 0)
+            SEQ.pack_into(self.buf, WRITE_SEQ_OFFSET, 0)
+        else:
+            self.shm = _attach(name)
+            self.buf = self.shm.buf
+            magic, capacity, record_size, _ = HEADER.unpack_from(self.buf, 0)
+            if magic != MAGIC or record_size != RECORD.size:
+                raise ValueError(f"共享内存{name}不是行情环形缓冲区")
+
+        self.capacity = capacity
+        self.owner = create
+        self.write_seq = SEQ.unpack_from(self.buf, WRITE_SEQ_OFFSET)[0]
+
+        self.exchanges = {exchange.value: exchange for exchange in Exchange}
+
+    def _get_offset(self, seq: int) -> int:
+        """"""
+        return HEADER_SIZE + (seq % self.capacity) * RECORD.size
+
+    def write(self, tick: TickData):
+        """
+        Append a tick into ring buffer, only called by the writer.
+        """
+        seq = self.write_seq + 1
+        offset = self._get_offset(seq)
+
+        # Invalidate slot first, so that readers can detect torn records.
+        SEQ.pack_into(self.buf, offset, 0)
+        RECORD.pack_into(
+            self.buf,
+            offset,
+            0,
+            tick.symbol.encode(),
+            tick.exchange.value.encode(),
+            tick.gateway_name.encode(),
+            tick.name.encode(),
+            (tick.datetime.replace(tzinfo=None) - EPOCH) // ONE_MICROSECOND,
+            *[getattr(tick, field) or 0 for field in FLOAT_FIELDS]
+        )
+        SEQ.pack_into(self.buf, offset, seq)
+
+        SEQ.pack_into(self.buf, WRITE_SEQ_OFFSET, seq)
+        self.write_seq = seq
+
+    def get_head(self) -> int:
+        """
+        Get sequence of last record written.
+        """
+        return SEQ.unpack_from(self.buf, WRITE_SEQ_OFFSET)[0]
+
+    def read(self, next_seq: int) -> Tuple[List[TickData], int, int]:
+        """
+        Read all records from next_seq to the last one written.
+
+        Return ticks read, sequence to read next time and number of
+        records lost because they were overwritten before being read.
+        """
+        head = self.get_head()
+        if head < next_seq:
+            return [], next_seq, 0
+
+        lost = 0
+        oldest = head - self.capacity + 1
+        if next_seq < oldest:
+            lost = oldest - next_seq
+            next_seq = oldest
+
+        ticks = []
+        exchanges = self.exchanges
+        unpack_from = RECORD.unpack_from
+
+        for seq in range(next_seq, head + 1):
+            offset = self._get_offset(seq)
+            values = unpack_from(self.buf, offset)
+
+            # Record is being overwritten by writer.
+            if values[0] != seq or SEQ.unpack_from(self.buf, offset)[0] != seq:
+                lost += 1
+                continue
+
+            tick = TickData(
+                symbol=values[1].rstrip(b"\0").decode(),
+                exchange=exchanges[values[2].rstrip(b"\0").decode()],
+                gateway_name=values[3].rstrip(b"\0").decode(),
+                name=values[4].rstrip(b"\0").decode(errors="ignore"),
+                datetime=EPOCH + timedelta(microseconds=values[5]),
+                **dict(zip(FLOAT_FIELDS, values[6:]))
+            )
+            ticks.append(tick)
+
+        return ticks, head + 1, lost
+
+    def close(self):
+        """
+        Detach from shared memory, and remove it if created by this object.
+        """
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+            _created.discard(self.name)
+
+
+class SharedTickPublisher:
+    """
+    Writes every tick event of an event engine into shared memory.
+    """
+
+    def __init__(self, event_engine: EventEngine, name: str, capacity: int = 65536):
+        """"""
+        self.event_engine = event_engine
+        self.ring = TickRingBuffer(name, capacity, create=True)
+
+        self.event_engine.register(EVENT_TICK, self.process_tick_event)
+
+    def process_tick_event(self, event: Event):
+        """"""
+        self.ring.write(event.data)
+
+    def close(self):
+        """
+        Stop publishing and remove shared memory.
+        """
+        self.event_engine.unregister(EVENT_TICK, self.process_tick_event)
+        self.ring.close()
+
+
+class SharedTickSubscriber:
+    """
+    Reads ticks from shared memory and puts them into an event engine
+    as EVENT_TICK and EVENT_TICK + vt_symbol, same as BaseGateway.on_tick.
+
+    The reader thread polls shared memory, sleeping poll_interval seconds
+    only when there is no new record.
+    """
+
+    def __init__(
+        self,
+        event_engine: EventEngine,
+        name: str,
+        poll_interval: float = 0.0001
+    ):
+        """"""
+        self.event_engine = event_engine
+        self.ring = TickRingBuffer(name)
+        self.poll_interval = poll_interval
+
+        self.next_seq = self.ring.get_head() + 1
+        self.lost = 0
+
+        self.active = False
+        self.thread = Thread(target=self.run)
+
+    def start(self):
+        """"""
+        self.active = True
+        self.thread.start()
+
+    def stop(self):
+        """"""
+        self.active = False
+        self.thread.join()
+        self.ring.close()
+
+    def run(self):
+        """"""
+        while self.active:
+            if not self.poll():
+                sleep(self.poll_interval)
+
+    def poll(self) -> int:
+        """
+        Put all new ticks into event engine, return number of ticks read.
+        """
+        ticks, self.next_seq, lost = self.ring.read(self.next_seq)
+        self.lost += lost
+
+        put = self.event_engine.put
+        for tick in ticks:
+            put(Event(EVENT_TICK, tick))
+            put(Event(EVENT_TICK + tick.vt_symbol, tick))
+
+        return len(ticks)
@@ -4,6 +4,8 @@ General utility functions.
 
 import json
 import re
+from functools import wraps
+from inspect import signature
 from pathlib import Path
 from typing import Callable
 from datetime import datetime, timedelta
@@ -14,35 +16,17 @@ import math
 
 from .object import BarData, TickData
 from .constant import Exchange, Interval
-
-####
-# 增
-# 晚稻 鸡蛋 硅铁 锰硅 苹果 红枣
-DAYGROUP_1500 = ['wr', 'jd', 'sf', 'sm', 'ap', 'cj']
-# 塑料 PVC EG PP
-# 螺纹 热卷 燃油 沥青 橡胶 纸浆
-# 豆粕 豆油 豆一 豆二 棕榈油 玉米 玉米淀粉
-# 焦炭 焦煤 铁矿
-NIGHTGROUP_2300 = ['l', 'v', 'eg', 'pp',
-                   'rb', 'hc', 'fu', 'bu', 'ru', 'sp',
-                   'm', 'y', 'a', 'b', 'p', 'c', 'cs',
-                   'j', 'jm', 'i']
-# 白糖 棉花 棉纱 动力煤 玻璃 PTA 甲醇 菜油 菜粕
-NIGHTGROUP_2330 = ['sr', 'cf', 'cy', 'zc', 'fg', 'ta', 'ma', 'oi', 'rm']
-# 铜 铝 锌 铅 镍 锡
-NIGHTGROUP_0100 = ['cu', 'al', 'zn', 'pb', 'ni', 'sn']
-# 原油 黄金 白银
-NIGHTGROUP_0230 = ['sc', 'au', 'ag']
-COMMODITY = ['wr', 'jd', 'sf', 'sm', 'ap', 'cj',
-             'l', 'v', 'eg', 'pp',
-             'rb', 'hc', 'fu', 'bu', 'ru', 'sp',
-             'm', 'y', 'a', 'b', 'p', 'c', 'cs',
-             'j', 'jm', 'i',
-             'sr', 'cf', 'cy', 'zc', 'fg', 'ta', 'ma', 'oi', 'rm',
-             'cu', 'al', 'zn', 'pb', 'ni', 'sn',
-             'sc', 'au', 'ag'
-             ]
-FINANCE = ["if", "ih", "ic", "t", "ts", "tf"]
+from .session import (  # noqa
+    DAYGROUP_1500,
+    NIGHTGROUP_2300,
+    NIGHTGROUP_2330,
+    NIGHTGROUP_0100,
+    NIGHTGROUP_0230,
+    COMMODITY,
+    FINANCE,
+    MINUTES_PER_DAY,
+    get_session_table,
+)
 
 
 def extract_vt_symbol(vt_symbol: str):
@@ -388,50 +372,11 @@ class BarGenerator:
         # If not inited, create window bar object
         # 如果没有初始化
         # 创建Bar数据
-        symb = re.sub(r'\d', '', bar.symbol).lower()
+        # 窗口起止时间由交易日历和品种交易时段计算，24小时为日线
         dt = bar.datetime.replace(second=0, microsecond=0)
-        if self.window == 2:
-            period = Interval.HOUR2
-            dt_start = bar.datetime.replace(hour=math.floor(dt.minute / 2) * 2)
-            dt_end = dt_start + timedelta(hours=2)
-        elif self.window == 4:
-            period = Interval.HOUR4
-            dt_start = bar.datetime.replace(hour=math.floor(dt.minute / 4) * 4)
-            dt_end = dt_start + timedelta(hours=4)
-        elif self.window == 6:
-            period = Interval.HOUR6
-            dt_start = bar.datetime.replace(hour=math.floor(dt.minute / 6) * 6)
-            dt_end = dt_start + timedelta(hours=6)
-        elif self.window == 24:
-            period = Interval.DAILY
-            # 如果是商品期货
-            if symb in COMMODITY:
-                # 日盘品种
-                if symb in DAYGROUP_1500:
-                    dt_start = bar.datetime.replace(hour=9)
-                    dt_end = bar.datetime.replace(hour=15)
-                # 夜盘品种
-                else:
-                    # 如果输入的K线的星期小于5 并且是夜盘品种
-                    if bar.datetime.weekday() < 4 and bar.datetime.hour > 20:
-                        dt_start = bar.datetime.replace(hour=21)
-                        dt_end = (dt_start + timedelta(hours=10)).replace(hour=15)
-                    # 如果不连续的K线是盘品种,并且当前时间小于晚上8点,起始时间为昨天的21点
-                    elif bar.datetime.weekday() < 4 and bar.datetime.hour < 20:
-                        dt_start = (bar.datetime.replace(hour=0) - timedelta(hours=1)).replace(hour=21)
-                        dt_end = bar.datetime.replace(hour=15)
-                    # 周五晚上 夜盘品种
-                    elif bar.datetime.weekday() == 4 and bar.datetime.hour > 20:
-                        dt_start = bar.datetime.replace(hour=21)
-                        dt_end = (dt_start + timedelta(days=3)).replace(hour=15)
-                    # 周六凌晨 夜盘品种
-                    elif bar.datetime.weekday() == 5 and bar.datetime.hour < 5:
-                        dt_start = (bar.datetime.replace(hour=21) - timedelta(days=1))
-                        dt_end = (dt_start + timedelta(days=3)).replace(hour=15)
-                    # 周一
-                    elif bar.datetime.weekday() == 0 and bar.datetime.hour < 15:
-                        dt_start = (bar.datetime.replace(hour=21) - timedelta(days=3))
-                        dt_end = (dt_start + timedelta(days=3)).replace(hour=15)
+        window_minutes = self.window * 60 % MINUTES_PER_DAY
+        period = WINDOW_INTERVALS.get(window_minutes, Interval.HOUR)
+        dt_start, dt_end = get_session_table(bar.symbol, bar.exchange).get_bar_window(dt, window_minutes)
 
         if not self.window_bar:
             # Generate timestamp for bar data
@@ -521,6 +466,239 @@ class BarGenerator:
         self.window_bar = None
 
 
+# Interval of window bar generated with window minutes
+WINDOW_INTERVALS = {
+    0: Interval.DAILY,
+    1: Interval.MINUTE,
+    3: Interval.MINUTE3,
+    5: Interval.MINUTE5,
+    15: Interval.MINUTE15,
+    30: Interval.MINUTE30,
+    60: Interval.HOUR,
+    120: Interval.HOUR2,
+    240: Interval.HOUR4,
+    360: Interval.HOUR6,
+    720: Interval.HOUR12,
+}
+INTERVAL_WINDOWS = {v: k for k, v in WINDOW_INTERVALS.items()}
+
+ONE_MINUTE = timedelta(minutes=1)
+
+
+class SessionBarGenerator(BarGenerator):
+    """
+    BarGenerator driven by trading session table of the product.
+
+    Bar windows are looked up from precomputed SessionTable instead of
+    checking product groups and hours for every bar, so that:
+    1. window can be any minutes with interval MINUTE, any hours with
+       interval HOUR, or the whole trading day with interval DAILY.
+    2. window bar is clipped to trading sessions, and finished when the
+       last minute of window is received.
+    3. both 1 minute bar and x minute/hour bar can be used as input.
+
+    Session table of product is resolved once, either with symbol and
+    exchange passed in or from the first data received.
+    """
+
+    def __init__(
+        self,
+        on_bar: Callable,
+        window: int = 0,
+        on_window_bar: Callable = None,
+        interval: Interval = Interval.MINUTE,
+        symbol: str = "",
+        exchange: Exchange = None
+    ):
+        """Constructor"""
+        super().__init__(on_bar, window, on_window_bar, interval)
+
+        if interval == Interval.DAILY:
+            self.window_minutes = 0
+        elif interval == Interval.HOUR:
+            self.window_minutes = window * 60
+        else:
+            self.window_minutes = window
+        self.window_interval = WINDOW_INTERVALS.get(self.window_minutes, interval)
+
+        self.table = None
+        if symbol:
+            self.table = get_session_table(symbol, exchange)
+
+    def update_tick(self, tick: TickData):
+        """
+        Update new tick data into generator.
+        """
+        # Filter tick data with 0 last price
+        if not tick.last_price:
+            return
+
+        if not self.table:
+            self.table = get_session_table(tick.symbol, tick.exchange)
+
+        if not self.bar:
+            new_minute = True
+        elif tick.datetime >= self.bar.datetime_end:
+            self.on_bar(self.bar)
+            new_minute = True
+        else:
+            new_minute = False
+
+        if new_minute:
+            dt = tick.datetime.replace(second=0, microsecond=0)
+
+            # Open price can not be changed for bar at start of session, or
+            # bar created with volume traded. Otherwise it is replaced by
+            # price of the first tick with volume traded.
+            offset = self.table.get_minute_offset(dt)
+            if self.table.is_session_start(offset):
+                self.open_flag = False
+            elif self.last_tick and tick.volume > self.last_tick.volume:
+                self.open_flag = False
+            else:
+                self.open_flag = True
+
+            self.bar = BarData(
+                symbol=tick.symbol,
+                exchange=tick.exchange,
+                datetime=dt,
+                datetime_start=dt,
+                datetime_end=dt + ONE_MINUTE,
+                interval=Interval.MINUTE,
+                gateway_name=tick.gateway_name,
+                open_price=tick.last_price,
+                high_price=tick.last_price,
+                low_price=tick.last_price,
+                close_price=tick.last_price,
+                open_interest=tick.open_interest
+            )
+        else:
+            bar = self.bar
+            if tick.last_price > bar.high_price:
+                bar.high_price = tick.last_price
+            elif tick.last_price < bar.low_price:
+                bar.low_price = tick.last_price
+            bar.close_price = tick.last_price
+            bar.open_interest = tick.open_interest
+
+        if self.last_tick:
+            volume_change = tick.volume - self.last_tick.volume
+            if volume_change > 0:
+                self.bar.volume += volume_change
+
+                if self.open_flag:
+                    self.bar.open_price = tick.last_price
+                    self.bar.high_price = tick.last_price
+                    self.bar.low_price = tick.last_price
+                    self.open_flag = False
+
+        self.last_tick = tick
+
+    def update_bar(self, bar: BarData):
+        """
+        Update 1 minute or x minute/hour bar into generator.
+        """
+        if not self.table:
+            self.table = get_session_table(bar.symbol, bar.exchange)
+
+        window_bar = self.window_bar
+
+        if window_bar and bar.datetime >= window_bar.datetime_end:
+            self.on_window_bar(window_bar)
+            window_bar = None
+
+        if not window_bar:
+            table = self.table
+            trading_day = table.get_trading_day(bar.datetime)
+            start, end = table.get_window(
+                table.get_minute_offset(bar.datetime), self.window_minutes
+            )
+
+            window_bar = BarData(
+                symbol=bar.symbol,
+                exchange=bar.exchange,
+                datetime=bar.datetime.replace(second=0, microsecond=0),
+                datetime_start=table.get_datetime(trading_day, start),
+                datetime_end=table.get_datetime(trading_day, end),
+                interval=self.window_interval,
+                gateway_name=bar.gateway_name,
+                open_price=bar.open_price,
+                high_price=bar.high_price,
+                low_price=bar.low_price
+            )
+            self.window_bar = window_bar
+        else:
+            if bar.high_price > window_bar.high_price:
+                window_bar.high_price = bar.high_price
+            if bar.low_price < window_bar.low_price:
+                window_bar.low_price = bar.low_price
+
+        window_bar.close_price = bar.close_price
+        window_bar.volume += bar.volume
+        window_bar.open_interest = bar.open_interest
+
+        bar_end = bar.datetime_end or bar.datetime + ONE_MINUTE
+        if bar_end >= window_bar.datetime_end:
+            self.on_window_bar(window_bar)
+            self.window_bar = None
+
+        self.last_bar = bar
+
+    update_bar_hour = update_bar
+
+
+def cache_indicator(func: Callable):
+    """
+    Cache indicator result of ArrayManager until next bar is updated.
+
+    Result is always calculated and cached as array, so that requesting
+    the last value or the whole array with the same parameters only
+    calculates once within a bar. Cached arrays are read-only, a copy is
+    returned when array is requested so that caller can modify it.
+    """
+    name = func.__name__
+    sig = signature(func)
+    param_count = len(sig.parameters) - 2
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        """"""
+        if kwargs:
+            bound = sig.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            params = list(bound.arguments.values())[1:]
+            args, array = tuple(params[:-1]), params[-1]
+        elif len(args) > param_count:
+            args, array = args[:param_count], args[param_count]
+        else:
+            array = False
+
+        key = (name, args)
+        result = self.cache.get(key, None)
+
+        if result is None:
+            result = func(self, *args, True)
+
+            if isinstance(result, tuple):
+                for data in result:
+                    data.flags.writeable = False
+            else:
+                result.flags.writeable = False
+
+            self.cache[key] = result
+
+        if array:
+            if isinstance(result, tuple):
+                return tuple(data.copy() for data in result)
+            return result.copy()
+        elif isinstance(result, tuple):
+            return tuple(data[-1] for data in result)
+        else:
+            return result[-1]
+
+    return wrapper
+
+
 class ArrayManager(object):
     """
     For:
@@ -534,12 +712,14 @@ class ArrayManager(object):
         self.size = size
         self.inited = False
 
-        self.time_array = []
-        self.open_array = np.zeros(size)
-        self.high_array = np.zeros(size)
-        self.low_array = np.zeros(size)
-        self.close_array = np.zeros(size)
-        self.volume_array = np.zeros(size)
+        # Ring buffer with every value written twice, at pos and pos + size,
+        # so that the latest size values are always a contiguous slice.
+        self.pos = 0
+        self.buffer = np.zeros((5, size * 2))
+        self.time_buffer = np.empty(size * 2, dtype=object)
+
+        # Indicator results of current bar, see cache_indicator.
+        self.cache = {}
 
     def update_bar(self, bar):
         """
@@ -549,56 +729,132 @@ class ArrayManager(object):
         if not self.inited and self.count >= self.size:
             self.inited = True
 
-        if len(self.time_array) >= self.size:
-            self.time_array.pop(0)
-        self.open_array[:-1] = self.open_array[1:]
-        self.high_array[:-1] = self.high_array[1:]
-        self.low_array[:-1] = self.low_array[1:]
-        self.close_array[:-1] = self.close_array[1:]
-        self.volume_array[:-1] = self.volume_array[1:]
-
-        self.time_array.append(bar.datetime)
-        self.open_array[-1] = bar.open_price
-        self.high_array[-1] = bar.high_price
-        self.low_array[-1] = bar.low_price
-        self.close_array[-1] = bar.close_price
-        self.volume_array[-1] = bar.volume
+        if self.cache:
+            self.cache.clear()
+
+        pos = self.pos
+        values = (
+            bar.open_price,
+            bar.high_price,
+            bar.low_price,
+            bar.close_price,
+            bar.volume
+        )
+        self.buffer[:, pos] = values
+        self.buffer[:, pos + self.size] = values
+        self.time_buffer[pos] = self.time_buffer[pos + self.size] = bar.datetime
+
+        pos += 1
+        if pos == self.size:
+            pos = 0
+        self.pos = pos
+
+    def update_bars(self, bars):
+        """
+        Update a batch of bar data into array manager, which can be a
+        sequence of BarData or a BarBatch.
+        """
+        count = len(bars)
+        if not count:
+            return
+
+        if self.cache:
+            self.cache.clear()
+
+        bars = bars[-self.size:]
+
+        if hasattr(bars, "dtype"):
+            values = np.vstack([
+                bars["open_price"],
+                bars["high_price"],
+                bars["low_price"],
+                bars["close_price"],
+                bars["volume"]
+            ])
+            times = bars["datetime"].astype(datetime)
+        else:
+            values = np.array([
+                (
+                    bar.open_price,
+                    bar.high_price,
+                    bar.low_price,
+                    bar.close_price,
+                    bar.volume
+                )
+                for bar in bars
+            ]).T
+            times = [bar.datetime for bar in bars]
+
+        n = len(times)
+        size = self.size
+
+        # Move the latest values to the front, and then append new ones
+        buffer = self.buffer
+        buffer[:, :size - n] = buffer[:, self.pos + n:self.pos + size]
+        buffer[:, size - n:size] = values
+        buffer[:, size:] = buffer[:, :size]
+
+        time_buffer = self.time_buffer
+        time_buffer[:size - n] = time_buffer[self.pos + n:self.pos + size]
+        time_buffer[size - n:size] = times
+        time_buffer[size:] = time_buffer[:size]
+
+        self.pos = 0
+        self.count += count
+        if not self.inited and self.count >= self.size:
+            self.inited = True
+
+    @property
+    def time_array(self):
+        """
+        Get datetime time series, only with bars updated.
+        """
+        n = min(self.count, self.size)
+        end = self.pos + self.size
+        return self.time_buffer[end - n:end]
 
     @property
     def open(self):
         """
         Get open price time series.
         """
-        return self.open_array
+        return self.buffer[0, self.pos:self.pos + self.size]
 
     @property
     def high(self):
         """
         Get high price time series.
         """
-        return self.high_array
+        return self.buffer[1, self.pos:self.pos + self.size]
 
     @property
     def low(self):
         """
         Get low price time series.
         """
-        return self.low_array
+        return self.buffer[2, self.pos:self.pos + self.size]
 
     @property
     def close(self):
         """
         Get close price time series.
         """
-        return self.close_array
+        return self.buffer[3, self.pos:self.pos + self.size]
 
     @property
     def volume(self):
         """
         Get trading volume time series.
         """
-        return self.volume_array
+        return self.buffer[4, self.pos:self.pos + self.size]
+
+    open_array = open
+    high_array = high
+    low_array = low
+    close_array = close
+    volume_array = volume
 
+    @cache_indicator
     def sma(self, n, array=False):
         """
         Simple moving average.
@@ -608,6 +864,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def ema(self, n, array=False):
         """
         E moving average.
@@ -617,6 +874,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def std(self, n, array=False):
         """
         Standard deviation
@@ -626,6 +884,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def cci(self, n, array=False):
         """
         Commodity Channel Index (CCI).
@@ -635,6 +894,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def atr(self, n, array=False):
         """
         Average True Range (ATR).
@@ -644,6 +904,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def rsi(self, n, array=False):
         """
         Relative Strenght Index (RSI).
@@ -653,6 +914,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def macd(self, fast_period, slow_period, signal_period, array=False):
         """
         MACD.
@@ -664,6 +926,7 @@ class ArrayManager(object):
             return macd, signal, hist
         return macd[-1], signal[-1], hist[-1]
 
+    @cache_indicator
     def adx(self, n, array=False):
         """
         ADX.
@@ -673,6 +936,7 @@ class ArrayManager(object):
             return result
         return result[-1]
 
+    @cache_indicator
     def boll(self, n, dev, array=False):
         """
         Bollinger Channel.
@@ -685,6 +949,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @cache_indicator
     def keltner(self, n, dev, array=False):
         """
         Keltner Channel.
@@ -697,6 +962,7 @@ class ArrayManager(object):
 
         return up, down
 
+    @cache_indicator
     def donchian(self, n, array=False):
         """
         Donchian Channel.
@@ -717,92 +983,19 @@ def virtual(func: "callable"):
     """
     return func
 
+
 # 输入tick数据或分钟数据的时间（datetime对象），品种，以及周期，得到交易日的  起始时间，终止时间，交易日期
 def timeStartEnd(time: datetime, instrument: str, interval: Interval):
-    # 夜盘品种，先解决tradeday
-    if time.hour >= 21 and time.hour <= 23:
-        # 周五晚上
-        if time.weekday() == 4:
-            tradeday = (time + timedelta(days=2, hours=5)).replace(hour=0)
-        else:
-            tradeday = (time + timedelta(hours=5)).replace(hour=0)
-    elif time.hour < 3:
-        # 周六凌晨
-        if time.weekday() == 5:
-            tradeday = (time + timedelta(days=2, hours=5)).replace(hour=0)
-        else:
-            tradeday = (time + timedelta(hours=5)).replace(hour=0)
-    elif time.hour >= 9 and time.hour <= 15:
-        tradeday = time.replace(hour=0)
-    else:
-        print('输入的时间不在交易范围之内，请检查')
-        tradeday=None
-
-    tradeday = tradeday.replace(hour=9)
-
-    # 解决start 和 end的问题
-    # 1分钟K线采用闭开区间定义start 和 end
-    tradeday = tradeday.replace(second=0, microsecond=0)
-    if interval == Interval.MINUTE:
-        timestart = time.replace(second=0, microsecond=0)
-        timeend = timestart + timedelta(minutes=1)
-        return timestart, timeend, tradeday
-    elif interval == Interval.MINUTE5:
-        minstart = math.floor(time.minute / 5) * 5
-        timestart = time.replace(minute=minstart)
-        timeend = timestart + timedelta(minutes=5)
-        return timestart, timeend, tradeday
-    elif interval == Interval.MINUTE15:
-        minstart = math.floor(time.minute / 15) * 15
-        timestart = time.replace(minute=minstart)
-        timeend = timestart + timedelta(minutes=15)
-        return timestart, timeend, tradeday
-    elif interval == INTERVAL_30M:
-        minstart = math.floor(time.minute / 30) * 30
-        timestart = time.replace(minute=minstart)
-        timeend = timestart + timedelta(minutes=29, seconds=59)
-        # 30分钟的K线起始终止时间节点，要代替一下
-        if timeend.hour == 10 and timeend.minute == 29:
-            timeend = timeend.replace(minute=14)
-        return timestart, timeend, tradeday
-    # 60分钟这里
-    elif interval == INTERVAL_60M:
-        timestart = time.replace(minute=0)
-        timeend = timestart + timedelta(minutes=59, seconds=59)
-        # 30分钟的K线起始终止时间节点，要代替一下
-        if timeend.hour == 11 and timeend.minute == 59:
-            timeend = timeend.replace(minute=29)
-        elif timeend.hour == 2 and timeend.minute == 59:
-            timeend = timeend.replace(minute=29)
-        elif timeend.hour == 23 and timeend.minute == 59:
-            # 晚上23点的这个，很麻烦，之前大商所是凌晨1点闭市，之后改为晚上23点半闭市
-            if instrument == 'j':
-                if time.strftime('%Y-%m-%d') >= '2015-05-08':
-                    timeend = timeend.replace(minute=29)
-        return timestart, timeend, tradeday
-    elif interval == INTERVAL_1D:
-        # 夜盘品种
-        timeend = tradeday.replace(hour=14, minute=59, second=59)
-        # 夜盘品种
-        if instrument in ['rb', 'j', 'i', 'jm']:
-            if time.hour >= 21 and time.hour <= 23:
-                timestart = time.replace(hour=21)
-            elif time.hour < 3:
-                timestart = (time - timedelta(hours=5)).replace(hour=21)
-            # 如果是夜盘品种，但是前一天没有数据，那么默认假日模式，
-            elif time.hour >= 9 and time.hour <= 15:
-                if time.weekday() == 0:
-                    timestart = (time - timedelta(days=3)).replace(hour=21)
-                else:
-                    timestart = (time - timedelta(days=1)).replace(hour=21)
-            else:
-                print('输入的时间不在交易范围之内，请检查')
-        # 日盘品种
-        else:
-            timestart = time.replace(hour=9)
-    else:
+    """
+    Get (start, end, trading day at 09:00) of bar window which time belongs
+    to, end of window is exclusive.
+    """
+    window = INTERVAL_WINDOWS.get(interval, None)
+    if window is None:
         print('输入的时间周期有误，请重新输入')
-        timestart = None
-        timeend = None
+        return None, None, None
 
-    return timestart, timeend, tradeday
\ No newline at end of file
+    table = get_session_table(instrument)
+    timestart, timeend = table.get_bar_window(time, window)
+    tradeday = table.get_trading_day(time).replace(hour=9)
+    return timestart, timeend, tradeday